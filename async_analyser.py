@@ -0,0 +1,61 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from database_analyser import DatabaseAnalyzer
+
+
+class AsyncDatabaseAnalyzer:
+    """Asyncio front-end for DatabaseAnalyzer.
+
+    Any analyzer method can be awaited (``await aio.get_tables()``). Each call
+    runs on a dedicated worker thread with its own pooled connection, so
+    independent metadata queries issued through asyncio.gather() execute
+    concurrently on the database instead of queuing on one cursor.
+
+    The workers are sized to the analyzer's request_workers share of the
+    pool; the rest is kept for the crawls those requests start (see
+    DatabaseAnalyzer.crawl_slots), so neither can starve the other.
+    """
+
+    def __init__(self, analyzer: DatabaseAnalyzer, max_workers: int = None):
+        self.sync = analyzer
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or analyzer.request_workers,
+            thread_name_prefix=f"dba-{analyzer.db_type or 'db'}",
+        )
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Await ``func(*args, **kwargs)`` on a worker thread holding a pooled connection."""
+        loop = asyncio.get_running_loop()
+
+        def call():
+            with self.sync.connection():
+                return func(*args, **kwargs)
+
+        return await loop.run_in_executor(self._executor, call)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.sync, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def method(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        return method
+
+    def is_connected(self) -> bool:
+        return self.sync.is_connected()
+
+    def pool_stats(self):
+        return self.sync.pool_stats()
+
+    def close_connection(self):
+        """Close the underlying analyzer and stop the worker threads."""
+        try:
+            self.sync.close_connection()
+        finally:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,62 @@
+"""Cold-start import benchmark for the analyzer and the API server.
+
+Each measurement runs in a fresh interpreter so module caches never help.
+"eager" imports every driver and report library up front, the way
+database_analyser.py used to; "lazy" imports only what startup needs now.
+Libraries that are not installed are skipped in the eager baseline.
+
+Usage: python bench_import_time.py [runs]
+"""
+import statistics
+import subprocess
+import sys
+
+EAGER_LIBS = ["psycopg2", "pyodbc", "mysql.connector", "openpyxl", "graphviz", "matplotlib.pyplot"]
+
+SCENARIOS = {
+    "lazy: import database_analyser": "import database_analyser",
+    "lazy: import server": "import server",
+    "eager: database_analyser + all drivers/report libs": (
+        "import importlib\n"
+        f"for name in {EAGER_LIBS!r}:\n"
+        "    try:\n"
+        "        importlib.import_module(name)\n"
+        "    except Exception:\n"
+        "        pass\n"
+        "import database_analyser"
+    ),
+}
+
+TIMER = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "{code}\n"
+    "print(time.perf_counter() - start)\n"
+)
+
+
+def time_import(code: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", TIMER.format(code=code)],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Cold import time, median of {runs} fresh interpreters")
+    print("-" * 70)
+    for label, code in SCENARIOS.items():
+        try:
+            samples = [time_import(code) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"{label:<52} skipped ({e})")
+            continue
+        print(f"{label:<52} {statistics.median(samples) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
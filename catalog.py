@@ -0,0 +1,245 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class Catalog:
+    """In-memory snapshot of every table, view and column in the database.
+
+    Built from a handful of bulk catalog queries (see
+    DatabaseAnalyzer.load_catalog) so per-table lookups never go back to the
+    server.
+    """
+
+    def __init__(self,
+                 objects: Iterable[Tuple[str, str, str]],
+                 columns: Iterable[Tuple[str, str, str, str, str, Optional[str]]],
+                 loaded_at: Optional[float] = None):
+        # (schema, name) -> 'table' | 'view'
+        self.objects: Dict[Tuple[str, str], str] = {}
+        for schema, name, kind in objects:
+            self.objects[(schema, name)] = kind
+
+        # (schema, name) -> [{'name', 'type', 'nullable', 'default'}, ...] in ordinal order
+        self._columns: Dict[Tuple[str, str], List[Dict]] = {}
+        for schema, table, column, data_type, nullable, default in columns:
+            self._columns.setdefault((schema, table), []).append({
+                'name': column,
+                'type': data_type,
+                'nullable': nullable,
+                'default': default
+            })
+
+        self.loaded_at = loaded_at if loaded_at is not None else time.time()
+
+    @property
+    def tables(self) -> List[Tuple[str, str]]:
+        return sorted(key for key, kind in self.objects.items() if kind == 'table')
+
+    @property
+    def views(self) -> List[Tuple[str, str]]:
+        return sorted(key for key, kind in self.objects.items() if kind == 'view')
+
+    def has_object(self, schema: str, name: str) -> bool:
+        return (schema, name) in self.objects or (schema, name) in self._columns
+
+    def columns(self, schema: str, name: str) -> Optional[List[Dict]]:
+        """Column dicts for schema.name, or None if the object is not in the snapshot."""
+        cols = self._columns.get((schema, name))
+        if cols is None:
+            return [] if (schema, name) in self.objects else None
+        return [dict(col) for col in cols]
+
+    def iter_columns(self) -> Iterable[Tuple[str, str, Dict]]:
+        """Yield (schema, table, column dict) for every column, ordered by table."""
+        for (schema, table), cols in sorted(self._columns.items()):
+            for col in cols:
+                yield schema, table, col
+
+    def find_column(self, column_name: str) -> List[Dict]:
+        """Every table/view with a column named column_name (case-insensitive)."""
+        target = column_name.lower()
+        matches = []
+        for (schema, table), cols in sorted(self._columns.items()):
+            for col in cols:
+                if col['name'].lower() == target:
+                    matches.append({
+                        'schema': schema,
+                        'table': table,
+                        'column': col['name'],
+                        'data_type': col['type'],
+                        'nullable': col['nullable'],
+                        'default': col['default'],
+                    })
+        return matches
+
+    @property
+    def column_count(self) -> int:
+        return sum(len(cols) for cols in self._columns.values())
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, the inverse of from_dict()."""
+        return {
+            'objects': [[schema, name, kind] for (schema, name), kind in self.objects.items()],
+            'columns': [
+                [schema, table, col['name'], col['type'], col['nullable'], col['default']]
+                for (schema, table), cols in self._columns.items()
+                for col in cols
+            ],
+            'loaded_at': self.loaded_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Catalog":
+        return cls(
+            (tuple(row) for row in data['objects']),
+            (tuple(row) for row in data['columns']),
+            loaded_at=data.get('loaded_at'),
+        )
+
+
+class MetadataCache:
+    """Thread-safe metadata cache with a TTL and schema-change detection.
+
+    Entries are served without touching the database for ``ttl`` seconds.
+    Once that window passes, the next lookup runs ``version_probe`` (a cheap
+    per-dialect "schema version" query). An unchanged version renews every
+    entry for another window; a changed version, or a probe failure, clears
+    the cache so entries are reloaded on demand. ``ttl=None`` never expires.
+    """
+
+    def __init__(self, ttl: Optional[float] = 300.0, version_probe: Optional[Callable[[], Optional[str]]] = None):
+        self.ttl = ttl
+        self._version_probe = version_probe
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Any] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._version: Optional[str] = None
+        self._validated_at: Optional[float] = None
+
+        self._hits = 0
+        self._misses = 0
+        self._probes = 0
+        self._invalidations = 0
+
+    def get(self, key: str, loader: Callable[[], Any], max_age: Optional[float] = None) -> Any:
+        """Return the cached value for key, calling loader() to fill a miss.
+
+        ``max_age`` bounds how long this entry is kept regardless of the
+        schema version, for data-dependent metadata such as row estimates.
+        """
+        self._revalidate()
+        with self._lock:
+            if self._fresh_locked(key, max_age):
+                self._hits += 1
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # One loader per key at a time; concurrent callers wait for its result
+        with key_lock:
+            with self._lock:
+                if self._fresh_locked(key, max_age):
+                    self._hits += 1
+                    return self._entries[key]
+                self._misses += 1
+            value = loader()
+            with self._lock:
+                self._entries[key] = value
+                self._loaded_at[key] = time.monotonic()
+            return value
+
+    def _fresh_locked(self, key: str, max_age: Optional[float]) -> bool:
+        if key not in self._entries:
+            return False
+        if max_age is None:
+            return True
+        return time.monotonic() - self._loaded_at.get(key, 0.0) < max_age
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Return a cached value without loading or revalidating."""
+        with self._lock:
+            return self._entries.get(key, default)
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._loaded_at[key] = time.monotonic()
+
+    def seed(self, entries: Dict[str, Any], version: Optional[str],
+             saved_at: Optional[Dict[str, float]] = None):
+        """Preload entries (e.g. from disk) as if they were loaded at ``version``.
+
+        Seeded entries count as freshly validated; call revalidate(force=True)
+        to check them against the live database. ``saved_at`` (epoch seconds
+        per key) keeps their real age for max_age checks.
+        """
+        with self._lock:
+            self._entries.update(entries)
+            now = time.monotonic()
+            for key in entries:
+                age = max(0.0, time.time() - saved_at[key]) if saved_at and key in saved_at else 0.0
+                self._loaded_at[key] = now - age
+            self._version = version
+            self._validated_at = time.monotonic()
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or every entry when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._validated_at = None
+            else:
+                self._entries.pop(key, None)
+            self._invalidations += 1
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            age = None if self._validated_at is None else time.monotonic() - self._validated_at
+            return {
+                'ttl': self.ttl,
+                'entries': sorted(self._entries),
+                'schema_version': self._version,
+                'seconds_since_validation': age,
+                'hits': self._hits,
+                'misses': self._misses,
+                'probes': self._probes,
+                'invalidations': self._invalidations,
+            }
+
+    def _expired(self) -> bool:
+        if self._validated_at is None:
+            return True
+        return self.ttl is not None and time.monotonic() - self._validated_at >= self.ttl
+
+    def revalidate(self, force: bool = False) -> bool:
+        """Run the version probe if the TTL expired (or force); True if entries survived."""
+        self._revalidate(force)
+        with self._lock:
+            return bool(self._entries)
+
+    def _revalidate(self, force: bool = False):
+        if not force and not self._expired():
+            return
+        with self._probe_lock:
+            if not force and not self._expired():
+                return  # another thread just revalidated
+            version = None
+            if self._version_probe is not None:
+                try:
+                    version = self._version_probe()
+                except Exception:
+                    version = None
+            with self._lock:
+                self._probes += 1
+                if version is None or version != self._version:
+                    if self._entries:
+                        self._invalidations += 1
+                    self._entries.clear()
+                self._version = version
+                self._validated_at = time.monotonic()
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Fields that identify a database; the password is deliberately not one of them
+FINGERPRINT_FIELDS = ("host", "server", "port", "database", "username", "trusted_connection")
+
+
+def default_cache_dir() -> str:
+    """Directory for persisted metadata (override with DBA_CACHE_DIR)."""
+    return os.environ.get("DBA_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "database_analyser")
+
+
+def connection_fingerprint(db_type: str, params: Dict) -> str:
+    """Stable hash naming the database behind a set of connection params."""
+    identity = {"db_type": db_type}
+    for field in FINGERPRINT_FIELDS:
+        value = params.get(field)
+        identity[field] = None if value is None else str(value)
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class CatalogStore:
+    """SQLite file holding metadata snapshots per connection fingerprint.
+
+    Each (fingerprint, key) row stores one zlib-compressed JSON payload plus
+    the schema version it was loaded at, so a reconnect can serve it straight
+    away and revalidate later. Storage errors are swallowed: the store is an
+    accelerator, never a reason for a lookup to fail.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(default_cache_dir(), "metadata.sqlite3")
+        self._ready = False
+
+    def _open(self) -> sqlite3.Connection:
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    fingerprint TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    version TEXT,
+                    saved_at REAL NOT NULL,
+                    payload BLOB NOT NULL,
+                    PRIMARY KEY (fingerprint, key)
+                )
+            """)
+            self._ready = True
+        return conn
+
+    def load(self, fingerprint: str, key: str) -> Optional[Tuple[Any, Optional[str], float]]:
+        """Return (value, version, saved_at) for a stored snapshot, or None."""
+        try:
+            conn = self._open()
+            try:
+                row = conn.execute(
+                    "SELECT payload, version, saved_at FROM snapshots WHERE fingerprint = ? AND key = ?",
+                    (fingerprint, key),
+                ).fetchone()
+            finally:
+                conn.close()
+            if row is None:
+                return None
+            return json.loads(zlib.decompress(row[0]).decode("utf-8")), row[1], row[2]
+        except Exception:
+            return None
+
+    def load_all(self, fingerprint: str, keys: Optional[Iterable[str]] = None) -> Dict[str, Tuple[Any, Optional[str], float]]:
+        """Every stored snapshot for a fingerprint (or just ``keys``), keyed by cache key."""
+        snapshots = {}
+        sql = "SELECT key, payload, version, saved_at FROM snapshots WHERE fingerprint = ?"
+        params = [fingerprint]
+        if keys is not None:
+            keys = list(keys)
+            sql += f" AND key IN ({', '.join('?' * len(keys))})"
+            params.extend(keys)
+        try:
+            conn = self._open()
+            try:
+                rows = conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+        except Exception:
+            return snapshots
+        for key, payload, version, saved_at in rows:
+            try:
+                snapshots[key] = (json.loads(zlib.decompress(payload).decode("utf-8")), version, saved_at)
+            except Exception:
+                continue
+        return snapshots
+
+    def save(self, fingerprint: str, key: str, value: Any, version: Optional[str]) -> bool:
+        """Persist a JSON-serializable value; returns False if it could not be written."""
+        try:
+            payload = zlib.compress(json.dumps(value, default=str, separators=(",", ":")).encode("utf-8"))
+            conn = self._open()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO snapshots (fingerprint, key, version, saved_at, payload) VALUES (?, ?, ?, ?, ?)",
+                        (fingerprint, key, version, time.time(), payload),
+                    )
+            finally:
+                conn.close()
+            return True
+        except Exception:
+            return False
+
+    def delete(self, fingerprint: str, key: Optional[str] = None):
+        """Forget one snapshot, or all of them for a fingerprint."""
+        try:
+            conn = self._open()
+            try:
+                with conn:
+                    if key is None:
+                        conn.execute("DELETE FROM snapshots WHERE fingerprint = ?", (fingerprint,))
+                    else:
+                        conn.execute("DELETE FROM snapshots WHERE fingerprint = ? AND key = ?", (fingerprint, key))
+            finally:
+                conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,187 @@
+import bisect
+from typing import Dict, List, Optional, Set, Tuple
+
+from catalog import Catalog
+
+SEARCH_MODES = ("exact", "prefix", "substring", "fuzzy", "auto")
+
+# Rank of each match kind in "auto" mode (lower is better)
+_MATCH_RANK = {"exact": 0, "prefix": 1, "substring": 2, "fuzzy": 3}
+
+
+def normalize_column_name(name: str) -> str:
+    return name.strip().lower()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _padded_trigrams(text: str) -> Set[str]:
+    return _trigrams(f"$${text}$$")
+
+
+def levenshtein(a: str, b: str, max_distance: Optional[int] = None) -> Optional[int]:
+    """Edit distance between a and b, or None once it must exceed max_distance."""
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return None
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if max_distance is not None and min(current) > max_distance:
+            return None
+        previous = current
+    distance = previous[-1]
+    if max_distance is not None and distance > max_distance:
+        return None
+    return distance
+
+
+def default_max_distance(query: str) -> int:
+    """Typos tolerated for a query: 1 up to 4 characters, 2 up to 8, then 3."""
+    if len(query) <= 4:
+        return 1
+    if len(query) <= 8:
+        return 2
+    return 3
+
+
+class ColumnIndex:
+    """Inverted index from normalized column name to the tables that have it.
+
+    Built once per catalog snapshot. Exact lookups are a dict hit, prefix
+    lookups bisect the sorted name list, substring lookups intersect trigram
+    postings, and fuzzy lookups verify trigram-filtered candidates with a
+    bounded Levenshtein distance. Only the distinct column names are scanned,
+    never the individual columns.
+    """
+
+    def __init__(self, catalog: Catalog):
+        # normalized name -> [(schema, table, column, data_type, nullable, default), ...]
+        self._postings: Dict[str, List[Tuple]] = {}
+        for schema, table, col in catalog.iter_columns():
+            self._postings.setdefault(normalize_column_name(col['name']), []).append(
+                (schema, table, col['name'], col['type'], col['nullable'], col['default'])
+            )
+
+        self._names: List[str] = sorted(self._postings)
+        # trigram -> names containing it (substring search)
+        self._grams: Dict[str, Set[str]] = {}
+        # padded trigram -> names containing it (fuzzy candidate filter)
+        self._padded_grams: Dict[str, Set[str]] = {}
+        for name in self._names:
+            for gram in _trigrams(name):
+                self._grams.setdefault(gram, set()).add(name)
+            for gram in _padded_trigrams(name):
+                self._padded_grams.setdefault(gram, set()).add(name)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _exact(self, query: str) -> List[str]:
+        return [query] if query in self._postings else []
+
+    def _prefix(self, query: str) -> List[str]:
+        start = bisect.bisect_left(self._names, query)
+        end = bisect.bisect_left(self._names, query + "\uffff")
+        return self._names[start:end]
+
+    def _substring(self, query: str) -> List[str]:
+        if len(query) < 3:
+            return [name for name in self._names if query in name]
+        candidates = None
+        for gram in _trigrams(query):
+            names = self._grams.get(gram)
+            if not names:
+                return []
+            candidates = set(names) if candidates is None else candidates & names
+        return sorted(name for name in candidates if query in name)
+
+    def _fuzzy(self, query: str, max_distance: int) -> List[Tuple[str, int]]:
+        grams = _padded_trigrams(query)
+        # q-gram lemma: each edit destroys at most 3 trigrams
+        required = len(grams) - 3 * max_distance
+        if required <= 0:
+            candidates = [n for n in self._names if abs(len(n) - len(query)) <= max_distance]
+        else:
+            counts: Dict[str, int] = {}
+            for gram in grams:
+                for name in self._padded_grams.get(gram, ()):
+                    counts[name] = counts.get(name, 0) + 1
+            candidates = [n for n, c in counts.items() if c >= required]
+
+        matches = []
+        for name in candidates:
+            distance = levenshtein(query, name, max_distance)
+            if distance is not None:
+                matches.append((name, distance))
+        return matches
+
+    def search(self, query: str, mode: str = "auto", limit: Optional[int] = 50, offset: int = 0,
+               max_distance: Optional[int] = None) -> Tuple[int, List[Dict]]:
+        """Ranked column matches for query; returns (total matches, requested page).
+
+        Modes are exact, prefix, substring, fuzzy, or auto (all of them, best
+        match kind first). Within a kind, results rank by edit distance, then
+        name length, then schema.table.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        q = normalize_column_name(query)
+        if not q:
+            return 0, []
+        if max_distance is None:
+            max_distance = default_max_distance(q)
+
+        # normalized name -> (match kind, distance)
+        found: Dict[str, Tuple[str, int]] = {}
+
+        def add(kind: str, names, distance: int = 0):
+            for name in names:
+                if name not in found:
+                    found[name] = (kind, distance)
+
+        if mode in ("exact", "auto"):
+            add("exact", self._exact(q))
+        if mode in ("prefix", "auto"):
+            add("prefix", self._prefix(q))
+        if mode in ("substring", "auto"):
+            add("substring", self._substring(q))
+        if mode in ("fuzzy", "auto"):
+            for name, distance in sorted(self._fuzzy(q, max_distance), key=lambda m: m[1]):
+                add("exact" if distance == 0 else "fuzzy", [name], distance)
+
+        ranked = sorted(found.items(), key=lambda item: (_MATCH_RANK[item[1][0]], item[1][1], len(item[0]), item[0]))
+        total = sum(len(self._postings[name]) for name, _ in ranked)
+        end = total if limit is None else min(total, offset + limit)
+
+        # Only materialize the requested page
+        results = []
+        position = 0
+        for name, (kind, distance) in ranked:
+            postings = self._postings[name]
+            if position + len(postings) <= offset:
+                position += len(postings)
+                continue
+            for schema, table, column, data_type, nullable, default in postings:
+                if position >= end:
+                    break
+                if position >= offset:
+                    results.append({
+                        'schema': schema,
+                        'table': table,
+                        'column': column,
+                        'data_type': data_type,
+                        'nullable': nullable,
+                        'default': default,
+                        'match': kind,
+                        'distance': distance,
+                    })
+                position += 1
+            if position >= end:
+                break
+        return total, results
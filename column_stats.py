@@ -0,0 +1,248 @@
+import math
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from profiler import STREAM_BATCH_ROWS, is_string_type, stream_batches
+
+# Quantile sketch size: at most ~3*k retained values per column (24 KiB at k=1000), ~0.3% rank error
+QUANTILE_K = 1000
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+HISTOGRAM_BINS = 20
+
+# String lengths above this share one overflow bucket, so the distribution stays fixed-size
+MAX_TRACKED_LENGTH = 255
+
+_NUMERIC = re.compile(r"int|dec|numeric|float|double|real|number")
+_NOT_NUMERIC = ("interval", "point")
+
+
+def is_numeric_type(data_type: Optional[str]) -> bool:
+    """True for types whose values convert to float (not interval or geometry types)."""
+    lowered = (data_type or '').lower()
+    return bool(_NUMERIC.search(lowered)) and not any(word in lowered for word in _NOT_NUMERIC)
+
+
+class QuantileSketch:
+    """KLL quantile sketch (Karnin, Lang, Liberty) over float values.
+
+    Values enter level 0; a level that outgrows its capacity is sorted and
+    every other value (random offset) moves up one level with twice the
+    weight. Capacities shrink geometrically below the top level, so memory
+    stays around 3*k values however many are added, and every batch is
+    folded in with whole-array NumPy operations.
+    """
+
+    def __init__(self, k: int = QUANTILE_K, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: np.ndarray):
+        """Add a batch of values; NaNs are ignored."""
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        self.count += int(values.size)
+        self._levels[0] = np.concatenate((self._levels[0], values))
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd value out stays behind so total weight is preserved exactly
+                odd = items.size % 2
+                promoted = items[odd:][int(self._rng.integers(2))::2]
+                self._levels[level] = items[:odd]
+                self._levels[level + 1] = np.concatenate((self._levels[level + 1], promoted))
+            level += 1
+
+    def _weighted(self):
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(items.size, 1 << level, dtype=np.int64)
+                                  for level, items in enumerate(self._levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def quantiles(self, fractions: Sequence[float]) -> List[Optional[float]]:
+        if not self.count:
+            return [None] * len(fractions)
+        values, weights = self._weighted()
+        cumulative = np.cumsum(weights)
+        index = np.searchsorted(cumulative, np.asarray(fractions) * cumulative[-1], side="left")
+        return values[np.minimum(index, values.size - 1)].tolist()
+
+    def cdf(self, points: Sequence[float]) -> np.ndarray:
+        """Approximate fraction of values <= each point."""
+        if not self.count:
+            return np.zeros(len(points))
+        values, weights = self._weighted()
+        cumulative = np.concatenate(([0], np.cumsum(weights)))
+        return cumulative[np.searchsorted(values, points, side="right")] / cumulative[-1]
+
+
+class Moments:
+    """Count, min, max, mean and variance folded in batch by batch (Chan et al.)."""
+
+    __slots__ = ('count', 'mean', 'm2', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def update(self, values: np.ndarray):
+        n = int(values.size)
+        if not n:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(np.square(values - batch_mean).sum())
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+        low, high = float(values.min()), float(values.max())
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+    @property
+    def stddev(self) -> Optional[float]:
+        """Sample standard deviation (n - 1)."""
+        if not self.count:
+            return None
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'min': self.minimum,
+            'max': self.maximum,
+            'mean': self.mean if self.count else None,
+            'stddev': self.stddev,
+        }
+
+
+class ColumnStats:
+    """Fixed-size accumulators for one column.
+
+    Numeric columns keep moments and a quantile sketch, from which the
+    histogram is read at the end; string columns keep moments and exact
+    counts of value lengths up to MAX_TRACKED_LENGTH. Every column counts
+    NULLs.
+    """
+
+    def __init__(self, column: Dict, bins: int = HISTOGRAM_BINS):
+        self.column = column
+        self.bins = bins
+        if is_numeric_type(column['type']):
+            self.kind = 'numeric'
+        elif is_string_type(column['type']):
+            self.kind = 'string'
+        else:
+            self.kind = 'other'
+        self.rows = 0
+        self.nulls = 0
+        self.moments = Moments()
+        self.sketch = QuantileSketch() if self.kind == 'numeric' else None
+        self.length_counts = np.zeros(MAX_TRACKED_LENGTH + 2, dtype=np.int64) if self.kind == 'string' else None
+
+    def update(self, values: Sequence):
+        """Fold in this column's values from one fetched batch."""
+        self.rows += len(values)
+        if self.kind == 'numeric':
+            # None (and Decimal) convert directly; NULLs become NaN
+            try:
+                array = np.asarray(values, dtype=np.float64)
+            except (TypeError, ValueError):
+                # The driver returned something that is not a number after all
+                self.kind = 'other'
+                self.sketch = None
+                self.nulls += sum(1 for v in values if v is None)
+                return
+            present = array[~np.isnan(array)]
+            self.nulls += int(array.size - present.size)
+            self.moments.update(present)
+            self.sketch.update(present)
+        elif self.kind == 'string':
+            lengths = np.fromiter((-1 if v is None else len(v) for v in values), dtype=np.int64, count=len(values))
+            present = lengths[lengths >= 0]
+            self.nulls += int(lengths.size - present.size)
+            self.moments.update(present)
+            self.length_counts += np.bincount(np.minimum(present, MAX_TRACKED_LENGTH + 1),
+                                              minlength=MAX_TRACKED_LENGTH + 2)
+        else:
+            self.nulls += sum(1 for v in values if v is None)
+
+    def histogram(self) -> Optional[Dict]:
+        """Equal-width bins between min and max, with counts read from the quantile sketch."""
+        if self.kind != 'numeric' or not self.moments.count:
+            return None
+        low, high = self.moments.minimum, self.moments.maximum
+        bins = self.bins if high > low else 1
+        edges = np.linspace(low, high, bins + 1)
+        cumulative = np.rint(self.sketch.cdf(edges[1:]) * self.moments.count)
+        counts = np.diff(np.concatenate(([0], cumulative))).astype(np.int64)
+        return {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+    def to_dict(self) -> Dict:
+        result = {
+            'name': self.column['name'],
+            'type': self.column['type'],
+            'nullable': self.column['nullable'],
+            'kind': self.kind,
+            'null_count': self.nulls,
+            'non_null_count': self.rows - self.nulls,
+        }
+        if self.kind == 'numeric':
+            result.update(self.moments.to_dict())
+            result['quantiles'] = {f"p{round(q * 100):g}": value
+                                   for q, value in zip(QUANTILES, self.sketch.quantiles(QUANTILES))}
+            result['histogram'] = self.histogram()
+        elif self.kind == 'string':
+            result['length'] = self.moments.to_dict()
+            tracked = self.length_counts[:MAX_TRACKED_LENGTH + 1]
+            result['length_counts'] = [[int(length), int(tracked[length])] for length in np.flatnonzero(tracked)]
+            result['longer_than_tracked'] = int(self.length_counts[MAX_TRACKED_LENGTH + 1])
+        return result
+
+
+class StreamingProfiler:
+    """Distribution statistics for every column from one streamed scan.
+
+    Rows come through the dialect's server-side cursor in batches of
+    ``batch_rows``; each batch is transposed into columns and folded into
+    that column's ColumnStats, then dropped. Memory therefore depends on the
+    number of columns and the batch size, never on the number of rows.
+    """
+
+    def __init__(self, analyzer, bins: int = HISTOGRAM_BINS, batch_rows: int = STREAM_BATCH_ROWS):
+        self.analyzer = analyzer
+        self.bins = max(1, bins)
+        self.batch_rows = max(1, batch_rows)
+
+    def profile(self, schema: Optional[str], table_name: str, columns: List[Dict],
+                sample: Optional[Dict] = None) -> Dict:
+        """Returns {'row_count', 'columns': [per-column statistics], 'batches'}."""
+        dialect = self.analyzer.dialect
+        stats = [ColumnStats(column, self.bins) for column in columns]
+        select_list = ", ".join(dialect.quote_ident(column['name']) for column in columns)
+        source = sample['source'] if sample else dialect.qualify(schema, table_name)
+        row_count = 0
+        batches = 0
+        for rows in stream_batches(self.analyzer, f"SELECT {select_list} FROM {source}", self.batch_rows):
+            row_count += len(rows)
+            batches += 1
+            for column_stats, values in zip(stats, zip(*rows)):
+                column_stats.update(values)
+        return {'row_count': row_count, 'columns': [column_stats.to_dict() for column_stats in stats],
+                'batches': batches}
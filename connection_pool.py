@@ -0,0 +1,232 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+
+class PoolExhaustedError(RuntimeError):
+    """Raised when no pooled connection frees up within the checkout timeout."""
+
+
+class PooledConnection:
+    """A raw DB-API connection plus the bookkeeping the pool keeps for it."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_checked = self.created_at
+        # Per-connection scratch space (e.g. server-side prepared statement names)
+        self.state: Dict[str, Any] = {}
+
+    def close(self):
+        try:
+            self.raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of DB-API connections.
+
+    Connections are created lazily up to ``max_size``. Idle connections older
+    than ``max_idle`` seconds are evicted (keeping ``min_size`` around), and a
+    connection that sat idle longer than ``health_check_interval`` seconds is
+    pinged before being handed out again.
+    """
+
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 max_size: int = 10,
+                 min_size: int = 1,
+                 max_idle: float = 300.0,
+                 health_check_interval: float = 30.0,
+                 checkout_timeout: float = 30.0,
+                 health_check_sql: str = "SELECT 1"):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._factory = factory
+        self.max_size = max_size
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+        self.health_check_sql = health_check_sql
+
+        self._cond = threading.Condition()
+        self._idle: List[PooledConnection] = []
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+
+        # Counters exposed through stats()
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._evicted_idle = 0
+        self._failed_health_checks = 0
+        self._discarded = 0
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a connection, creating one if the pool is not yet full."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        pooled = None
+        expired: List[PooledConnection] = []
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                expired.extend(self._evict_idle_locked())
+                if self._idle:
+                    pooled = self._idle.pop()  # LIFO keeps the warmest connection busy
+                    break
+                if self._size < self.max_size:
+                    self._size += 1  # reserve a slot, connect outside the lock
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolExhaustedError(
+                        f"No connection available within {timeout:.1f}s "
+                        f"(pool size {self.max_size}, all in use)"
+                    )
+                self._waits += 1
+                self._cond.wait(remaining)
+            self._in_use += 1
+            self._checkouts += 1
+
+        for stale in expired:
+            stale.close()
+
+        try:
+            if pooled is None:
+                pooled = self._connect()
+            elif not self._is_healthy(pooled):
+                pooled.close()
+                pooled = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        pooled.last_used = time.monotonic()
+        return pooled
+
+    def release(self, pooled: PooledConnection, discard: bool = False):
+        """Return a connection to the pool, dropping it if it is no longer usable."""
+        if not discard:
+            try:
+                # End whatever implicit transaction the caller left open
+                pooled.raw.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+                self._discarded += 1 if discard else 0
+            else:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                pooled = None
+            self._cond.notify()
+
+        if pooled is not None:
+            pooled.close()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager around acquire()/release()."""
+        pooled = self.acquire(timeout)
+        try:
+            yield pooled
+        finally:
+            self.release(pooled)
+
+    def evict_idle(self) -> int:
+        """Close idle connections that exceeded max_idle; returns how many were closed."""
+        with self._cond:
+            expired = self._evict_idle_locked()
+        for stale in expired:
+            stale.close()
+        return len(expired)
+
+    def close(self):
+        """Close every idle connection; in-use connections are closed on release."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            pooled.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool size and usage counters."""
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'min_size': self.min_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'created': self._created,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'evicted_idle': self._evicted_idle,
+                'failed_health_checks': self._failed_health_checks,
+                'discarded': self._discarded,
+                'closed': self._closed,
+            }
+
+    def _connect(self) -> PooledConnection:
+        pooled = PooledConnection(self._factory())
+        with self._cond:
+            self._created += 1
+        return pooled
+
+    def _is_healthy(self, pooled: PooledConnection) -> bool:
+        now = time.monotonic()
+        if now - pooled.last_checked < self.health_check_interval:
+            return True
+        cursor = None
+        try:
+            cursor = pooled.raw.cursor()
+            cursor.execute(self.health_check_sql)
+            cursor.fetchall()
+            pooled.last_checked = now
+            return True
+        except Exception:
+            with self._cond:
+                self._failed_health_checks += 1
+            return False
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    def _evict_idle_locked(self) -> List[PooledConnection]:
+        if self.max_idle is None or not self._idle:
+            return []
+        now = time.monotonic()
+        expired = []
+        keep = []
+        # Oldest connections sit at the front of the LIFO list
+        for pooled in self._idle:
+            if now - pooled.last_used > self.max_idle and self._size - len(expired) > self.min_size:
+                expired.append(pooled)
+            else:
+                keep.append(pooled)
+        self._idle = keep
+        self._size -= len(expired)
+        self._evicted_idle += len(expired)
+        return expired
@@ -0,0 +1,152 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class DatabaseSlots:
+    """Concurrency cap for one target database, shared by every crawl running against it.
+
+    The cap is the largest limit among the crawls currently registered, so
+    one session with a small pool never throttles a larger one; it drops
+    back when that crawl leaves.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._limits: List[int] = []
+        self.in_use = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self._limits, default=1)
+
+    @property
+    def users(self) -> int:
+        return len(self._limits)
+
+    def _join(self, limit: int):
+        with self._condition:
+            self._limits.append(limit)
+            self._condition.notify_all()
+
+    def _leave(self, limit: int):
+        with self._condition:
+            self._limits.remove(limit)
+            self._condition.notify_all()
+
+    def __enter__(self):
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_use < self.limit)
+            self.in_use += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._condition:
+            self.in_use -= 1
+            self._condition.notify_all()
+
+
+# Database fingerprint -> slots of the crawls currently running against it
+_database_slots: Dict[str, DatabaseSlots] = {}
+_slots_lock = threading.Lock()
+
+
+@contextmanager
+def database_slots(key: str, limit: int):
+    """Process-wide concurrency cap for one target database, for the duration of the block.
+
+    Several sessions (or several reports) against the same database share
+    one budget of up to ``limit`` concurrent tasks, raised to the largest
+    limit among them. The entry is dropped when the last of them finishes.
+    """
+    limit = max(1, limit)
+    with _slots_lock:
+        slots = _database_slots.get(key)
+        if slots is None:
+            slots = _database_slots[key] = DatabaseSlots()
+        slots._join(limit)
+    try:
+        yield slots
+    finally:
+        with _slots_lock:
+            slots._leave(limit)
+            if not slots.users and _database_slots.get(key) is slots:
+                del _database_slots[key]
+
+
+class CrawlResult:
+    """Outcome of one crawl task: value or error, plus wall-clock seconds."""
+
+    __slots__ = ('value', 'error', 'seconds')
+
+    def __init__(self, value: Any = None, error: Optional[BaseException] = None, seconds: float = 0.0):
+        self.value = value
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class TableCrawler:
+    """Fans per-table work (COUNT(*), profiling, ...) out over pooled connections.
+
+    Tasks start in descending estimated cost, so the largest tables begin
+    first and the run finishes close to the time of the slowest table rather
+    than the sum of all of them. Each task runs inside analyzer.connection()
+    on its own pooled connection with a server-side statement timeout, and
+    takes one of the analyzer's crawl_slots (its share of the pool, shared by
+    every crawl it runs) and one of the database's shared slots
+    (database_slots()) for its duration.
+    """
+
+    def __init__(self, analyzer, concurrency: int = 4, timeout: Optional[float] = None):
+        self.analyzer = analyzer
+        # More workers than the analyzer's crawl share of the pool would only wait on it
+        self.concurrency = max(1, min(concurrency, analyzer.crawl_connections))
+        self.timeout = timeout
+
+    def run(self, tasks: Iterable[Tuple[Hashable, Optional[float]]],
+            work: Callable[[Hashable], Any],
+            progress: Optional[Callable[[Hashable, CrawlResult, int, int], None]] = None) -> Dict[Hashable, CrawlResult]:
+        """Run work(key) for every (key, estimated cost) task; returns {key: CrawlResult}.
+
+        Unknown costs (None) are scheduled first, as they may be the largest.
+        ``progress(key, result, done, total)`` is called as each task finishes.
+        """
+        ordered = sorted(tasks, key=lambda task: (task[1] is not None, -(task[1] or 0)))
+        results: Dict[Hashable, CrawlResult] = {}
+        if not ordered:
+            return results
+
+        lock = threading.Lock()
+        total = len(ordered)
+
+        def execute(key):
+            with self.analyzer.crawl_slots, slots:
+                started = time.monotonic()
+                try:
+                    value = self._run_one(key, work)
+                    result = CrawlResult(value, None, time.monotonic() - started)
+                except Exception as exc:
+                    result = CrawlResult(None, exc, time.monotonic() - started)
+            with lock:
+                results[key] = result
+                done = len(results)
+            if progress is not None:
+                progress(key, result, done, total)
+
+        # ThreadPoolExecutor runs submissions in order, so the cost order holds
+        with database_slots(self.analyzer.fingerprint or str(id(self.analyzer)), self.concurrency) as slots, \
+                ThreadPoolExecutor(max_workers=min(self.concurrency, total), thread_name_prefix="crawler") as executor:
+            for future in [executor.submit(execute, key) for key, _ in ordered]:
+                future.result()
+        return results
+
+    def _run_one(self, key, work):
+        analyzer = self.analyzer
+        with analyzer.connection(), analyzer.statement_timeout(self.timeout):
+            return work(key)
@@ -1,25 +1,238 @@
 import getpass
 import datetime
+import importlib
+import random
+import threading
+import time
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Tuple, Set
 from difflib import SequenceMatcher
 import re
-import datetime
-import openpyxl
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-import psycopg2
-import pyodbc
-import mysql.connector
-import re
+
+from catalog import Catalog, MetadataCache
+from catalog_store import CatalogStore, connection_fingerprint
+from column_index import ColumnIndex
+from crawler import CrawlResult, TableCrawler
+from graph_render import graph_hash, render_graph
+from lineage import LineageGraph, node_id
+from profiler import (DEFAULT_BATCH_SIZE, PROFILE_MODES, TableProfiler, assess_column, profile_note, quality_report,
+                      stats_column_profile)
+from sampling import (estimated_duplicate_pairs, row_level, sample_spec, sample_summary, suggested_sample_percent,
+                      wilson_interval)
+from connection_pool import ConnectionPool, PooledConnection
+from dialects import Dialect, StatementTimeoutError, get_dialect
+
+# Database drivers and report libraries (openpyxl, graphviz, matplotlib) are
+# imported on first use so startup only pays for what a session needs.
+# db_type -> (driver module, pip package)
+DB_DRIVERS = {
+    "postgresql": ("psycopg2", "psycopg2-binary"),
+    "sqlserver": ("pyodbc", "pyodbc"),
+    "mysql": ("mysql.connector", "mysql-connector-python"),
+}
+
+
+def load_driver(db_type: str):
+    """Import and return the DB-API driver module for db_type."""
+    if db_type not in DB_DRIVERS:
+        raise ValueError(f"Unsupported db_type: {db_type}")
+    return importlib.import_module(DB_DRIVERS[db_type][0])
+
+
+def _same(value):
+    return value
+
+
+def _pairs_to_rows(mapping: Dict) -> List:
+    return [[schema, name, value] for (schema, name), value in mapping.items()]
+
+
+def _rows_to_pairs(rows: List) -> Dict:
+    return {(schema, name): value for schema, name, value in rows}
+
+
+# Metadata cache keys persisted to disk between runs -> (to JSON, from JSON)
+PERSISTED_METADATA = {
+    'catalog': (Catalog.to_dict, Catalog.from_dict),
+    'views_count': (_same, _same),
+    'schemas_count': (_same, _same),
+    'view_definitions': (_pairs_to_rows, _rows_to_pairs),
+    'row_estimates': (_pairs_to_rows, _rows_to_pairs),
+    'table_sizes': (_pairs_to_rows, _rows_to_pairs),
+    'indexes': (_pairs_to_rows, _rows_to_pairs),
+    'lineage': (LineageGraph.to_dict, LineageGraph.from_dict),
+}
+
+ROW_COUNT_MODES = ("estimate", "exact", "auto")
+# The primary connection, one request worker and one crawl connection
+MIN_POOL_SIZE = 3
+
+# Duplicate groups listed (each with one representative row) by the CLI and the combination finder
+DUPLICATE_DISPLAY_GROUPS = 20
 
 
 class DatabaseAnalyzer:
     """Enhanced Database Schema Analyzer with improved connection handling and features."""
     
-    def __init__(self):
-        self.conn = None
-        self.cursor = None
+    def __init__(self, pool_size: int = 10, pool_max_idle: float = 300.0,
+                 metadata_ttl: Optional[float] = 300.0, persist_metadata: bool = True,
+                 exact_count_threshold: int = 100000, exact_profile_threshold: int = 100000,
+                 crawl_concurrency: int = 4,
+                 crawl_timeout: Optional[float] = 300.0):
+        if pool_size < MIN_POOL_SIZE:
+            raise ValueError(f"pool_size must be at least {MIN_POOL_SIZE}")
+        self._conn = None
+        self._cursor = None
         self.db_type = None
+        self.dialect: Optional[Dialect] = None
+        self.pool_size = pool_size
+        self.pool_max_idle = pool_max_idle
+        # Besides the primary connection the pool is split between request workers
+        # (AsyncDatabaseAnalyzer) and crawl tasks, so crawls started by concurrent
+        # requests queue on crawl_slots instead of draining the pool
+        self.request_workers = max(1, (pool_size - 1) // 2)
+        self.crawl_connections = max(1, pool_size - 1 - self.request_workers)
+        self.crawl_slots = threading.BoundedSemaphore(self.crawl_connections)
+        self._pool: Optional[ConnectionPool] = None
+        self._primary: Optional[PooledConnection] = None
+        # Catalog-derived metadata, revalidated against the schema version probe.
+        # Statistics, sizes and index sizes move with the data, not the schema,
+        # so those entries are also cached with max_age=metadata_ttl
+        self.metadata_ttl = metadata_ttl
+        # Tables estimated below this many rows get an exact COUNT(*) in 'auto' mode
+        self.exact_count_threshold = exact_count_threshold
+        # Tables estimated above this many rows are profiled with approximate distinct counts
+        self.exact_profile_threshold = exact_profile_threshold
+        # Parallel per-table work (exact counts, profiling): workers per database
+        # and the statement timeout applied to each table
+        self.crawl_concurrency = crawl_concurrency
+        self.crawl_timeout = crawl_timeout
+        self._cache = MetadataCache(ttl=metadata_ttl, version_probe=self._schema_version)
+        # On-disk snapshots of that metadata, keyed by connection fingerprint
+        self._store: Optional[CatalogStore] = CatalogStore() if persist_metadata else None
+        self.fingerprint: Optional[str] = None
+        self.metadata_restored_at: Optional[float] = None
+        # Per-thread connection/cursor bound by connection()
+        self._local = threading.local()
+        # Latest profile per table with the change fingerprint it was taken at
+        self._profiles: Dict[Tuple[str, str], Dict] = {}
+        self._profiles_lock = threading.Lock()
+
+    @property
+    def conn(self):
+        """Connection bound to the calling thread, or the primary connection."""
+        pooled = getattr(self._local, 'pooled', None)
+        return pooled.raw if pooled is not None else self._conn
+
+    @conn.setter
+    def conn(self, value):
+        self._conn = value
+
+    @property
+    def cursor(self):
+        """Cursor bound to the calling thread, or the primary cursor."""
+        cursor = getattr(self._local, 'cursor', None)
+        return cursor if cursor is not None else self._cursor
+
+    @cursor.setter
+    def cursor(self, value):
+        self._cursor = value
+
+    def is_connected(self) -> bool:
+        """True once connect_database() succeeded and until close_connection()."""
+        return self._pool is not None and self._cursor is not None
+
+    @contextmanager
+    def connection(self):
+        """Check out a pooled connection and bind it, with its own cursor, to this thread.
+
+        Every method that uses ``self.cursor`` inside the block runs on the
+        checked-out connection, so concurrent callers never share a cursor.
+        Nested calls reuse the connection already bound to the thread.
+        """
+        if self._pool is None:
+            raise RuntimeError("Not connected. Call connect_database() first.")
+        if getattr(self._local, 'pooled', None) is not None:
+            yield self._local.pooled
+            return
+
+        pooled = self._pool.acquire()
+        cursor = None
+        try:
+            cursor = pooled.raw.cursor()
+            self._local.pooled = pooled
+            self._local.cursor = cursor
+            yield pooled
+        finally:
+            self._local.pooled = None
+            self._local.cursor = None
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            self._pool.release(pooled)
+
+    def _current_pooled(self) -> Optional[PooledConnection]:
+        """Pooled connection behind self.cursor for the calling thread."""
+        return getattr(self._local, 'pooled', None) or self._primary
+
+    @contextmanager
+    def statement_timeout(self, seconds: Optional[float]):
+        """Bound the block to about ``seconds`` on the calling thread's connection.
+
+        Each statement is cancelled server-side after ``seconds``, and
+        streamed scans (profiler.stream_batches()), whose every fetch is a
+        statement of its own, stop with StatementTimeoutError once the
+        block's deadline has passed. Nested blocks only tighten the bound;
+        the outer limit is restored on exit. A failed statement is rolled
+        back first. None or 0 leaves the connection as it is; engines
+        without a usable timeout setting are bounded by the deadline alone.
+        """
+        outer = getattr(self._local, 'deadline', None)
+        deadline = time.monotonic() + seconds if seconds else None
+        if deadline is None or (outer is not None and outer <= deadline):
+            yield
+            return
+        timed = self._set_statement_timeout(seconds)
+        self._local.deadline = deadline
+        try:
+            yield
+        except Exception:
+            self._rollback_quietly()
+            raise
+        finally:
+            self._local.deadline = outer
+            if timed:
+                # A lapsed outer limit still needs a positive setting: 0 would mean unlimited
+                self._set_statement_timeout(max(outer - time.monotonic(), 0.001) if outer is not None else None)
+
+    def deadline(self) -> Optional[float]:
+        """time.monotonic() deadline of the calling thread's innermost statement_timeout() block, if any."""
+        return getattr(self._local, 'deadline', None)
+
+    def _set_statement_timeout(self, seconds: Optional[float]) -> bool:
+        try:
+            self.dialect.set_statement_timeout(self._current_pooled(), self.cursor, seconds)
+            return True
+        except Exception:
+            try:
+                self.conn.rollback()
+            except Exception:
+                pass
+            return False
+
+    def _query(self, name: str, params: Tuple = ()) -> List[Tuple]:
+        """Run a named catalog statement from the active dialect and return all rows."""
+        return self.dialect.fetchall(self._current_pooled(), self.cursor, name, params)
+
+    def _query_one(self, name: str, params: Tuple = ()) -> Optional[Tuple]:
+        """Run a named catalog statement and return its first row (or None)."""
+        return self.dialect.fetchone(self._current_pooled(), self.cursor, name, params)
+
+    def pool_stats(self) -> Dict:
+        """Return connection pool metrics (empty when not connected)."""
+        return self._pool.stats() if self._pool else {}
         
     def get_connection_params(self, db_type: str) -> Dict:
         """Get connection parameters with smart defaults and flexible input."""
@@ -70,132 +283,199 @@ class DatabaseAnalyzer:
         return params
     
     def connect_database(self, db_type: str, params: Dict) -> bool:
-        """Establish database connection with enhanced error handling."""
+        """Establish database connection pool with enhanced error handling."""
         try:
             self.db_type = db_type
-            
+            self.dialect = get_dialect(db_type)
+            driver = load_driver(db_type)
+
             if db_type == "postgresql":
-                
-                self.conn = psycopg2.connect(
-                    host=params['host'],
-                    port=params['port'],
-                    dbname=params['database'],
-                    user=params['username'],
-                    password=params['password'],
-                    connect_timeout=10
-                )
-                
+
+                def factory():
+                    return driver.connect(
+                        host=params['host'],
+                        port=params['port'],
+                        dbname=params['database'],
+                        user=params['username'],
+                        password=params['password'],
+                        connect_timeout=10
+                    )
+
             elif db_type == "sqlserver":
-                
+
                 if params.get('trusted_connection', False):
                     conn_str = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={params['server']};DATABASE={params['database']};Trusted_Connection=yes;"
                 elif 'server' in params:
                     conn_str = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={params['server']};DATABASE={params['database']};UID={params['username']};PWD={params['password']}"
                 else:
                     conn_str = f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={params['host']},{params['port']};DATABASE={params['database']};UID={params['username']};PWD={params['password']}"
-                
-                self.conn = pyodbc.connect(conn_str, timeout=10)
-                
+
+                def factory():
+                    return driver.connect(conn_str, timeout=10)
+
             elif db_type == "mysql":
-                
-                self.conn = mysql.connector.connect(
-                    host=params['host'],
-                    port=params['port'],
-                    database=params['database'],
-                    user=params['username'],
-                    password=params['password'],
-                    connection_timeout=10
-                )
-                
+
+                def factory():
+                    return driver.connect(
+                        host=params['host'],
+                        port=params['port'],
+                        database=params['database'],
+                        user=params['username'],
+                        password=params['password'],
+                        connection_timeout=10
+                    )
+
+            self._pool = ConnectionPool(factory, max_size=self.pool_size, min_size=1, max_idle=self.pool_max_idle)
+            # The primary connection serves single-threaded (CLI) use of self.cursor
+            self._primary = self._pool.acquire()
+            self.conn = self._primary.raw
             self.cursor = self.conn.cursor()
+            self.fingerprint = connection_fingerprint(db_type, params)
+            with self._profiles_lock:
+                self._profiles.clear()
+            self._restore_metadata()
             print(f"✓ Successfully connected to {db_type.upper()} database!")
             return True
-            
+
         except ImportError as e:
             print(f"✗ Required database driver not installed: {e}")
-            print(f"Install it using: pip install {'psycopg2-binary' if db_type == 'postgresql' else 'pyodbc' if db_type == 'sqlserver' else 'mysql-connector-python'}")
+            print(f"Install it using: pip install {DB_DRIVERS[db_type][1]}")
+            self._reset_pool()
             return False
         except Exception as e:
             print(f"✗ Connection failed: {e}")
+            self._reset_pool()
             return False
-          
 
-    def get_tables(self) -> List[Tuple[str, str]]:
-        """Fetches and returns a list of (schema, table_name) pairs."""
-        try:
-            if self.db_type == "mysql":
-                self.cursor.execute("""
-                    SELECT TABLE_SCHEMA, TABLE_NAME 
-                    FROM INFORMATION_SCHEMA.TABLES 
-                    WHERE TABLE_TYPE = 'BASE TABLE'
-                """)
-                tables = [(row[0], row[1]) for row in self.cursor.fetchall()]
+    def _reset_pool(self):
+        """Drop the pool and primary connection after a failed connect or on close."""
+        if self._primary is not None and self._pool is not None:
+            self._pool.release(self._primary, discard=True)
+        if self._pool is not None:
+            self._pool.close()
+        self._primary = None
+        self._pool = None
+        self._cache.invalidate()
+        self.conn = None
+        self.cursor = None
 
-            elif self.db_type == "sqlserver":
-                self.cursor.execute("""
-                    SELECT TABLE_SCHEMA, TABLE_NAME 
-                    FROM INFORMATION_SCHEMA.TABLES 
-                    WHERE TABLE_TYPE = 'BASE TABLE'
-                """)
-                tables = [(row[0], row[1]) for row in self.cursor.fetchall()]
 
-            elif self.db_type == "postgresql":
-                self.cursor.execute("""
-                    SELECT table_schema, table_name 
-                    FROM information_schema.tables 
-                    WHERE table_type='BASE TABLE'
-                """)
-                tables = [(row[0], row[1]) for row in self.cursor.fetchall()]
+    def _schema_version(self) -> Optional[str]:
+        """Cheap token that changes whenever DDL touches the catalog."""
+        row = self._query_one('schema_version')
+        return None if row is None or row[0] is None else str(row[0])
+
+    def cached(self, key: str, loader, max_age: Optional[float] = None):
+        """Serve catalog-derived metadata from the TTL cache, loading it on a miss."""
+        if key not in PERSISTED_METADATA:
+            return self._cache.get(key, loader, max_age)
+
+        def load_and_persist():
+            value = loader()
+            self._persist(key, value)
+            return value
 
-            return sorted(tables)
+        return self._cache.get(key, load_and_persist, max_age)
+
+    def _persist(self, key: str, value):
+        """Write one cache entry to the on-disk store, if persistence is on."""
+        if self._store is not None and self.fingerprint:
+            self._store.save(self.fingerprint, key, PERSISTED_METADATA[key][0](value), self._cache.version)
+
+    def _restore_metadata(self):
+        """Seed the cache from the last on-disk snapshot, then revalidate it in the background."""
+        self.metadata_restored_at = None
+        if self._store is None or not self.fingerprint:
+            return
+        # Stored table profiles share the file but are loaded on demand
+        snapshots = self._store.load_all(self.fingerprint, PERSISTED_METADATA)
+        if 'catalog' not in snapshots:
+            return
+        version = snapshots['catalog'][1]
+        entries = {}
+        saved_at = {}
+        for key, (payload, key_version, key_saved_at) in snapshots.items():
+            # Only restore entries taken at the same schema version as the catalog
+            if key in PERSISTED_METADATA and key_version == version:
+                try:
+                    entries[key] = PERSISTED_METADATA[key][1](payload)
+                    saved_at[key] = key_saved_at
+                except Exception:
+                    continue
+        if 'catalog' not in entries:
+            return
+        self._cache.seed(entries, version, saved_at)
+        self.metadata_restored_at = snapshots['catalog'][2]
+
+        def revalidate():
+            try:
+                with self.connection():
+                    if not self._cache.revalidate(force=True):
+                        self.get_catalog()
+            except Exception:
+                pass
+
+        threading.Thread(target=revalidate, name="dba-metadata-revalidate", daemon=True).start()
+
+    def invalidate_metadata(self, key: Optional[str] = None):
+        """Drop cached metadata so the next lookup goes back to the database."""
+        self._cache.invalidate(key)
+
+    def metadata_cache_stats(self) -> Dict:
+        return self._cache.stats()
+
+    def load_catalog(self) -> Catalog:
+        """Pull every table, view and column in two bulk queries."""
+        objects = self._query('catalog_objects')
+        columns = self._query('catalog_columns')
+        return Catalog(objects, columns)
+
+    def get_catalog(self) -> Catalog:
+        """Return the cached catalog snapshot, loading it when missing or stale."""
+        return self.cached('catalog', self.load_catalog)
+
+    def get_column_index(self) -> ColumnIndex:
+        """Inverted column-name index over the cached catalog snapshot."""
+        return self.cached('column_index', lambda: ColumnIndex(self.get_catalog()))
+
+    def search_columns(self, query: str, mode: str = "auto", limit: Optional[int] = 50,
+                       offset: int = 0) -> Tuple[int, List[Dict]]:
+        """Ranked exact/prefix/substring/fuzzy column matches; returns (total, page)."""
+        return self.get_column_index().search(query, mode=mode, limit=limit, offset=offset)
+
+    def get_tables(self) -> List[Tuple[str, str]]:
+        """Fetches and returns a list of (schema, table_name) pairs."""
+        try:
+            return self.get_catalog().tables
 
         except Exception as e:
             print(f"✗ Error fetching tables: {e}")
             return []
 
-
     def get_views(self) -> List[Tuple[str, str]]:
         """Fetches and returns a list of (schema, view_name) pairs."""
         try:
-            if self.db_type.lower() == "mysql":
-                self.cursor.execute("""
-                    SELECT TABLE_SCHEMA, TABLE_NAME
-                    FROM INFORMATION_SCHEMA.TABLES
-                    WHERE TABLE_TYPE = 'VIEW'
-                    AND TABLE_SCHEMA NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
-                """)
-                views = [(row[0], row[1]) for row in self.cursor.fetchall()]
-
-            elif self.db_type.lower() == "sqlserver":
-                self.cursor.execute("""
-                    SELECT TABLE_SCHEMA, TABLE_NAME
-                    FROM INFORMATION_SCHEMA.VIEWS
-                """)
-                views = [(row[0], row[1]) for row in self.cursor.fetchall()]
-
-            elif self.db_type.lower() == "postgresql":
-                # exclude system schemas
-                self.cursor.execute("""
-                    SELECT table_schema, table_name
-                    FROM information_schema.views
-                    WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
-                """)
-                views = [(row[0], row[1]) for row in self.cursor.fetchall()]
-
-            else:
-                raise ValueError(f"Unsupported db_type: {self.db_type}")
-
-            return sorted(views)
+            return self.get_catalog().views
 
         except Exception as e:
             print(f"✗ Error fetching views: {e}")
             return []
 
+    def export_all_tables_analysis(self, large_tables: Optional[str] = None):
+        """Export detailed analysis of all tables to Excel.
 
-
-    def export_all_tables_analysis(self):
-        """Export detailed analysis of all tables to Excel."""
+        ``large_tables`` picks how tables over 1M rows are profiled: 'stats'
+        (optimizer statistics, no scan), 'sample' (a ~100,000-row
+        TABLESAMPLE) or 'full'; None asks when there are any.
+        """
         print(f"\n{'='*20} EXPORT ALL TABLES ANALYSIS {'='*20}")
+
+        try:
+            from openpyxl import Workbook
+            from openpyxl.styles import Font, PatternFill
+        except ImportError:
+            print("💡 Excel export requires 'openpyxl': pip install openpyxl")
+            return
         
         tables = self.get_tables()
         if not tables:
@@ -209,191 +489,214 @@ class DatabaseAnalyzer:
             proceed = input(f"This will analyze {len(tables)} tables and may take time. Continue? (y/N): ").strip().lower()
             if proceed != 'y':
                 return
+        
+        # Create workbook
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "All Tables Analysis"
+        
+        # Add header
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ws['A1'] = f"All Tables Analysis Report - {self.db_type.upper()}"
+        ws['A1'].font = Font(size=14, bold=True)
+        ws['A2'] = f"Generated: {timestamp}"
+        ws['A3'] = f"Total Tables: {len(tables)}"
+        
+        current_row = 5
+
+        # Database work runs in parallel up front; the sheet is then written in table order
+        row_counts = self.get_row_counts(tables)
+        # Exact distinct counts for small tables, HyperLogLog for the rest
+        profile_modes = {
+            key: "exact" if not count['estimated'] and count['rows'] <= self.exact_profile_threshold else "approximate"
+            for key, count in row_counts.items() if count['rows'] is None or count['rows'] > 0
+        }
+        profiled = [key for key in tables if key in profile_modes]
+        large = {key: row_counts[key]['rows'] for key in profiled if (row_counts[key]['rows'] or 0) > 1000000}
+        if large and large_tables is None:
+            print(f"{len(large)} tables have over 1M rows. Profile them from:")
+            print("1. Optimizer statistics (no table scan)")
+            print("2. A ~100,000-row sample of each")
+            print("3. A full scan")
+            answer = input("Choose option (1-3, default 1): ").strip()
+            large_tables = {"2": "sample", "3": "full"}.get(answer, "stats")
+        samples = {}
+        if large_tables == "sample":
+            samples = {key: sample_spec(suggested_sample_percent(rows)) for key, rows in large.items()}
+        elif large_tables == "stats":
+            profile_modes.update({key: "stats" for key in large})
+
+        def report_progress(key, result, done, total):
+            status = "✓" if result.ok else f"✗ {result.error}"
+            print(f"Profiled {done}/{total}: {key[0]}.{key[1]} ({result.seconds:.1f}s) {status}")
+
+        # Tables whose change fingerprint has not moved keep their stored profile
+        try:
+            changes = self.get_change_fingerprints()
+        except Exception:
+            self._rollback_quietly()
+            changes = {}
+        reused = {}
+        for key in profiled:
+            stored = self._reuse_profile(*key, self._get_column_info(*key), profile_modes[key],
+                                         samples.get(key), changes.get(key))
+            if stored is not None:
+                reused[key] = stored
+        stale = [key for key in profiled if key not in reused]
+        if reused:
+            print(f"{len(reused)} tables unchanged since their last profile; scanning {len(stale)}")
+
+        profiles = self.crawl(
+            stale,
+            lambda key: self.get_table_profile(*key, mode=profile_modes[key], sample=samples.get(key),
+                                               changes=changes),
+            report_progress,
+        )
+        profiles.update({key: CrawlResult(stored) for key, stored in reused.items()})
+
+        # Process each table
+        for table_idx, (schema, table_name) in enumerate(tables, 1):
+            print(f"Writing {table_idx}/{len(tables)}: {schema}.{table_name}")
             
-            # Create workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "All Tables Analysis"
-            
-            # Add header
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            ws['A1'] = f"All Tables Analysis Report - {self.db_type.upper()}"
-            ws['A1'].font = Font(size=14, bold=True)
-            ws['A2'] = f"Generated: {timestamp}"
-            ws['A3'] = f"Total Tables: {len(tables)}"
-            
-            current_row = 5
-            
-            # Process each table
-            for table_idx, (schema, table_name) in enumerate(tables, 1):
-                print(f"Processing {table_idx}/{len(tables)}: {schema}.{table_name}")
+            try:
+                # Table header
+                ws[f'A{current_row}'] = f"TABLE: {schema}.{table_name}"
+                ws[f'A{current_row}'].font = Font(size=12, bold=True)
+                ws[f'A{current_row}'].fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+                ws[f'A{current_row}'].font = Font(color="FFFFFF", bold=True)
+                current_row += 1
                 
-                try:
-                    # Table header
-                    ws[f'A{current_row}'] = f"TABLE: {schema}.{table_name}"
-                    ws[f'A{current_row}'].font = Font(size=12, bold=True)
-                    ws[f'A{current_row}'].fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-                    ws[f'A{current_row}'].font = Font(color="FFFFFF", bold=True)
+                # Basic table stats (statistics estimate for very large tables)
+                count = row_counts[(schema, table_name)]
+                ws[f'A{current_row}'] = f"Total Rows: {self._format_row_count(count)}"
+                current_row += 1
+                
+                # Column information
+                columns_info = self._get_column_info(schema, table_name)
+                ws[f'A{current_row}'] = f"Total Columns: {len(columns_info)}"
+                current_row += 1
+                
+                # Table size
+                table_size = self._get_table_size(schema, table_name)
+                if table_size:
+                    ws[f'A{current_row}'] = f"Estimated Size: {table_size}"
                     current_row += 1
-                    
-                    # Basic table stats
-                    self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table_name}")
-                    row_count = self.cursor.fetchone()[0]
-                    ws[f'A{current_row}'] = f"Total Rows: {row_count:,}"
+                
+                # Column details header
+                current_row += 1
+                ws[f'A{current_row}'] = "Column Name"
+                ws[f'B{current_row}'] = "Data Type"
+                ws[f'C{current_row}'] = "Nullable"
+                ws[f'D{current_row}'] = "Default"
+                
+                # Style column headers
+                for col in ['A', 'B', 'C', 'D']:
+                    cell = ws[f'{col}{current_row}']
+                    cell.font = Font(bold=True)
+                    cell.fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
+                
+                current_row += 1
+                
+                # Column details
+                for col_info in columns_info:
+                    ws[f'A{current_row}'] = col_info['name']
+                    ws[f'B{current_row}'] = col_info['type']
+                    ws[f'C{current_row}'] = col_info['nullable']
+                    ws[f'D{current_row}'] = str(col_info.get('default', 'None'))[:30]
                     current_row += 1
-                    
-                    # Column information
-                    columns_info = self._get_column_info(schema, table_name)
-                    ws[f'A{current_row}'] = f"Total Columns: {len(columns_info)}"
+                
+                # Data quality analysis (for reasonable-sized tables)
+                stats = profiles.get((schema, table_name))
+                if stats is not None and not stats.ok:
                     current_row += 1
-                    
-                    # Table size
-                    table_size = self._get_table_size(schema, table_name)
-                    if table_size:
-                        ws[f'A{current_row}'] = f"Estimated Size: {table_size}"
-                        current_row += 1
-                    
-                    # Column details header
+                    ws[f'A{current_row}'] = f"Data Quality Analysis failed: {stats.error}"
+                    ws[f'A{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
                     current_row += 1
-                    ws[f'A{current_row}'] = "Column Name"
-                    ws[f'B{current_row}'] = "Data Type"
-                    ws[f'C{current_row}'] = "Nullable"
-                    ws[f'D{current_row}'] = "Default"
-                    
-                    # Style column headers
-                    for col in ['A', 'B', 'C', 'D']:
-                        cell = ws[f'{col}{current_row}']
-                        cell.font = Font(bold=True)
-                        cell.fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-                    
+                elif stats is not None:
                     current_row += 1
+                    qualifiers = []
+                    if stats.value.get('sample'):
+                        drawn = stats.value['sample']
+                        qualifiers.append(f"{drawn['percent']:g}% {drawn['method']} sample of {drawn['rows']:,} rows")
+                    if stats.value['mode'] == "approximate":
+                        qualifiers.append("approximate distinct counts")
+                    elif stats.value['mode'] == "stats":
+                        qualifiers.append("optimizer statistics")
+                    if stats.value.get('cached'):
+                        profiled_at = datetime.datetime.fromtimestamp(stats.value['profiled_at'])
+                        qualifiers.append(f"unchanged since {profiled_at:%Y-%m-%d %H:%M}")
+                    ws[f'A{current_row}'] = "Data Quality Analysis" + (f" ({'; '.join(qualifiers)})" if qualifiers else "")
+                    ws[f'A{current_row}'].font = Font(bold=True)
+                    ws[f'A{current_row}'].fill = PatternFill(start_color="E6E6FA", end_color="E6E6FA", fill_type="solid")
+                    current_row += 1
+                    
+                    quality_issues = []
                     
-                    # Column details
-                    for col_info in columns_info:
-                        ws[f'A{current_row}'] = col_info['name']
-                        ws[f'B{current_row}'] = col_info['type']
-                        ws[f'C{current_row}'] = col_info['nullable']
-                        ws[f'D{current_row}'] = str(col_info.get('default', 'None'))[:30]
+                    for col in stats.value['columns']:
+                        if 'error' in col:
+                            ws[f'A{current_row}'] = f"ERROR: {col['name']}"
+                            ws[f'B{current_row}'] = profile_note(col)
+                            ws[f'A{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+                            ws[f'B{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+                            current_row += 1
+                            continue
+
+                        status = "WARNING" if col['status'] == 'warning' else "OK"
+                        if col['issue']:
+                            quality_issues.append(col['issue'])
+                        ws[f'A{current_row}'] = f"{status}: {col['name']}"
+                        ws[f'B{current_row}'] = profile_note(col)
+
+                        # Color code warnings
+                        if status == "WARNING":
+                            ws[f'A{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+                            ws[f'B{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+
                         current_row += 1
                     
-                    # Data quality analysis (for reasonable-sized tables)
-                    if 0 < row_count <= 100000:
+                    if quality_issues:
                         current_row += 1
-                        ws[f'A{current_row}'] = "Data Quality Analysis"
+                        ws[f'A{current_row}'] = "Quality Issues Summary:"
                         ws[f'A{current_row}'].font = Font(bold=True)
-                        ws[f'A{current_row}'].fill = PatternFill(start_color="E6E6FA", end_color="E6E6FA", fill_type="solid")
                         current_row += 1
-                        
-                        quality_issues = []
-                        
-                        for col_info in columns_info:
-                            col_name = col_info['name']
-                            is_nullable = col_info['nullable'] == 'YES'
-                            
-                            try:
-                                # Check for NULL values
-                                self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table_name} WHERE {col_name} IS NULL")
-                                null_count = self.cursor.fetchone()[0]
-                                
-                                # Check for empty strings (for string columns)
-                                empty_count = 0
-                                if 'char' in col_info['type'].lower() or 'text' in col_info['type'].lower():
-                                    self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table_name} WHERE {col_name} = ''")
-                                    empty_count = self.cursor.fetchone()[0]
-                                
-                                # Get distinct count
-                                self.cursor.execute(f"SELECT COUNT(DISTINCT {col_name}) FROM {schema}.{table_name}")
-                                distinct_count = self.cursor.fetchone()[0]
-                                
-                                # Calculate percentages
-                                null_pct = (null_count / row_count) * 100 if row_count > 0 else 0
-                                empty_pct = (empty_count / row_count) * 100 if row_count > 0 else 0
-                                cardinality = (distinct_count / row_count) * 100 if row_count > 0 else 0
-                                
-                                # Report findings
-                                status = "OK"
-                                notes = []
-                                
-                                if not is_nullable and null_count > 0:
-                                    status = "WARNING"
-                                    notes.append(f"{null_count} NULLs in non-nullable column")
-                                    quality_issues.append(f"Column '{col_name}': NULL constraint violation")
-                                
-                                if null_pct > 50:
-                                    status = "WARNING"
-                                    notes.append(f"High NULL rate: {null_pct:.1f}%")
-                                
-                                if empty_pct > 20:
-                                    status = "WARNING"
-                                    notes.append(f"High empty string rate: {empty_pct:.1f}%")
-                                
-                                if cardinality < 1 and row_count > 1:
-                                    status = "WARNING"
-                                    notes.append("All values identical")
-                                
-                                note_text = "; ".join(notes) if notes else f"Distinct: {distinct_count} ({cardinality:.1f}%)"
-                                
-                                ws[f'A{current_row}'] = f"{status}: {col_name}"
-                                ws[f'B{current_row}'] = note_text
-                                
-                                # Color code warnings
-                                if status == "WARNING":
-                                    ws[f'A{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                                    ws[f'B{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                                
-                                current_row += 1
-                                
-                            except Exception as e:
-                                ws[f'A{current_row}'] = f"ERROR: {col_name}"
-                                ws[f'B{current_row}'] = f"Error analyzing: {e}"
-                                ws[f'A{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                                ws[f'B{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                                current_row += 1
-                        
-                        if quality_issues:
-                            current_row += 1
-                            ws[f'A{current_row}'] = "Quality Issues Summary:"
-                            ws[f'A{current_row}'].font = Font(bold=True)
+                        for issue in quality_issues:
+                            ws[f'A{current_row}'] = f"- {issue}"
                             current_row += 1
-                            for issue in quality_issues:
-                                ws[f'A{current_row}'] = f"- {issue}"
-                                current_row += 1
-                    else:
-                        current_row += 1
-                        skip_reason = "Table too large" if row_count > 100000 else "Table empty"
-                        ws[f'A{current_row}'] = f"Data Quality Analysis skipped: {skip_reason}"
-                        ws[f'A{current_row}'].fill = PatternFill(start_color="FFF2E6", end_color="FFF2E6", fill_type="solid")
-                        current_row += 1
-                    
-                    # Add separator between tables
-                    current_row += 2
-                    
-                except Exception as e:
-                    ws[f'A{current_row}'] = f"ERROR analyzing table '{schema}.{table_name}': {e}"
-                    ws[f'A{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-                    current_row += 2
-            
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 80)
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Save file
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"all_tables_analysis_{self.db_type}_{timestamp}.xlsx"
-            wb.save(filename)
-            
-            print(f"\nAll tables analysis exported to: {filename}")
-            print(f"Analysis completed for {len(tables)} tables")
-            
+                else:
+                    current_row += 1
+                    ws[f'A{current_row}'] = "Data Quality Analysis skipped: Table empty"
+                    ws[f'A{current_row}'].fill = PatternFill(start_color="FFF2E6", end_color="FFF2E6", fill_type="solid")
+                    current_row += 1
+                
+                # Add separator between tables
+                current_row += 2
+                
+            except Exception as e:
+                ws[f'A{current_row}'] = f"ERROR analyzing table '{schema}.{table_name}': {e}"
+                ws[f'A{current_row}'].fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
+                current_row += 2
+        
+        # Auto-adjust column widths
+        for column in ws.columns:
+            max_length = 0
+            column_letter = column[0].column_letter
+            for cell in column:
+                try:
+                    if len(str(cell.value)) > max_length:
+                        max_length = len(str(cell.value))
+                except:
+                    pass
+            adjusted_width = min(max_length + 2, 80)
+            ws.column_dimensions[column_letter].width = adjusted_width
+        
+        # Save file
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"all_tables_analysis_{self.db_type}_{timestamp}.xlsx"
+        wb.save(filename)
+        
+        print(f"\nAll tables analysis exported to: {filename}")
+        print(f"Analysis completed for {len(tables)} tables")
+        
 
 
     def find_tables_by_column(self, column_name: str):
@@ -403,34 +706,14 @@ class DatabaseAnalyzer:
         try:
             matching_tables = []
             
-            if self.db_type == "mysql":
-                self.cursor.execute("""
-                    SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE COLUMN_NAME = %s
-                    ORDER BY TABLE_SCHEMA, TABLE_NAME
-                """, (column_name,))
-                
-            elif self.db_type == "postgresql":
-                self.cursor.execute("""
-                    SELECT table_schema, table_name, data_type, is_nullable, column_default
-                    FROM information_schema.columns
-                    WHERE column_name = %s
-                    ORDER BY table_schema, table_name
-                """, (column_name,))
-                
-            elif self.db_type == "sqlserver":
-                self.cursor.execute("""
-                    SELECT TABLE_SCHEMA, TABLE_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
-                    FROM INFORMATION_SCHEMA.COLUMNS
-                    WHERE COLUMN_NAME = ?
-                    ORDER BY TABLE_SCHEMA, TABLE_NAME
-                """, (column_name,))
-            
-            results = self.cursor.fetchall()
+            _, results = self.search_columns(column_name, mode="exact", limit=None)
             
             if not results:
                 print(f"No tables found containing column '{column_name}'")
+                _, suggestions = self.search_columns(column_name, mode="fuzzy", limit=5)
+                if suggestions:
+                    names = sorted({m['column'] for m in suggestions})
+                    print(f"Did you mean: {', '.join(names)}?")
                 return []
             
             print(f"Found {len(results)} tables containing column '{column_name}':")
@@ -438,12 +721,12 @@ class DatabaseAnalyzer:
             print(f"{'No.':<4} {'Schema.Table':<35} {'Data Type':<20} {'Nullable':<10} {'Default':<15}")
             print("-" * 80)
             
-            for i, row in enumerate(results, 1):
-                schema = row[0]
-                table_name = row[1]
-                data_type = row[2]
-                nullable = row[3]
-                default_val = str(row[4])[:14] if row[4] else 'None'
+            for i, match in enumerate(results, 1):
+                schema = match['schema']
+                table_name = match['table']
+                data_type = match['data_type']
+                nullable = match['nullable']
+                default_val = str(match['default'])[:14] if match['default'] else 'None'
                 
                 qualified_name = f"{schema}.{table_name}"
                 matching_tables.append({
@@ -452,7 +735,7 @@ class DatabaseAnalyzer:
                     'qualified_name': qualified_name,
                     'data_type': data_type,
                     'nullable': nullable,
-                    'default': row[4]
+                    'default': match['default']
                 })
                 
                 print(f"{i:<4} {qualified_name:<35} {data_type:<20} {nullable:<10} {default_val:<15}")
@@ -473,6 +756,9 @@ class DatabaseAnalyzer:
     def _export_column_search_to_excel(self, column_name: str, matching_tables: List[Dict]):
         """Export column search results to Excel file."""
         try:
+            from openpyxl import Workbook
+            from openpyxl.styles import Font, PatternFill
+
             # Create workbook
             wb = Workbook()
             ws = wb.active
@@ -663,26 +949,31 @@ class DatabaseAnalyzer:
             enhanced_group = group.copy()
             table_info = {}
             
+            catalog = self.get_catalog()
+            refs = [tuple(table.split('.', 1)) for table in group['tables']]
+            row_counts = self.get_row_counts(refs)
             for table in group['tables']:
                 try:
-                    schema = table.split('.')[0]
-                    # Get row count
-                    self.cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    row_count = self.cursor.fetchone()[0]
+                    schema, table_name = table.split('.', 1)
+                    # Row count (statistics estimate for large tables)
+                    count = row_counts.get((schema, table_name), {})
+                    row_count = count.get('rows')
                     
                     # Get table size if possible
-                    table_size = self._get_table_size(schema, table)
+                    size_bytes = self.get_table_size_bytes(schema, table_name)
+                    table_size = self._format_bytes(size_bytes['total']) if size_bytes else None
                     
                     # Get creation date if possible
-                    creation_date = self._get_table_creation_date(schema, table)
+                    creation_date = self._get_table_creation_date(schema, table_name)
                     
-                    # Get column count
-                    columns_info = self._get_column_info(schema, table)
-                    column_count = len(columns_info)
+                    # Get column count from the catalog snapshot
+                    column_count = len(catalog.columns(schema, table_name) or [])
                     
                     table_info[table] = {
                         'row_count': row_count,
+                        'row_count_estimated': count.get('estimated', False),
                         'size': table_size,
+                        'size_bytes': size_bytes['total'] if size_bytes else None,
                         'creation_date': creation_date,
                         'column_count': column_count
                     }
@@ -704,34 +995,15 @@ class DatabaseAnalyzer:
     def _get_table_creation_date(self, schema: str, table_name: str) -> Optional[str]:
         """Get table creation date if available."""
         try:
-            if self.db_type == "sqlserver":
-                self.cursor.execute(f"""
-                    SELECT create_date 
-                    FROM sys.tables t
-                    JOIN sys.schemas s ON t.schema_id = s.schema_id
-                    WHERE s.name = '{schema}' and t.name = '{table_name}'
-                """)
-                result = self.cursor.fetchone()
-                return str(result[0]) if result else None
-                
-            elif self.db_type == "mysql":
-                self.cursor.execute(f"""
-                    SELECT CREATE_TIME 
-                    FROM information_schema.TABLES 
-                    WHERE TABLE_SCHEMA = '{schema}' AND TABLE_NAME = '{table_name}'
-                """)
-                result = self.cursor.fetchone()
-                return str(result[0]) if result and result[0] else None
-                
-            elif self.db_type == "postgresql":
-                # PostgreSQL doesn't store creation date, return None
+            # PostgreSQL doesn't store creation date, so its dialect has no statement
+            if not self.dialect.has('table_creation_date'):
                 return None
-                
+            result = self._query_one('table_creation_date', (schema, table_name))
+            return str(result[0]) if result and result[0] else None
+
         except Exception:
             return None
 
-    
-
     def _display_similar_tables_results(self, enhanced_groups: List[Dict]):
         """Display the results of similar table detection."""
         print(f"\nSIMILAR TABLES DETECTION RESULTS:")
@@ -757,7 +1029,10 @@ class DatabaseAnalyzer:
                 row_count = info.get('row_count', 'N/A')
                 
                 print(f"  🟡  {table}")
-                print(f"    - Rows: {row_count:,}" if isinstance(row_count, int) else f"    - Rows: {row_count}")
+                if isinstance(row_count, int):
+                    print(f"    - Rows: {'~' if info.get('row_count_estimated') else ''}{row_count:,}")
+                else:
+                    print(f"    - Rows: {row_count}")
                 
                 if 'error' in info:
                     print(f"    - Error: {info['error']}")
@@ -765,7 +1040,9 @@ class DatabaseAnalyzer:
     def _export_similar_tables_to_excel(self, enhanced_groups: List[Dict]):
         """Export similar tables analysis to Excel."""
         try:
-            
+            from openpyxl import Workbook
+            from openpyxl.styles import Font, PatternFill
+
             # Create workbook
             wb = Workbook()
             ws = wb.active
@@ -780,7 +1057,7 @@ class DatabaseAnalyzer:
             
             # Summary
             row_num = 5
-            headers = ['Group', 'Type', 'Table Count', 'Table Name', 'Row Count']
+            headers = ['Group', 'Type', 'Table Count', 'Table Name', 'Row Count', 'Size (bytes)']
             for col, header in enumerate(headers, 1):
                 cell = ws.cell(row=row_num, column=col, value=header)
                 cell.font = Font(bold=True)
@@ -798,6 +1075,7 @@ class DatabaseAnalyzer:
                     ws.cell(row=row_num, column=3, value=group['group_size'] if table_num == 0 else "")
                     ws.cell(row=row_num, column=4, value=table)
                     ws.cell(row=row_num, column=5, value=info.get('row_count', 'N/A'))
+                    ws.cell(row=row_num, column=6, value=info.get('size_bytes'))
                     
                     row_num += 1
             
@@ -825,12 +1103,11 @@ class DatabaseAnalyzer:
             print(f"Error exporting to Excel: {e}")
 
     def close_connection(self):
-        """Close database connection."""
+        """Close the primary connection and every pooled connection."""
         try:
-            if self.cursor:
-                self.cursor.close()
-            if self.conn:
-                self.conn.close()
+            if self._cursor:
+                self._cursor.close()
+            self._reset_pool()
             print("Database connection closed.")
         except Exception as e:
             print(f"Error closing connection: {e}")
@@ -866,157 +1143,125 @@ class DatabaseAnalyzer:
     def _get_views_count(self) -> int:
         """Get count of views."""
         try:
-            if self.db_type == "mysql":
-                self.cursor.execute("SELECT COUNT(*) FROM information_schema.views WHERE table_schema = DATABASE()")
-            elif self.db_type == "sqlserver":
-                self.cursor.execute("SELECT COUNT(*) FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = 'dbo'")
-            elif self.db_type == "postgresql":
-                self.cursor.execute("SELECT COUNT(*) FROM information_schema.views WHERE table_schema='public'")
-            return self.cursor.fetchone()[0]
+            return self.cached('views_count', lambda: self._query_one('views_count')[0])
         except:
             return 0
+
     
     def _get_schemas_count(self) -> int:
         """Get count of schemas."""
         try:
-            if self.db_type == "mysql":
-                self.cursor.execute("SELECT COUNT(*) FROM information_schema.schemata")
-            elif self.db_type == "postgresql":
-                self.cursor.execute("SELECT COUNT(*) FROM information_schema.schemata")
-            elif self.db_type == "sqlserver":
-                self.cursor.execute("SELECT COUNT(*) FROM sys.schemas")
-            return self.cursor.fetchone()[0]
+            return self.cached('schemas_count', lambda: self._query_one('schemas_count')[0])
         except:
             return 0
+
     
     def _get_database_size(self) -> Optional[str]:
         """Get database size if available."""
         try:
+            result = self._query_one('database_size')[0]
             if self.db_type == "postgresql":
-                self.cursor.execute("SELECT pg_size_pretty(pg_database_size(current_database()))")
-                return self.cursor.fetchone()[0]
-            elif self.db_type == "mysql":
-                self.cursor.execute("""
-                    SELECT ROUND(SUM(data_length + index_length) / 1024 / 1024, 2) AS 'DB Size in MB'
-                    FROM information_schema.tables 
-                    WHERE table_schema = DATABASE()
-                """)
-                result = self.cursor.fetchone()[0]
-                return f"{result} MB" if result else None
-            elif self.db_type == "sqlserver":
-                self.cursor.execute("""
-                    SELECT 
-                        CAST(SUM(CAST(FILEPROPERTY(name, 'SpaceUsed') AS bigint) * 8192.) / 1024 / 1024 AS DECIMAL(15,2)) as 'DatabaseSizeInMB'
-                    FROM sys.database_files
-                    WHERE type_desc='ROWS'
-                """)
-                result = self.cursor.fetchone()[0]
-                return f"{result} MB" if result else None
+                return result
+            return f"{result} MB" if result else None
         except:
             return None
+
     
+    def _load_indexes(self) -> Dict[Tuple[str, str], List[Dict]]:
+        """Every index in the database, grouped by table, from one catalog query."""
+        try:
+            rows = self._query('index_columns')
+        except Exception:
+            if not self.dialect.has('index_columns_fallback'):
+                raise
+            self._rollback_quietly()
+            rows = self._query('index_columns_fallback')
+
+        by_table: Dict[Tuple[str, str], List[Dict]] = {}
+        current = None
+        # Rows arrive ordered by schema, table, index and column ordinal
+        for schema, table, index_name, column, _, is_included, is_unique, is_primary, index_type, size in rows:
+            if current is None or (current['schema'], current['table'], current['name']) != (schema, table, index_name):
+                current = {
+                    'schema': schema,
+                    'table': table,
+                    'name': index_name,
+                    'columns': [],
+                    'include_columns': [],
+                    'unique': bool(is_unique),
+                    'primary': bool(is_primary),
+                    'type': index_type,
+                    'size_bytes': None if size is None else int(size),
+                }
+                by_table.setdefault((schema, table), []).append(current)
+            (current['include_columns'] if is_included else current['columns']).append(column)
+        return by_table
+
+    def get_indexes(self, schema: Optional[str] = None) -> List[Dict]:
+        """Every index in the database, or in one schema; cached for per-table lookups.
+
+        Each entry has schema, table, name, columns (key columns in order),
+        include_columns, unique, primary, type and size_bytes.
+        """
+        by_table = self.cached('indexes', self._load_indexes, max_age=self.metadata_ttl)
+        return [
+            self._copy_index(index)
+            for (index_schema, _), indexes in sorted(by_table.items())
+            if schema is None or index_schema == schema
+            for index in indexes
+        ]
+
+    def get_table_indexes(self, schema: str, table_name: str) -> List[Dict]:
+        """Indexes of one table, served from the cached index catalog."""
+        by_table = self.cached('indexes', self._load_indexes, max_age=self.metadata_ttl)
+        return [self._copy_index(index) for index in by_table.get((schema, table_name), [])]
+
+    @staticmethod
+    def _copy_index(index: Dict) -> Dict:
+        # Callers get their own lists; the cached catalog stays untouched
+        return {**index, 'columns': list(index['columns']), 'include_columns': list(index['include_columns'])}
+
     def list_indexes_for_table(self, schema: str, table_name: str):
         """Lists indexes for a specific table with enhanced formatting."""
         print(f"\n{'='*20} INDEXES FOR TABLE: {schema}.{table_name} {'='*20}")
-        
-        try:
-            if self.db_type == "mysql":
-                self.cursor.execute(f"SHOW INDEXES FROM `{schema}.{table_name}`")
-                indexes = self.cursor.fetchall()
-                if not indexes:
-                    print("ℹ️  No indexes found for this table.")
-                    return
-
-                print(f"{'Index Name':<25} {'Column Name':<25} {'Unique':<8} {'Type':<10}")
-                print("-" * 75)
-                for index_info in indexes:
-                    index_name = index_info[2]
-                    column_name = index_info[4]
-                    non_unique = index_info[1]
-                    is_unique = "Yes" if non_unique == 0 else "No"
-                    index_type = index_info[10] if len(index_info) > 10 else "BTREE"
-                    print(f"{index_name:<25} {column_name:<25} {is_unique:<8} {index_type:<10}")
 
-            elif self.db_type == "postgresql":
-                self.cursor.execute(f"""
-                    SELECT
-                        i.indexname,
-                        i.indexdef,
-                        ix.indisunique,
-                        ix.indisprimary
-                    FROM
-                        pg_indexes i
-                    JOIN pg_class t ON t.relname = i.tablename
-                    JOIN pg_index ix ON ix.indexrelid = (
-                        SELECT oid FROM pg_class WHERE relname = i.indexname
-                    )
-                    WHERE
-                        i.schemaname = '{schema}' AND i.tablename = '{table_name}';
-                """)
-                indexes = self.cursor.fetchall()
-                if not indexes:
-                    print("ℹ️  No indexes found for this table.")
-                    return
-
-                print(f"{'Index Name':<25} {'Type':<10} {'Unique':<8} {'Primary':<8}")
-                print("-" * 60)
-                for index_info in indexes:
-                    index_name = index_info[0]
-                    is_unique = "Yes" if index_info[2] else "No"
-                    is_primary = "Yes" if index_info[3] else "No"
-                    index_type = "BTREE"  # Default for PostgreSQL
-                    print(f"{index_name:<25} {index_type:<10} {is_unique:<8} {is_primary:<8}")
-                    
-            elif self.db_type == "sqlserver":
-                self.cursor.execute(f"""
-                    SELECT
-                        ind.name AS IndexName,
-                        STRING_AGG(COL_NAME(ic.object_id, ic.column_id), ', ') AS ColumnNames,
-                        ind.is_unique,
-                        ind.is_primary_key,
-                        ind.type_desc
-                    FROM
-                        sys.indexes ind
-                    JOIN
-                        sys.index_columns ic ON ind.object_id = ic.object_id AND ind.index_id = ic.index_id
-                    JOIN
-                        sys.tables t ON ind.object_id = t.object_id                    
-                    JOIN
-                        sys.schemas s ON t.schema_id = s.schema_id
-                    WHERE
-                        s.name = '{schema}' AND t.name = '{table_name}' AND t.is_ms_shipped = 0
-                    GROUP BY
-                        ind.name, ind.is_unique, ind.is_primary_key, ind.type_desc
-                    ORDER BY
-                        ind.name;
-                """)
-                indexes = self.cursor.fetchall()
-                if not indexes:
-                    print("ℹ️  No indexes found for this table.")
-                    return
+        try:
+            indexes = self.get_table_indexes(schema, table_name)
+            if not indexes:
+                print("ℹ️  No indexes found for this table.")
+                return
 
-                print(f"{'Index Name':<25} {'Columns':<30} {'Unique':<8} {'Primary':<8} {'Type':<12}")
-                print("-" * 90)
-                for row in indexes:
-                    index_name = row[0]
-                    columns = row[1]
-                    is_unique = "Yes" if row[2] else "No"
-                    is_primary = "Yes" if row[3] else "No"
-                    index_type = row[4]
-                    print(f"{index_name:<25} {columns:<30} {is_unique:<8} {is_primary:<8} {index_type:<12}")
+            print(f"{'Index Name':<25} {'Columns':<30} {'Unique':<8} {'Primary':<8} {'Type':<12} {'Size':>10}")
+            print("-" * 101)
+            for index in indexes:
+                columns = ", ".join(index['columns'])
+                if index['include_columns']:
+                    columns += f" INCLUDE ({', '.join(index['include_columns'])})"
+                is_unique = "Yes" if index['unique'] else "No"
+                is_primary = "Yes" if index['primary'] else "No"
+                size = self._format_bytes(index['size_bytes']) or "N/A"
+                print(f"{index['name']:<25} {columns:<30} {is_unique:<8} {is_primary:<8} {index['type']:<12} {size:>10}")
 
         except Exception as e:
             print(f"✗ Error listing indexes for {schema}.{table_name}: {e}")
+
     
-    def get_table_details_and_quality(self, schema: str, table_name: str):
-        """Retrieves detailed information about a table with enhanced analysis."""
+    def get_table_details_and_quality(self, schema: str, table_name: str, sample_percent: Optional[float] = None,
+                                      quality_mode: Optional[str] = None):
+        """Retrieves detailed information about a table with enhanced analysis.
+
+        ``sample_percent`` profiles data quality on a TABLESAMPLE of the
+        table and ``quality_mode`` picks a profile mode ('stats' reads only
+        optimizer statistics); without either, tables over 1M rows offer
+        the choice interactively.
+        """
         print(f"\n{'='*20} TABLE ANALYSIS: {schema}.{table_name} {'='*20}")
         
         try:
-            # 1. Basic table stats
-            self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table_name}")
-            row_count = self.cursor.fetchone()[0]
-            print(f"📊 Total Rows: {row_count:,}")
+            # 1. Basic table stats; exact up to the data quality limit, estimated beyond it
+            count = self.get_row_count(schema, table_name, exact_threshold=1000000)
+            row_count = count['rows'] or 0
+            print(f"📊 Total Rows: {self._format_row_count(count)}{' (estimated)' if count['estimated'] else ''}")
 
             # 2. Column information
             columns_info = self._get_column_info(schema, table_name)
@@ -1036,145 +1281,739 @@ class DatabaseAnalyzer:
                 default_val = str(col_info.get('default', 'None'))[:14]
                 print(f"{col_info['name']:<25} {col_info['type']:<20} {col_info['nullable']:<10} {default_val:<15}")
 
-            # 4. Data quality analysis
-            if row_count > 0 and row_count <= 1000000:  # Only for reasonable-sized tables
+            # 4. Data quality analysis; approximate distinct counts beyond 1M rows
+            if row_count > 0:
+                mode = quality_mode or ("exact" if row_count <= 1000000 and not count['estimated'] else "approximate")
+                if sample_percent is None and quality_mode is None and row_count > 1000000:
+                    suggested = suggested_sample_percent(row_count)
+                    print("⚠️  Large table. Data quality from:")
+                    print("1. Optimizer statistics (no table scan)")
+                    print(f"2. A {suggested:g}% sample (~100,000 rows)")
+                    print("3. A full scan")
+                    answer = input("Choose option (1-3, default 1): ").strip()
+                    if answer == "2":
+                        sample_percent = suggested
+                    elif answer != "3":
+                        mode = "stats"
+                sample = sample_spec(sample_percent) if sample_percent else None
                 print(f"\n{'Data Quality Analysis':<60}")
                 print("-" * 80)
-                self._analyze_data_quality(table_name, columns_info, row_count)
+                self._analyze_data_quality(schema, table_name, columns_info, row_count, mode, sample)
             else:
-                print(f"\n⚠️  Skipping data quality analysis (table too large: {row_count:,} rows)")
+                print(f"\n⚠️  Skipping data quality analysis (table is empty)")
 
         except Exception as e:
             print(f"✗ Error analyzing table '{table_name}': {e}")
     
 
+    def _get_row_count(self, schema: str, table_name: str) -> int:
+        """Exact row count via COUNT(*)."""
+        self.cursor.execute(f"SELECT COUNT(*) FROM {self.dialect.qualify(schema, table_name)}")
+        return self.cursor.fetchone()[0]
+
+    def _rollback_quietly(self):
+        """Clear an aborted transaction (PostgreSQL) after a failed statement.
+
+        The rollback also undoes a SET made in that transaction, so inside
+        statement_timeout() the time left is applied again.
+        """
+        try:
+            self.conn.rollback()
+        except Exception:
+            return
+        deadline = self.deadline()
+        if deadline is not None:
+            try:
+                self.dialect.set_statement_timeout(self._current_pooled(), self.cursor,
+                                                   max(deadline - time.monotonic(), 0.001))
+            except Exception:
+                try:
+                    self.conn.rollback()
+                except Exception:
+                    pass
+
+    def get_row_estimates(self) -> Dict[Tuple[str, str], Optional[int]]:
+        """Optimizer-statistics row counts for every table, from one catalog query."""
+        def load():
+            try:
+                rows = self._query('row_estimates')
+            except Exception:
+                if not self.dialect.has('row_estimates_fallback'):
+                    raise
+                self._rollback_quietly()
+                rows = self._query('row_estimates_fallback')
+            return {
+                (schema, table): None if estimate is None else int(estimate)
+                for schema, table, estimate in rows
+            }
+
+        return self.cached('row_estimates', load, max_age=self.metadata_ttl)
+
+    def get_row_counts(self, tables: Optional[List[Tuple[str, str]]] = None, mode: str = "auto",
+                       exact_threshold: Optional[int] = None) -> Dict[Tuple[str, str], Dict]:
+        """Row counts as {(schema, table): {'rows': n, 'estimated': bool}}.
+
+        'estimate' only reads optimizer statistics, 'exact' runs COUNT(*) on
+        every table, and 'auto' counts exactly only where the estimate is
+        missing or below exact_threshold (default self.exact_count_threshold).
+        """
+        if mode not in ROW_COUNT_MODES:
+            raise ValueError(f"mode must be one of {', '.join(ROW_COUNT_MODES)}")
+        if tables is None:
+            tables = self.get_tables()
+        threshold = self.exact_count_threshold if exact_threshold is None else exact_threshold
+
+        estimates = {}
+        if mode != "exact":
+            try:
+                estimates = self.get_row_estimates()
+            except Exception:
+                # No statistics access: estimate mode reports unknown, auto counts everything
+                self._rollback_quietly()
+
+        counts = {}
+        exact = []
+        for schema, table in tables:
+            estimate = estimates.get((schema, table))
+            if mode == "estimate" or (mode == "auto" and estimate is not None and estimate >= threshold):
+                counts[(schema, table)] = {'rows': estimate, 'estimated': True}
+            else:
+                exact.append((schema, table))
+
+        if len(exact) == 1:
+            schema, table = exact[0]
+            try:
+                counts[exact[0]] = {'rows': self._get_row_count(schema, table), 'estimated': False}
+            except Exception:
+                self._rollback_quietly()
+                counts[exact[0]] = {'rows': estimates.get(exact[0]), 'estimated': True}
+        elif exact:
+            # COUNT(*) cost follows table size; biggest tables start first
+            results = self.crawl(exact, lambda key: self._get_row_count(*key))
+            for key in exact:
+                result = results[key]
+                counts[key] = ({'rows': result.value, 'estimated': False} if result.ok
+                               else {'rows': estimates.get(key), 'estimated': True})
+        return {key: counts[key] for key in tables}
+
+    def crawl(self, tables: List[Tuple[str, str]], work, progress=None, timeout: Optional[float] = None) -> Dict:
+        """Run work((schema, table)) for each table in parallel on pooled connections.
+
+        Returns {(schema, table): CrawlResult}; see TableCrawler. Tables are
+        started largest first, by on-disk size or else estimated rows. Each
+        statement is bounded by ``timeout`` seconds (default crawl_timeout).
+        """
+        costs = {}
+        try:
+            costs = {key: sizes.get('total') for key, sizes in self.get_table_sizes().items()}
+        except Exception:
+            self._rollback_quietly()
+        if not any(costs.get(key) for key in tables):
+            try:
+                costs = self.get_row_estimates()
+            except Exception:
+                self._rollback_quietly()
+        crawler = TableCrawler(self, self.crawl_concurrency, self.crawl_timeout if timeout is None else timeout)
+        return crawler.run([(key, costs.get(key)) for key in tables], work, progress)
+
+    def get_row_count(self, schema: str, table_name: str, mode: str = "auto",
+                      exact_threshold: Optional[int] = None) -> Dict:
+        """Row count for one table as {'rows': n, 'estimated': bool}; see get_row_counts()."""
+        return self.get_row_counts([(schema, table_name)], mode, exact_threshold)[(schema, table_name)]
+
+    @staticmethod
+    def _format_row_count(count: Dict) -> str:
+        """'1,234' for exact counts, '~1,234' for estimates, 'N/A' when unknown."""
+        if count.get('rows') is None:
+            return "N/A"
+        return f"{'~' if count.get('estimated') else ''}{count['rows']:,}"
+
+
     def _get_column_info(self, schema: str, table_name: str) -> List[Dict]:
         """Get detailed column information for a given schema and table."""
+        columns_info = self.get_catalog().columns(schema, table_name)
+        if columns_info is not None:
+            return columns_info
+
+        # Objects outside the snapshot (e.g. system views) are looked up directly
         columns_info = []
+        for col in self._query('columns', (schema, table_name)):
+            columns_info.append({
+                'name': col[0],
+                'type': col[1],
+                'nullable': col[2],
+                'default': col[3]
+            })
+        return columns_info
 
-        if self.db_type == "mysql":
-            self.cursor.execute(f"""
-                SELECT COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-                ORDER BY ORDINAL_POSITION
-            """, (schema, table_name))
-            columns_data = self.cursor.fetchall()
-            for col in columns_data:
-                columns_info.append({
-                    'name': col[0],
-                    'type': col[1],
-                    'nullable': col[2],
-                    'default': col[3]
-                })
+    def get_table_sizes(self) -> Dict[Tuple[str, str], Dict[str, Optional[int]]]:
+        """Storage bytes for every table from one catalog query.
 
-        elif self.db_type == "postgresql":
-            self.cursor.execute(f"""
-                SELECT column_name, data_type, is_nullable, column_default
-                FROM information_schema.columns
-                WHERE table_schema = %s AND table_name = %s
-                ORDER BY ordinal_position
-            """, (schema, table_name))
-            columns_data = self.cursor.fetchall()
-            for col in columns_data:
-                columns_info.append({
-                    'name': col[0],
-                    'type': col[1],
-                    'nullable': col[2],
-                    'default': col[3]
-                })
-
-        elif self.db_type == "sqlserver":
-            self.cursor.execute(f"""
-                SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?
-                ORDER BY ORDINAL_POSITION
-            """, (schema, table_name))
-            columns_data = self.cursor.fetchall()
-            for col in columns_data:
-                columns_info.append({
-                    'name': col[0],
-                    'type': col[1],
-                    'nullable': col[2],
-                    'default': col[3]
-                })
+        Each value has 'data', 'index', 'toast' (TOAST/LOB; None where the
+        engine folds it into data) and 'total' byte counts.
+        """
+        def load():
+            return {
+                (schema, table): {
+                    'data': None if data is None else int(data),
+                    'index': None if index is None else int(index),
+                    'toast': None if toast is None else int(toast),
+                    'total': None if total is None else int(total),
+                }
+                for schema, table, data, index, toast, total in self._query('table_sizes')
+            }
+
+        return self.cached('table_sizes', load, max_age=self.metadata_ttl)
+
+    def get_table_size_bytes(self, schema: str, table_name: str) -> Optional[Dict[str, Optional[int]]]:
+        """Byte breakdown for one table, or None if it has no size entry (e.g. a view)."""
+        try:
+            return self.get_table_sizes().get((schema, table_name))
+        except Exception:
+            self._rollback_quietly()
+            return None
 
-        return columns_info
+    @staticmethod
+    def _format_bytes(num_bytes: Optional[int]) -> Optional[str]:
+        """Human-readable size ('1.5 GB'); None stays None."""
+        if num_bytes is None:
+            return None
+        size = float(num_bytes)
+        for unit in ("bytes", "KB", "MB", "GB", "TB"):
+            if size < 1024 or unit == "TB":
+                return f"{int(size)} bytes" if unit == "bytes" else f"{size:.1f} {unit}"
+            size /= 1024
 
-    
     def _get_table_size(self, schema: str, table_name: str) -> Optional[str]:
         """Get table size estimation."""
+        sizes = self.get_table_size_bytes(schema, table_name)
+        return self._format_bytes(sizes['total']) if sizes else None
+
+    
+    def _native_approx_distinct(self) -> bool:
+        """Whether the server has its own approximate COUNT(DISTINCT) (hll extension, SQL Server 2019+)."""
+        if not self.dialect.approx_distinct or not self.dialect.has('approx_distinct_available'):
+            return False
+
+        def load():
+            try:
+                return self._query_one('approx_distinct_available') is not None
+            except Exception:
+                self._rollback_quietly()
+                return False
+
+        return self.cached('approx_distinct_native', load)
+
+    def _resolve_profile_mode(self, schema: str, table_name: str, mode: str,
+                              exact_threshold: Optional[int], sample: Optional[Dict] = None) -> str:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(PROFILE_MODES)}")
+        if mode != "auto":
+            return mode
+        threshold = self.exact_profile_threshold if exact_threshold is None else exact_threshold
         try:
-            if self.db_type == "postgresql":
-                self.cursor.execute(f"SELECT pg_size_pretty(pg_total_relation_size('{schema}.{table_name}'))")
-                return self.cursor.fetchone()[0]
-            elif self.db_type == "mysql":
-                self.cursor.execute(f"""
-                    SELECT ROUND(((data_length + index_length) / 1024 / 1024), 2) AS 'Size in MB'
-                    FROM information_schema.TABLES 
-                    WHERE table_schema = DATABASE() AND table_name = '{schema}.{table_name}'
-                """)
-                result = self.cursor.fetchone()[0]
-                return f"{result} MB" if result else None
-        except:
+            estimate = self.get_row_estimates().get((schema, table_name))
+        except Exception:
+            self._rollback_quietly()
+            estimate = None
+        if estimate is not None and sample:
+            estimate = estimate * sample['percent'] / 100
+        # Unknown sizes get the bounded-memory mode
+        return "exact" if estimate is not None and estimate <= threshold else "approximate"
+
+    def profile_table(self, schema: str, table_name: str, columns_info: Optional[List[Dict]] = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE, mode: str = "auto",
+                      exact_threshold: Optional[int] = None, sample: Optional[Dict] = None) -> Dict:
+        """Null, empty-string and distinct counts for every column in one scan.
+
+        ``mode`` is 'exact' (COUNT(DISTINCT)), 'approximate' (HyperLogLog,
+        bounded memory) or 'auto' (exact up to exact_threshold estimated
+        rows, default self.exact_profile_threshold). Returns {'schema',
+        'table', 'mode', 'row_count', 'columns', 'queries'}; each column dict
+        carries its counts, percentages, 'distinct_error', 'status' ('ok' or
+        'warning') and 'notes', or 'error' if it could not be profiled.
+
+        ``sample`` (from sampling.sample_spec) profiles only a sample of the
+        rows: counts then describe the sample and the result gains a
+        'sample' block. Columns gain 'null_rate_ci' and 'empty_rate_ci' only
+        for row-level samples (see sampling.row_level()).
+
+        'stats' reads no table data: see _profile_from_statistics().
+        """
+        mode = self._resolve_profile_mode(schema, table_name, mode, exact_threshold, sample)
+        if columns_info is None:
+            columns_info = self._get_column_info(schema, table_name)
+        if mode == "stats":
+            result = self._profile_from_statistics(schema, table_name, columns_info, batch_size, exact_threshold, sample)
+            return {'schema': schema, 'table': table_name, **result}
+        if sample:
+            sample = self.sample_source(schema, table_name, sample)
+        native = mode == "approximate" and self._native_approx_distinct()
+        result = TableProfiler(self, batch_size, native).profile(schema, table_name, columns_info, mode, sample)
+        return {'schema': schema, 'table': table_name, **result}
+
+    def get_optimizer_column_stats(self, schema: str, table_name: str,
+                                   row_count: Optional[int] = None) -> Dict[str, Dict]:
+        """The optimizer's own per-column statistics: {column: {'null_frac', 'empty_frac', 'distinct'}}.
+
+        PostgreSQL pg_stats, SQL Server statistics histograms and MySQL 8
+        COLUMN_STATISTICS. Columns never analyzed (or engines without such
+        a catalog) are simply missing.
+        """
+        if not self.dialect.has('optimizer_column_stats'):
+            return {}
+        if row_count is None:
+            row_count = self.get_row_estimates().get((schema, table_name))
+        try:
+            rows = self._query('optimizer_column_stats', (schema, table_name))
+        except Exception:
+            self._rollback_quietly()
+            return {}
+        return self.dialect.read_column_stats(rows, row_count or 0)
+
+    def _profile_from_statistics(self, schema: str, table_name: str, columns_info: List[Dict], batch_size: int,
+                                 exact_threshold: Optional[int], sample: Optional[Dict]) -> Dict:
+        # Null rates, cardinality and constant-column warnings from catalog statistics;
+        # only columns without statistics are scanned (in the mode 'auto' would pick)
+        try:
+            row_count = self.get_row_estimates().get((schema, table_name))
+        except Exception:
+            self._rollback_quietly()
+            row_count = None
+        stats = self.get_optimizer_column_stats(schema, table_name, row_count) if row_count else {}
+        profiles = {}
+        for column in columns_info:
+            if column['name'] in stats:
+                profiles[column['name']] = assess_column(
+                    stats_column_profile(column, stats[column['name']], row_count), row_count)
+
+        queries = 1 if self.dialect.has('optimizer_column_stats') else 0
+        missing = [column for column in columns_info if column['name'] not in profiles]
+        scanned = {}
+        if missing:
+            scan_mode = self._resolve_profile_mode(schema, table_name, "auto", exact_threshold, sample)
+            scanned = self.profile_table(schema, table_name, missing, batch_size, scan_mode, sample=sample)
+            queries += scanned['queries']
+            for profile in scanned['columns']:
+                profiles[profile['name']] = {**profile, 'source': 'scan'}
+            if row_count is None:
+                row_count = scanned['sample']['estimated_total_rows'] if scanned.get('sample') else scanned['row_count']
+
+        result = {
+            'row_count': row_count,
+            'columns': [profiles[column['name']] for column in columns_info],
+            'queries': queries,
+            'mode': "stats",
+            'scanned_columns': [column['name'] for column in missing],
+        }
+        if scanned.get('sample'):
+            result['sample'] = scanned['sample']
+        return result
+
+    def get_change_fingerprints(self) -> Dict[Tuple[str, str], Optional[str]]:
+        """Per-table modification fingerprint from the engine's activity counters, in one query.
+
+        PostgreSQL: pg_stat_user_tables insert/update/delete counts; SQL
+        Server: dm_db_partition_stats row_count, modify_date and the last
+        write in the index usage stats; MySQL: UPDATE_TIME. A fingerprint
+        that has not moved means the table's data has not changed. None
+        (or a missing table) means unknown. Never cached.
+        """
+        if self.dialect.has('table_change_counters_setup'):
+            try:
+                self.cursor.execute(self.dialect.sql('table_change_counters_setup'))
+            except Exception:
+                self._rollback_quietly()
+        try:
+            rows = self._query('table_change_counters')
+        except Exception:
+            if not self.dialect.has('table_change_counters_fallback'):
+                raise
+            self._rollback_quietly()
+            rows = self._query('table_change_counters_fallback')
+        return {(schema, table): None if change is None else str(change) for schema, table, change in rows}
+
+    def _change_fingerprint(self, schema: str, table_name: str,
+                            changes: Optional[Dict[Tuple[str, str], Optional[str]]]) -> Optional[str]:
+        if changes is None:
+            try:
+                changes = self.get_change_fingerprints()
+            except Exception:
+                self._rollback_quietly()
+                return None
+        return changes.get((schema, table_name))
+
+    @staticmethod
+    def _profile_key(schema: str, table_name: str) -> str:
+        return f"profile:{node_id((schema, table_name))}"
+
+    def stored_profile(self, schema: str, table_name: str) -> Optional[Dict]:
+        """Last stored profile record for a table: {'change', 'signature', 'profiled_at', 'profile'}."""
+        with self._profiles_lock:
+            record = self._profiles.get((schema, table_name))
+        if record is None and self._store is not None and self.fingerprint:
+            loaded = self._store.load(self.fingerprint, self._profile_key(schema, table_name))
+            if loaded is not None:
+                record = loaded[0]
+                with self._profiles_lock:
+                    self._profiles.setdefault((schema, table_name), record)
+        return record
+
+    def _save_profile(self, schema: str, table_name: str, record: Dict):
+        with self._profiles_lock:
+            self._profiles[(schema, table_name)] = record
+        if self._store is not None and self.fingerprint:
+            self._store.save(self.fingerprint, self._profile_key(schema, table_name), record, record['change'])
+
+    @staticmethod
+    def _column_signature(columns_info: List[Dict]) -> List[List[str]]:
+        return [[col['name'], col['type']] for col in columns_info]
+
+    def _reuse_profile(self, schema: str, table_name: str, columns_info: List[Dict], mode: str,
+                       sample: Optional[Dict], change: Optional[str]) -> Optional[Dict]:
+        # Stored profile if it saw the same data and columns and is at least as thorough as asked for
+        if change is None:
             return None
-    
-    def _analyze_data_quality(self, table_name: str, columns_info: List[Dict], row_count: int):
+        record = self.stored_profile(schema, table_name)
+        if record is None or record['change'] != change:
+            return None
+        if record['signature'] != self._column_signature(columns_info):
+            return None
+        profile = record['profile']
+        # Statistics-only profiles cost nothing to rebuild and go stale with ANALYZE, not with writes
+        if profile['mode'] == "stats" or (profile['mode'] != mode and profile['mode'] != "exact"):
+            return None
+        if profile.get('sample') and not sample:
+            return None
+        return {**profile, 'cached': True, 'profiled_at': record['profiled_at'], 'change_fingerprint': change}
+
+    def get_table_profile(self, schema: str, table_name: str, columns_info: Optional[List[Dict]] = None,
+                          batch_size: int = DEFAULT_BATCH_SIZE, mode: str = "auto",
+                          exact_threshold: Optional[int] = None, sample: Optional[Dict] = None,
+                          refresh: bool = False,
+                          changes: Optional[Dict[Tuple[str, str], Optional[str]]] = None) -> Dict:
+        """profile_table(), served from the stored profile while the table is unchanged.
+
+        The table's change fingerprint (from ``changes``, a
+        get_change_fingerprints() result, or looked up here) is compared with
+        the one stored alongside its last profile. Only a table whose
+        fingerprint moved, whose columns changed or whose stored profile is
+        less thorough than requested (approximate for exact, sampled for
+        full) is scanned again; ``refresh`` always scans. The result adds
+        'cached', 'profiled_at' and 'change_fingerprint'.
+        """
+        mode = self._resolve_profile_mode(schema, table_name, mode, exact_threshold, sample)
+        if columns_info is None:
+            columns_info = self._get_column_info(schema, table_name)
+        change = self._change_fingerprint(schema, table_name, changes)
+        if not refresh:
+            stored = self._reuse_profile(schema, table_name, columns_info, mode, sample, change)
+            if stored is not None:
+                return stored
+
+        profile = self.profile_table(schema, table_name, columns_info, batch_size, mode, sample=sample)
+        if profile['mode'] == "stats":
+            # Never displaces a stored scan profile
+            return {**profile, 'cached': False, 'profiled_at': time.time(), 'change_fingerprint': change}
+        record = {
+            'change': change,
+            'signature': self._column_signature(columns_info),
+            'profiled_at': time.time(),
+            'profile': profile,
+        }
+        self._save_profile(schema, table_name, record)
+        return {**profile, 'cached': False, 'profiled_at': record['profiled_at'], 'change_fingerprint': change}
+
+    def table_quality(self, schema: str, table_name: str, mode: str = "auto", sample: Optional[Dict] = None,
+                      refresh: bool = False, timeout: Optional[float] = None,
+                      changes: Optional[Dict[Tuple[str, str], Optional[str]]] = None) -> Dict:
+        """Data quality of one table as JSON; see profiler.quality_report().
+
+        Served from the stored profile while the table is unchanged,
+        otherwise profiled with the single-query profiler (get_table_profile()).
+        ``timeout`` bounds every statement it runs, server-side.
+        """
+        with self.statement_timeout(timeout):
+            profile = self.get_table_profile(schema, table_name, mode=mode, sample=sample, refresh=refresh,
+                                             changes=changes)
+        return quality_report(profile)
+
+    def quality_reports(self, tables: Optional[List[Tuple[str, str]]] = None, mode: str = "auto",
+                        sample_percent: Optional[float] = None, sample_method: str = "system",
+                        refresh: bool = False, timeout: Optional[float] = None,
+                        total_timeout: Optional[float] = None) -> List[Dict]:
+        """table_quality() for many tables (default all), in table order.
+
+        Change fingerprints are read once: unchanged tables come straight
+        from their stored profiles and the rest are profiled in parallel
+        through crawl(), each table bounded by ``timeout`` (default
+        crawl_timeout; see statement_timeout()). ``total_timeout`` bounds
+        the whole call: running tables get only the time left, and tables
+        not started by then are skipped. With ``sample_percent`` every
+        scanned table is sampled. A table that fails, times out or is
+        skipped reports status 'error', its 'error' and whether it
+        'timed_out', without failing the others.
+        """
+        deadline = time.monotonic() + total_timeout if total_timeout else None
+        if tables is None:
+            tables = self.get_tables()
+        samples = {key: sample_spec(sample_percent, sample_method) for key in tables} if sample_percent else {}
+        try:
+            changes = self.get_change_fingerprints()
+        except Exception:
+            self._rollback_quietly()
+            changes = {}
+
+        reports = {}
+        if not refresh:
+            for key in tables:
+                resolved = self._resolve_profile_mode(*key, mode, None, samples.get(key))
+                stored = self._reuse_profile(*key, self._get_column_info(*key), resolved, samples.get(key),
+                                             changes.get(key))
+                if stored is not None:
+                    reports[key] = quality_report(stored)
+        stale = [key for key in tables if key not in reports]
+
+        def work(key):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise StatementTimeoutError("Time limit for the whole request exceeded before this table started")
+            return self.table_quality(*key, mode=mode, sample=samples.get(key), refresh=refresh,
+                                      timeout=remaining, changes=changes)
+
+        results = self.crawl(stale, work, timeout=timeout)
+        for key, result in results.items():
+            reports[key] = result.value if result.ok else {
+                'schema': key[0],
+                'table': key[1],
+                'status': 'error',
+                'error': str(result.error),
+                'timed_out': self.dialect.is_statement_timeout(result.error),
+            }
+        return [reports[key] for key in tables]
+
+    def column_statistics(self, schema: str, table_name: str, columns_info: Optional[List[Dict]] = None,
+                          bins: int = 20, sample: Optional[Dict] = None) -> Dict:
+        """Value distributions for every column from one streamed scan.
+
+        Numeric columns get min/max/mean/stddev, quantiles and a histogram of
+        ``bins`` bins; string columns get length statistics and counts per
+        length. Rows arrive through a server-side cursor in batches folded
+        into fixed-size NumPy accumulators, so memory does not grow with the
+        table. ``sample`` works as in profile_table(). Requires numpy.
+        """
+        from column_stats import StreamingProfiler
+
+        if columns_info is None:
+            columns_info = self._get_column_info(schema, table_name)
+        if sample:
+            sample = self.sample_source(schema, table_name, sample)
+        result = StreamingProfiler(self, bins).profile(schema, table_name, columns_info, sample)
+        if sample:
+            result['sample'] = sample_summary(sample, result['row_count'])
+        return {'schema': schema, 'table': table_name, **result}
+
+    def column_frequencies(self, schema: str, table_name: str, columns: Optional[List[str]] = None,
+                           top_k: int = 10, sample: Optional[Dict] = None, partitions: int = 1) -> Dict:
+        """Most frequent values per column, with error bounds, from streamed scans.
+
+        Each batch from the server-side cursor is folded into a Misra-Gries
+        summary and a Count-Min sketch per column, so memory is fixed
+        however many rows and distinct values there are. Every top value
+        reports its 'count' with a guaranteed 'lower_bound' and an
+        'upper_bound'. With ``partitions`` > 1 a table with an integer
+        primary key is split into key ranges scanned in parallel, whose
+        sketches are merged. ``columns`` limits the columns profiled.
+        """
+        from frequency import FrequencyProfiler
+
+        columns_info = self._get_column_info(schema, table_name)
+        if columns is not None:
+            unknown = set(columns) - {col['name'] for col in columns_info}
+            if unknown:
+                raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+            columns_info = [col for col in columns_info if col['name'] in columns]
+        if sample:
+            sample = self.sample_source(schema, table_name, sample)
+            sources = [sample['source']]
+        else:
+            sources = self._key_partitions(schema, table_name, partitions)
+        result = FrequencyProfiler(self, top_k).profile(sources, columns_info)
+        if sample:
+            result['sample'] = sample_summary(sample, result['row_count'])
+        return {'schema': schema, 'table': table_name, 'top_k': top_k, **result}
+
+    def show_column_frequencies(self, schema: str, table_name: str, top_k: int = 10):
+        """Print column_frequencies() for one table, sampling tables over 1M rows."""
+        print(f"\n{'='*20} MOST FREQUENT VALUES: {schema}.{table_name} {'='*20}")
+        try:
+            count = self.get_row_count(schema, table_name, mode="estimate")
+            sample = None
+            partitions = 1
+            if (count['rows'] or 0) > 1000000:
+                suggested = suggested_sample_percent(count['rows'])
+                answer = input(f"⚠️  Large table. Stream a {suggested:g}% sample (~100,000 rows) "
+                               f"instead of the whole table? (Y/n): ").strip().lower()
+                if answer != 'n':
+                    sample = sample_spec(suggested)
+                else:
+                    partitions = self.crawl_concurrency
+            frequencies = self.column_frequencies(schema, table_name, top_k=top_k, sample=sample,
+                                                  partitions=partitions)
+        except Exception as e:
+            print(f"✗ Error computing value frequencies: {e}")
+            return
+
+        scope = f" ({frequencies['sample']['percent']:g}% sample)" if frequencies.get('sample') else ""
+        print(f"📊 Rows scanned: {frequencies['row_count']:,}{scope} in {frequencies['batches']} batches "
+              f"({frequencies['partitions']} partitions)")
+        for col in frequencies['columns']:
+            error = f", counts ±{col['count_error']:,}" if col['count_error'] else ""
+            print(f"\n{col['name']} ({col['type']}): {col['null_count']:,} NULLs{error}")
+            if not col['top_values']:
+                print("   No value is more frequent than the error bound (mostly unique)")
+            for entry in col['top_values']:
+                marker = "" if entry['guaranteed'] else " ?"
+                if entry['lower_bound'] == entry['upper_bound']:
+                    counted = f"{entry['upper_bound']:,}"
+                else:
+                    counted = f"{entry['lower_bound']:,}-{entry['upper_bound']:,}"
+                print(f"   {str(entry['value'])[:40]:<40} {counted:>25} (≤{entry['max_fraction'] * 100:5.1f}%){marker}")
+
+    def show_column_statistics(self, schema: str, table_name: str):
+        """Print column_statistics() for one table, sampling tables over 1M rows."""
+        print(f"\n{'='*20} COLUMN STATISTICS: {schema}.{table_name} {'='*20}")
+        try:
+            count = self.get_row_count(schema, table_name, mode="estimate")
+            sample = None
+            if (count['rows'] or 0) > 1000000:
+                suggested = suggested_sample_percent(count['rows'])
+                answer = input(f"⚠️  Large table. Stream a {suggested:g}% sample (~100,000 rows) "
+                               f"instead of the whole table? (Y/n): ").strip().lower()
+                if answer != 'n':
+                    sample = sample_spec(suggested)
+            stats = self.column_statistics(schema, table_name, sample=sample)
+        except ImportError:
+            print("💡 Column statistics require 'numpy': pip install numpy")
+            return
+        except Exception as e:
+            print(f"✗ Error computing column statistics: {e}")
+            return
+
+        scope = f" ({stats['sample']['percent']:g}% sample)" if stats.get('sample') else ""
+        print(f"📊 Rows scanned: {stats['row_count']:,}{scope} in {stats['batches']} batches")
+        for col in stats['columns']:
+            print(f"\n{col['name']} ({col['type']}): {col['null_count']:,} NULLs")
+            if col['kind'] == 'numeric' and col['min'] is not None:
+                quantiles = col['quantiles']
+                print(f"   min {col['min']:g}  p25 {quantiles['p25']:g}  median {quantiles['p50']:g}  "
+                      f"p75 {quantiles['p75']:g}  max {col['max']:g}")
+                print(f"   mean {col['mean']:g}  stddev {col['stddev']:g}")
+                histogram = col['histogram']
+                peak = max(histogram['counts']) or 1
+                for low, bin_count in zip(histogram['edges'], histogram['counts']):
+                    print(f"   {low:>14g} | {'█' * round(30 * bin_count / peak):<30} {bin_count:,}")
+            elif col['kind'] == 'string' and col['length']['min'] is not None:
+                length = col['length']
+                print(f"   length min {length['min']:g}  max {length['max']:g}  "
+                      f"mean {length['mean']:.1f}  stddev {length['stddev']:.1f}")
+                common = sorted(col['length_counts'], key=lambda pair: -pair[1])[:5]
+                print("   most common lengths: " + ", ".join(f"{length} ({n:,})" for length, n in common))
+
+    def sample_source(self, schema: str, table_name: str, sample: Dict) -> Dict:
+        """The sampling spec plus 'source', a FROM item reading only the sampled rows.
+
+        'method' is updated to what the engine actually does: SQL Server
+        only samples pages, and MySQL falls back to a seeded per-row filter
+        when the table has no single-column integer primary key.
+        """
+        key_range = None
+        if self.dialect.sample_by_key_range and sample['method'] == 'system':
+            key_range = self._sample_key_range(schema, table_name, sample)
+        source, method = self.dialect.sample_source(self.dialect.qualify(schema, table_name), sample, key_range)
+        return {**sample, 'method': method, 'source': source}
+
+    def _primary_key(self, schema: str, table_name: str) -> Optional[List[str]]:
+        # Primary key column names in key order, or None without one (or without index metadata)
+        try:
+            primary = next((index for index in self.get_table_indexes(schema, table_name) if index['primary']), None)
+        except Exception:
+            self._rollback_quietly()
+            return None
+        return primary['columns'] if primary is not None else None
+
+    def _integer_key_span(self, schema: str, table_name: str) -> Optional[Tuple[str, int, int]]:
+        # (quoted column, MIN, MAX) of a single-column integer primary key
+        primary = self._primary_key(schema, table_name)
+        if primary is None or len(primary) != 1:
+            return None
+        key = primary[0]
+        key_type = next((col['type'] for col in self._get_column_info(schema, table_name) if col['name'] == key), '')
+        if 'int' not in (key_type or '').lower():
+            return None
+
+        column = self.dialect.quote_ident(key)
+        self.cursor.execute(f"SELECT MIN({column}), MAX({column}) FROM {self.dialect.qualify(schema, table_name)}")
+        low, high = self.cursor.fetchone()
+        if low is None:
+            return None
+        return column, int(low), int(high)
+
+    def _sample_key_range(self, schema: str, table_name: str, sample: Dict) -> Optional[Tuple[str, int, int]]:
+        # A seeded random block of the primary key covering percent of its span
+        key_span = self._integer_key_span(schema, table_name)
+        if key_span is None:
+            return None
+        column, low, high = key_span
+        span = high - low + 1
+        width = max(1, int(span * sample['percent'] / 100))
+        start = low + random.Random(sample['seed']).randint(0, span - width)
+        return column, start, start + width - 1
+
+    def _key_partitions(self, schema: str, table_name: str, partitions: int) -> List[str]:
+        """FROM items splitting the table into equal primary-key ranges, or the whole table.
+
+        Needs a single-column integer primary key; otherwise the table is
+        one partition.
+        """
+        table_sql = self.dialect.qualify(schema, table_name)
+        key_span = self._integer_key_span(schema, table_name) if partitions > 1 else None
+        if key_span is None:
+            return [table_sql]
+        column, low, high = key_span
+        partitions = min(partitions, high - low + 1)
+        bounds = [low + (high - low + 1) * part // partitions for part in range(partitions + 1)]
+        return [f"(SELECT * FROM {table_sql} WHERE {column} >= {start} AND {column} < {end}) dba_part"
+                for start, end in zip(bounds, bounds[1:])]
+
+    def _analyze_data_quality(self, schema: str, table_name: str, columns_info: List[Dict], row_count: int,
+                              mode: str = "exact", sample: Optional[Dict] = None):
         """Perform basic data quality analysis."""
+        profile = self.get_table_profile(schema, table_name, columns_info, mode=mode, sample=sample)
+        if profile['cached']:
+            profiled_at = datetime.datetime.fromtimestamp(profile['profiled_at'])
+            print(f"ℹ️  Table unchanged since {profiled_at:%Y-%m-%d %H:%M}; showing the stored profile")
+        if profile['mode'] == "stats":
+            scanned = profile['scanned_columns']
+            detail = f"scanned columns without statistics: {', '.join(scanned)}" if scanned else "no table data read"
+            print(f"ℹ️  From optimizer statistics (estimates); {detail}")
+        if profile.get('sample'):
+            drawn = profile['sample']
+            print(f"ℹ️  {drawn['method'].upper()} sample of {drawn['percent']:g}%: {drawn['rows']:,} rows "
+                  f"(seed {drawn['seed']}); rates carry 95% confidence intervals")
+        if profile['mode'] == "approximate":
+            print("ℹ️  Distinct counts are HyperLogLog approximations")
         quality_issues = []
-        
-        for col_info in columns_info:
-            col_name = col_info['name']
-            is_nullable = col_info['nullable'] == 'YES'
-            
-            try:
-                # Check for NULL values
-                self.cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {col_name} IS NULL")
-                null_count = self.cursor.fetchone()[0]
-                
-                # Check for empty strings (for string columns)
-                empty_count = 0
-                if 'char' in col_info['type'].lower() or 'text' in col_info['type'].lower():
-                    self.cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {col_name} = ''")
-                    empty_count = self.cursor.fetchone()[0]
-                
-                # Get distinct count
-                self.cursor.execute(f"SELECT COUNT(DISTINCT {col_name}) FROM {table_name}")
-                distinct_count = self.cursor.fetchone()[0]
-                
-                # Calculate percentages
-                null_pct = (null_count / row_count) * 100 if row_count > 0 else 0
-                empty_pct = (empty_count / row_count) * 100 if row_count > 0 else 0
-                cardinality = (distinct_count / row_count) * 100 if row_count > 0 else 0
-                
-                # Report findings
-                status = "✓"
-                notes = []
-                
-                if not is_nullable and null_count > 0:
-                    status = "⚠️"
-                    notes.append(f"{null_count} NULLs in non-nullable column")
-                    quality_issues.append(f"Column '{col_name}': NULL constraint violation")
-                
-                if null_pct > 50:
-                    status = "⚠️"
-                    notes.append(f"High NULL rate: {null_pct:.1f}%")
-                
-                if empty_pct > 20:
-                    status = "⚠️"
-                    notes.append(f"High empty string rate: {empty_pct:.1f}%")
-                
-                if cardinality < 1 and row_count > 1:
-                    status = "⚠️"
-                    notes.append("All values identical")
-                
-                note_text = "; ".join(notes) if notes else f"Distinct: {distinct_count} ({cardinality:.1f}%)"
-                print(f"{status} {col_name:<25} {note_text}")
-                
-            except Exception as e:
-                print(f"✗ {col_name:<25} Error analyzing: {e}")
-        
+
+        for col in profile['columns']:
+            if 'error' in col:
+                print(f"✗ {col['name']:<25} Error analyzing: {col['error']}")
+                continue
+            status = "⚠️" if col['status'] == 'warning' else "✓"
+            print(f"{status} {col['name']:<25} {profile_note(col)}")
+            if col['issue']:
+                quality_issues.append(col['issue'])
+
         if quality_issues:
             print(f"\n⚠️  Data Quality Issues Found:")
             for issue in quality_issues:
@@ -1326,10 +2165,13 @@ class DatabaseAnalyzer:
     def export_schema_report(self):
         """Export a comprehensive schema report to file."""
         try:
+            from openpyxl import Workbook
+            from openpyxl.styles import Font, Alignment
+
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"schema_report_{self.db_type}_{timestamp}.xlsx"
 
-            wb = openpyxl.Workbook()
+            wb = Workbook()
             ws = wb.active
             ws.title = "Database Report"
 
@@ -1358,20 +2200,36 @@ class DatabaseAnalyzer:
             ws["A10"] = "Schema"
             ws["B10"] = "Table Name"
             ws["C10"] = "Row Count"
+            ws["D10"] = "Estimated"
+            ws["E10"] = "Data Bytes"
+            ws["F10"] = "Index Bytes"
+            ws["G10"] = "TOAST/LOB Bytes"
+            ws["H10"] = "Total Bytes"
 
-            for col in ["A", "B", "C"]:
+            for col in ["A", "B", "C", "D", "E", "F", "G", "H"]:
                 ws[f"{col}10"].font = Font(bold=True)
                 ws[f"{col}10"].alignment = Alignment(horizontal="center")
 
-            # Fill table data
+            # Fill table data; large tables use statistics instead of COUNT(*)
+            row_counts = self.get_row_counts(tables)
+            try:
+                table_sizes = self.get_table_sizes()
+            except Exception:
+                self._rollback_quietly()
+                table_sizes = {}
             row_num = 11
             for schema, table in tables:
                 try:
-                    self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table}")
-                    row_count = self.cursor.fetchone()[0]
+                    count = row_counts[(schema, table)]
                     ws[f"A{row_num}"] = schema
                     ws[f"B{row_num}"] = table
-                    ws[f"C{row_num}"] = row_count
+                    ws[f"C{row_num}"] = count['rows'] if count['rows'] is not None else "Unknown"
+                    ws[f"D{row_num}"] = "Yes" if count['estimated'] else "No"
+                    sizes = table_sizes.get((schema, table), {})
+                    ws[f"E{row_num}"] = sizes.get('data')
+                    ws[f"F{row_num}"] = sizes.get('index')
+                    ws[f"G{row_num}"] = sizes.get('toast')
+                    ws[f"H{row_num}"] = sizes.get('total')
                 except:
                     ws[f"A{row_num}"] = schema
                     ws[f"B{row_num}"] = table
@@ -1399,7 +2257,12 @@ class DatabaseAnalyzer:
             print(f"✗ Error exporting report: {e}")
     
     def detect_duplicate_rows(self, schema: str, table_name: str):
-        """Detect and analyze duplicate rows with fuzzy matching for similar content."""
+        """Detect and analyze duplicate rows with fuzzy matching for similar content.
+
+        Tables over 10,000 rows can be checked on a TABLESAMPLE; the result
+        then reports the in-sample duplicate rate with a confidence interval
+        and an estimate of duplicate pairs in the whole table.
+        """
         print(f"\n{'='*20} DUPLICATE DETECTION: {schema}.{table_name} {'='*20}")
         
         try:
@@ -1409,20 +2272,30 @@ class DatabaseAnalyzer:
                 print("❌ Could not retrieve table structure.")
                 return
             
-            # Get row count
-            self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table_name}")
-            total_rows = self.cursor.fetchone()[0]
+            # Get row count (statistics estimate for very large tables)
+            count = self.get_row_count(schema, table_name)
+            total_rows = count['rows']
             
             if total_rows == 0:
                 print("ℹ️  Table is empty.")
                 return
             
-            if total_rows > 10000:
-                proceed = input(f"⚠️  Large table ({total_rows:,} rows). This may take time. Continue? (y/N): ").strip().lower()
-                if proceed != 'y':
+            sample = None
+            if total_rows is None or total_rows > 10000:
+                suggested = suggested_sample_percent(total_rows)
+                print(f"⚠️  Large table ({self._format_row_count(count)} rows).")
+                print(f"1. Sample {suggested:g}% of the table (~100,000 rows)")
+                print("2. Scan the full table (may take time)")
+                print("3. Cancel")
+                scan_choice = input("Choose option (1-3): ").strip()
+                if scan_choice == "1":
+                    # Row-level, so the duplicate rate gets an interval and a full-table estimate
+                    sample = self.sample_source(schema, table_name, sample_spec(suggested, "bernoulli"))
+                elif scan_choice != "2":
                     return
             
-            print(f"📊 Analyzing {total_rows:,} rows across {len(columns_info)} columns...")
+            scope = f"a {sample['percent']:g}% {sample['method']} sample" if sample else f"{self._format_row_count(count)} rows"
+            print(f"📊 Analyzing {scope} across {len(columns_info)} columns...")
             
             # Show available columns for analysis
             print(f"\n📋 Available columns:")
@@ -1449,29 +2322,49 @@ class DatabaseAnalyzer:
             detection_type = input("\nChoose detection method (1-4): ").strip()
             
             duplicates_found = []
-            
-            if detection_type == "1":
-                duplicates_found = self._find_exact_duplicates(schema, table_name, columns_info)
+            summary = None
+            
+            if detection_type in ("1", "4"):
+                selected_columns = None
+                if detection_type == "4":
+                    selected_columns = self._get_user_column_selection(columns_info)
+                    if not selected_columns:
+                        return
+                    print(f"🔍 Finding duplicates based on selected columns: {', '.join(selected_columns)}")
+                else:
+                    print("🔍 Finding exact duplicates...")
+                summary = self.duplicate_groups(schema, table_name, selected_columns, sample,
+                                                limit=DUPLICATE_DISPLAY_GROUPS)
+                duplicates_found = self._duplicate_group_details(schema, table_name, summary)
                 
             elif detection_type == "2":
                 if not text_columns:
                     print("❌ No text columns found for fuzzy matching.")
                     return
-                duplicates_found = self._find_fuzzy_duplicates(schema, table_name, text_columns)
+                duplicates_found = self._find_fuzzy_duplicates(schema, table_name, text_columns, sample=sample)
                 
             elif detection_type == "3":
-                duplicates_found = self._find_combination_duplicates(schema, table_name, columns_info, text_columns)
-                
-            elif detection_type == "4":
-                selected_columns = self._get_user_column_selection(columns_info)
-                if not selected_columns:
-                    return
-                duplicates_found = self._find_custom_duplicates(schema, table_name, selected_columns, columns_info)
+                duplicates_found = self._find_combination_duplicates(schema, table_name, columns_info, text_columns, sample)
             
             else:
                 print("❌ Invalid selection.")
                 return
             
+            if summary is not None:
+                rate = self.duplicate_rate(schema, table_name, summary, sample)
+                interval = ""
+                if 'duplicate_rate_ci' in rate:
+                    low, high = rate['duplicate_rate_ci']
+                    interval = f", 95% CI {low:.2f}-{high:.2f}%"
+                print(f"📈 Duplicate rows: {rate['duplicate_rows']:,} of {rate['rows_scanned']:,} scanned "
+                      f"({rate['duplicate_rate']:.2f}%{interval})")
+                if 'estimated_duplicate_pairs' in rate:
+                    print(f"   Estimated duplicate pairs in the full table: ~{rate['estimated_duplicate_pairs']:,}")
+                elif sample:
+                    print("ℹ️  Page/block sample: no interval or full-table estimate (choose bernoulli for those)")
+                if summary['total_groups'] > len(duplicates_found):
+                    print(f"ℹ️  Showing the {len(duplicates_found)} largest of {summary['total_groups']:,} duplicate groups")
+            
             # Display results
             if duplicates_found:
                 self._display_duplicate_results(duplicates_found, schema, table_name)
@@ -1486,41 +2379,160 @@ class DatabaseAnalyzer:
         except Exception as e:
             print(f"❌ Error detecting duplicates: {e}")
     
-    def _find_exact_duplicates(self, schema: str, table_name: str, columns_info: List[Dict]) -> List[Dict]:
-        """Find exact duplicate rows."""
-        print("🔍 Finding exact duplicates...")
-        
-        # Create column list for query
-        columns = [col['name'] for col in columns_info]
-        column_list = ', '.join(columns)
-        
-        # Find duplicates using GROUP BY and HAVING
-        query = f"""
-        SELECT {column_list}, COUNT(*) as duplicate_count
-        FROM {schema}.{table_name}
-        GROUP BY {column_list}
-        HAVING COUNT(*) > 1
-        ORDER BY duplicate_count DESC
+    def _duplicate_source(self, schema: str, table_name: str, sample: Optional[Dict]) -> str:
+        # FROM item for duplicate queries: the sampled rows, or the whole table
+        return sample['source'] if sample else self.dialect.qualify(schema, table_name)
+
+    def duplicate_rate(self, schema: str, table_name: str, summary: Dict,
+                       sample: Optional[Dict] = None) -> Dict:
+        """Share of scanned rows that repeat an earlier row, from a duplicate_groups() summary.
+
+        Returns rows_scanned, duplicate_rows, duplicate_rate and a 95% Wilson
+        duplicate_rate_ci (percent). On a sample (from sample_source) the rate
+        is the in-sample one, which understates the table's, so the result
+        also carries 'sample' and, for row-level samples only,
+        'estimated_duplicate_pairs' for the table. Page and key-range samples
+        get no interval either (see sampling.row_level()).
         """
-        
-        self.cursor.execute(query)
-        results = self.cursor.fetchall()
-        
+        self.cursor.execute(f"SELECT COUNT(*) FROM {self._duplicate_source(schema, table_name, sample)}")
+        rows = self.cursor.fetchone()[0] or 0
+        extra = summary['duplicate_rows']
+        result = {
+            'rows_scanned': rows,
+            'duplicate_rows': extra,
+            'duplicate_rate': extra * 100.0 / rows if rows else 0.0,
+        }
+        if not sample or row_level(sample):
+            low, high = wilson_interval(extra, rows)
+            result['duplicate_rate_ci'] = [low * 100, high * 100]
+        if sample:
+            result['sample'] = sample_summary(sample, rows)
+            if row_level(sample):
+                result['estimated_duplicate_pairs'] = estimated_duplicate_pairs(
+                    summary['duplicate_pairs'], sample['percent'] / 100)
+        return result
+
+    def _hash_columns(self, schema: str, table_name: str, columns: Optional[List[str]]) -> List[Dict]:
+        columns_info = self._get_column_info(schema, table_name)
+        if columns is None:
+            return columns_info
+        by_name = {col['name']: col for col in columns_info}
+        unknown = [name for name in columns if name not in by_name]
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        return [by_name[name] for name in columns]
+
+    def duplicate_groups(self, schema: str, table_name: str, columns: Optional[List[str]] = None,
+                         sample: Optional[Dict] = None, limit: int = 50, offset: int = 0) -> Dict:
+        """One page of duplicate groups, largest first, with counts only.
+
+        Rows are grouped on a server-computed hash of ``columns`` (default
+        all, i.e. exact duplicate rows), so the GROUP BY carries one short
+        key instead of every column and works for LOB, XML and JSON columns.
+        Returns {'columns', 'total_groups', 'duplicate_rows' (copies beyond
+        the first), 'duplicate_pairs', 'limit', 'offset', 'groups': [{'row_hash',
+        'count'}]}, the totals over every group, from one query. Fetch a
+        group's rows with duplicate_group_rows().
+        """
+        hashed = self._hash_columns(schema, table_name, columns)
+        groups_sql = (
+            f"SELECT dba_row_hash, COUNT(*) AS dba_count FROM ("
+            f"SELECT {self.dialect.row_hash(hashed)} AS dba_row_hash "
+            f"FROM {self._duplicate_source(schema, table_name, sample)}) dba_rows "
+            f"GROUP BY dba_row_hash HAVING COUNT(*) > 1"
+        )
+        totals = ("COUNT(*) OVER (), SUM(CAST(dba_count AS DECIMAL(38, 0))) OVER (), "
+                  "SUM(CAST(dba_count AS DECIMAL(38, 0)) * (dba_count - 1)) OVER ()")
+        self.cursor.execute(self.dialect.paginate(
+            f"SELECT dba_row_hash, dba_count, {totals} FROM ({groups_sql}) dba_groups "
+            f"ORDER BY dba_count DESC, dba_row_hash", limit, offset))
+        rows = self.cursor.fetchall()
+        if rows:
+            total_groups, rows_in_groups, pairs_twice = rows[0][2:]
+        elif offset:
+            # Past the last page: the totals still describe every group
+            self.cursor.execute(f"SELECT COUNT(*), SUM(CAST(dba_count AS DECIMAL(38, 0))), "
+                                f"SUM(CAST(dba_count AS DECIMAL(38, 0)) * (dba_count - 1)) FROM ({groups_sql}) dba_groups")
+            total_groups, rows_in_groups, pairs_twice = self.cursor.fetchone()
+        else:
+            total_groups, rows_in_groups, pairs_twice = 0, 0, 0
+        return {
+            'columns': [col['name'] for col in hashed],
+            'total_groups': int(total_groups or 0),
+            'duplicate_rows': int(rows_in_groups or 0) - int(total_groups or 0),
+            'duplicate_pairs': int(pairs_twice or 0) // 2,
+            'limit': limit,
+            'offset': offset,
+            'groups': [{'row_hash': row_hash, 'count': int(count)} for row_hash, count, *_ in rows],
+        }
+
+    def duplicate_group_rows(self, schema: str, table_name: str, row_hashes: List[str],
+                             columns: Optional[List[str]] = None, limit: int = 100,
+                             offset: int = 0) -> Dict[str, List[Dict]]:
+        """Full rows of duplicate groups found by duplicate_groups() with the same ``columns``.
+
+        Returns {row_hash: [row dicts]}, at most ``limit`` rows per group
+        after skipping ``offset``, from one scan of the whole table. Rows
+        within a group are numbered by primary key, or else by a hash of the
+        whole row, so pages neither repeat nor skip rows.
+        """
+        if not row_hashes:
+            return {}
+        hashed = self._hash_columns(schema, table_name, columns)
+        columns_info = self._get_column_info(schema, table_name)
+        names = [col['name'] for col in columns_info]
+        column_list = ", ".join(self.dialect.quote_ident(name) for name in names)
+        placeholders = ", ".join([self.dialect.placeholder] * len(row_hashes))
+        primary = self._primary_key(schema, table_name)
+        if primary:
+            order = ", ".join(self.dialect.quote_ident(name) for name in primary)
+        elif len(hashed) == len(columns_info):
+            # Rows of one group are identical, so any order pages the same
+            order = "dba_row_hash"
+        else:
+            order = self.dialect.row_hash(columns_info)
+        self.cursor.execute(
+            f"SELECT dba_row_hash, {column_list} FROM ("
+            f"SELECT dba_rows.*, ROW_NUMBER() OVER (PARTITION BY dba_row_hash ORDER BY {order}) AS dba_row_number "
+            f"FROM (SELECT {column_list}, {self.dialect.row_hash(hashed)} AS dba_row_hash "
+            f"FROM {self.dialect.qualify(schema, table_name)}) dba_rows "
+            f"WHERE dba_row_hash IN ({placeholders})) dba_numbered "
+            f"WHERE dba_row_number > {int(offset)} AND dba_row_number <= {int(offset) + int(limit)}",
+            tuple(row_hashes),
+        )
+        groups = {row_hash: [] for row_hash in row_hashes}
+        for row in self.cursor.fetchall():
+            groups.setdefault(row[0], []).append(dict(zip(names, row[1:])))
+        return groups
+
+    def _duplicate_group_details(self, schema: str, table_name: str, summary: Dict) -> List[Dict]:
+        # Page of duplicate_groups() with one representative row each, for display and export
+        all_columns = len(summary['columns']) == len(self._get_column_info(schema, table_name))
+        samples = self.duplicate_group_rows(schema, table_name, [group['row_hash'] for group in summary['groups']],
+                                            None if all_columns else summary['columns'], limit=1)
         duplicates = []
-        for row in results:
-            duplicate_count = row[-1]
-            row_data = dict(zip(columns, row[:-1]))
-            duplicates.append({
-                'type': 'exact',
-                'count': duplicate_count,
-                'data': row_data,
-                'similarity': 100.0,
-                'similar_rows': [row_data] * duplicate_count
-            })
-        
+        for group in summary['groups']:
+            rows = samples.get(group['row_hash'])
+            row_data = rows[0] if rows else {}
+            if all_columns:
+                duplicates.append({'type': 'exact', 'count': group['count'], 'row_hash': group['row_hash'],
+                                   'data': row_data, 'similarity': 100.0})
+            else:
+                duplicates.append({'type': 'custom', 'count': group['count'], 'row_hash': group['row_hash'],
+                                   'data': {name: row_data.get(name) for name in summary['columns']},
+                                   'columns': summary['columns']})
         return duplicates
+
+    def _find_exact_duplicates(self, schema: str, table_name: str, columns_info: List[Dict],
+                               sample: Optional[Dict] = None) -> List[Dict]:
+        """Find exact duplicate rows: the largest groups, each with one representative row."""
+        print("🔍 Finding exact duplicates...")
+        summary = self.duplicate_groups(schema, table_name, [col['name'] for col in columns_info], sample,
+                                        limit=DUPLICATE_DISPLAY_GROUPS)
+        return self._duplicate_group_details(schema, table_name, summary)
     
-    def _find_fuzzy_duplicates(self, schema: str, table_name: str, text_columns: List[str], similarity_threshold: float = 0.7) -> List[Dict]:
+    def _find_fuzzy_duplicates(self, schema: str, table_name: str, text_columns: List[str], similarity_threshold: float = 0.7,
+                               sample: Optional[Dict] = None) -> List[Dict]:
         """Find fuzzy duplicates based on text similarity."""
         print(f"🔍 Finding fuzzy duplicates (similarity >= {similarity_threshold*100:.0f}%)...")
         
@@ -1552,9 +2564,14 @@ class DatabaseAnalyzer:
         
         print(f"📝 Analyzing column: {target_column}")
         
-        # Get all unique values from the target column
-        self.cursor.execute(f"SELECT DISTINCT {target_column} FROM {schema}.{table_name} WHERE {target_column} IS NOT NULL ORDER BY {target_column}")
-        unique_values = [row[0] for row in self.cursor.fetchall()]
+        # Every distinct value with its row count, in one grouped scan
+        column = self.dialect.quote_ident(target_column)
+        self.cursor.execute(
+            f"SELECT {column}, COUNT(*) FROM {self._duplicate_source(schema, table_name, sample)} "
+            f"WHERE {column} IS NOT NULL GROUP BY {column} ORDER BY {column}"
+        )
+        value_counts = dict(self.cursor.fetchall())
+        unique_values = list(value_counts)
         
         if len(unique_values) > 1000:
             print(f"⚠️  Large dataset ({len(unique_values)} unique values). This may take time...")
@@ -1584,11 +2601,7 @@ class DatabaseAnalyzer:
                 group_data = []
                 total_count = 0
                 for val in similar_group:
-                    if self.db_type == 'sqlserver':
-                        self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table_name} WHERE {target_column} = ?", (val,))
-                    else:
-                        self.cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table_name} WHERE {target_column} = %s", (val,))
-                    count = self.cursor.fetchone()[0]
+                    count = value_counts[val]
                     group_data.append({'value': val, 'count': count})
                     total_count += count
                 
@@ -1603,17 +2616,18 @@ class DatabaseAnalyzer:
         
         return duplicate_groups
     
-    def _find_combination_duplicates(self, schema: str, table_name: str, columns_info: List[Dict], text_columns: List[str]) -> List[Dict]:
+    def _find_combination_duplicates(self, schema: str, table_name: str, columns_info: List[Dict], text_columns: List[str],
+                                     sample: Optional[Dict] = None) -> List[Dict]:
         """Find duplicates using combination of exact and fuzzy matching."""
         print("🔍 Finding combination duplicates (exact + fuzzy)...")
         
         # First find exact duplicates
-        exact_duplicates = self._find_exact_duplicates(schema, table_name, columns_info)
+        exact_duplicates = self._find_exact_duplicates(schema, table_name, columns_info, sample)
         
         # Then find fuzzy duplicates
         fuzzy_duplicates = []
         if text_columns:
-            fuzzy_duplicates = self._find_fuzzy_duplicates(schema, table_name, text_columns, 0.8)
+            fuzzy_duplicates = self._find_fuzzy_duplicates(schema, table_name, text_columns, 0.8, sample)
         
         # Combine results
         all_duplicates = []
@@ -1622,37 +2636,6 @@ class DatabaseAnalyzer:
         
         return all_duplicates
     
-    def _find_custom_duplicates(self, schema: str, table_name: str, selected_columns: List[str], columns_info: List[Dict]) -> List[Dict]:
-        """Find duplicates based on user-selected columns."""
-        print(f"🔍 Finding duplicates based on selected columns: {', '.join(selected_columns)}")
-        
-        column_list = ', '.join(selected_columns)
-        
-        query = f"""
-        SELECT {column_list}, COUNT(*) as duplicate_count
-        FROM {schema}.{table_name}
-        GROUP BY {column_list}
-        HAVING COUNT(*) > 1
-        ORDER BY duplicate_count DESC
-        """
-        
-        self.cursor.execute(query)
-        results = self.cursor.fetchall()
-        
-        duplicates = []
-        for row in results:
-            duplicate_count = row[-1]
-            row_data = dict(zip(selected_columns, row[:-1]))
-            duplicates.append({
-                'type': 'custom',
-                'count': duplicate_count,
-                'data': row_data,
-                'columns': selected_columns,
-                'similar_rows': [row_data] * duplicate_count
-            })
-        
-        return duplicates
-    
     def _get_user_column_selection(self, columns_info: List[Dict]) -> List[str]:
         """Get user selection of columns for duplicate detection."""
         print(f"\nSelect columns for duplicate detection (comma-separated numbers):")
@@ -1749,7 +2732,9 @@ class DatabaseAnalyzer:
     def _export_duplicates_to_excel(self, duplicates: List[Dict], schema: str, table_name: str, detection_type: str):
         """Export duplicate detection results to Excel file."""
         try:
-            
+            from openpyxl import Workbook
+            from openpyxl.styles import Font, PatternFill
+
             # Create workbook and worksheet
             wb = Workbook()
             ws = wb.active
@@ -1860,69 +2845,33 @@ class DatabaseAnalyzer:
             print(f"❌ Error exporting to Excel: {e}")
             print("💡 Make sure you have 'openpyxl' installed: pip install openpyxl")
 
-
+    def get_view_definitions(self) -> Dict[Tuple[str, str], Optional[str]]:
+        """Every view definition keyed by (schema, view), loaded in one query and cached."""
+        return self.cached('view_definitions', lambda: {
+            (schema, name): definition for schema, name, definition in self._query('view_definitions')
+        })
 
     def _get_view_definition(self, schema: str, view_name: str) -> Optional[str]:
         """Return the SQL definition of a view, or None if not found."""
         try:
-            if self.db_type.lower() == "sqlserver":
-                # sys.sql_modules holds object definitions
-                sql = """
-                    SELECT m.definition
-                    FROM sys.views v
-                    JOIN sys.schemas s ON v.schema_id = s.schema_id
-                    JOIN sys.sql_modules m ON v.object_id = m.object_id
-                    WHERE s.name = ? AND v.name = ?
-                """
-                self.cursor.execute(sql, (schema, view_name))
-                row = self.cursor.fetchone()
-                return row[0] if row else None
-
-            elif self.db_type.lower() == "postgresql":
-                # use pg_get_viewdef for better formatting
-                sql = "SELECT pg_get_viewdef(quote_ident(%s) || '.' || quote_ident(%s)::regclass, true)"
-                # simpler: fetch from information_schema.views
-                self.cursor.execute("""
-                    SELECT view_definition
-                    FROM information_schema.views
-                    WHERE table_schema = %s AND table_name = %s
-                """, (schema, view_name))
-                row = self.cursor.fetchone()
-                return row[0] if row else None
-
-            elif self.db_type.lower() == "mysql":
-                self.cursor.execute("""
-                    SELECT VIEW_DEFINITION
-                    FROM INFORMATION_SCHEMA.VIEWS
-                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-                """, (schema, view_name))
-                row = self.cursor.fetchone()
-                return row[0] if row else None
-
-            else:
-                return None
+            definitions = self.get_view_definitions()
+            if (schema, view_name) in definitions:
+                return definitions[(schema, view_name)]
+            row = self._query_one('view_definition', (schema, view_name))
+            return row[0] if row else None
         except Exception:
             return None
 
-
     def _is_view(self, schema: str, name: str) -> bool:
         """Return True if given schema.name is a view in the DB."""
         try:
-            if self.db_type.lower() == "sqlserver":
-                self.cursor.execute("""
-                    SELECT 1 FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?
-                """, (schema, name))
-                return bool(self.cursor.fetchone())
-
-            else:  # postgres & mysql use %s
-                self.cursor.execute("""
-                    SELECT 1 FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
-                """, (schema, name))
-                return bool(self.cursor.fetchone())
+            kind = self.get_catalog().objects.get((schema, name))
+            if kind is not None:
+                return kind == 'view'
+            return self._query_one('is_view', (schema, name)) is not None
         except Exception:
             return False
 
-
     def _parse_sql_references(self, sql_text: str) -> Set[Tuple[Optional[str], str]]:
         """
         Heuristically parse SQL and return a set of (schema_or_None, object_name).
@@ -1964,6 +2913,129 @@ class DatabaseAnalyzer:
         return refs
 
 
+    def load_lineage(self) -> LineageGraph:
+        """Build the whole-database view dependency graph in bulk.
+
+        Edges come from the engine's dependency catalog in one query. Views
+        it has nothing for (or every view, if the catalog is unavailable) fall
+        back to parsing their definitions with _parse_sql_references.
+        """
+        catalog = self.get_catalog()
+        graph = LineageGraph()
+        for node in catalog.tables:
+            graph.add_node(node, 'table')
+        for node in catalog.views:
+            graph.add_node(node, 'view')
+
+        rows = []
+        if self.dialect.has('view_dependencies'):
+            try:
+                rows = self._query('view_dependencies')
+            except Exception:
+                self._rollback_quietly()
+        for view_schema, view_name, ref_schema, ref_name, ref_kind in rows:
+            view = (view_schema, view_name)
+            ref = (ref_schema, ref_name)
+            graph.add_edge(view, ref, 'catalog',
+                           view_kind=catalog.objects.get(view) or 'view',
+                           referenced_kind=ref_kind or catalog.objects.get(ref))
+
+        unresolved = [view for view in catalog.views if view not in graph.dependencies]
+        if unresolved:
+            try:
+                definitions = self.get_view_definitions()
+            except Exception:
+                self._rollback_quietly()
+                definitions = {}
+            # Parsed names keep their source spelling; match them case-insensitively
+            by_lower = {(s.lower(), n.lower()): (s, n) for s, n in catalog.objects}
+            for view in unresolved:
+                for ref_schema, ref_name in self._parse_sql_references(definitions.get(view) or ''):
+                    ref = (ref_schema or view[0], ref_name)
+                    ref = by_lower.get((ref[0].lower(), ref[1].lower()), ref)
+                    graph.add_edge(view, ref, 'parsed', referenced_kind=catalog.objects.get(ref))
+        return graph
+
+    def get_lineage(self) -> LineageGraph:
+        """Cached whole-database view dependency graph."""
+        return self.cached('lineage', self.load_lineage)
+
+    def refresh_view_lineage(self, schema: str, view_name: str) -> LineageGraph:
+        """Re-read one view's dependencies and patch the cached graph in place.
+
+        Use after a single CREATE/ALTER/DROP VIEW instead of rebuilding the
+        whole graph; a dropped view is removed from it.
+        """
+        graph = self.get_lineage()
+        view = (schema, view_name)
+        if self._query_one('is_view', view) is None:
+            graph.remove_node(view)
+            self._persist('lineage', graph)
+            return graph
+
+        catalog = self.get_catalog()
+        rows = []
+        if self.dialect.has('view_dependencies_of'):
+            try:
+                rows = self._query('view_dependencies_of', view)
+            except Exception:
+                self._rollback_quietly()
+        if rows:
+            graph.update_view(view, [((rs, rn), kind or catalog.objects.get((rs, rn)))
+                                     for _, _, rs, rn, kind in rows], 'catalog')
+        else:
+            # Read the live definition; the bulk definitions cache may predate the change
+            row = self._query_one('view_definition', view)
+            by_lower = {(s.lower(), n.lower()): (s, n) for s, n in catalog.objects}
+            refs = []
+            for ref_schema, ref_name in self._parse_sql_references(row[0] if row and row[0] else ''):
+                ref = (ref_schema or schema, ref_name)
+                ref = by_lower.get((ref[0].lower(), ref[1].lower()), ref)
+                refs.append((ref, catalog.objects.get(ref)))
+            graph.update_view(view, refs, 'parsed')
+        self._persist('lineage', graph)
+        return graph
+
+    def analyze_impact(self, schema: str, name: str, max_depth: Optional[int] = None) -> Dict:
+        """Upstream and downstream closure of an object, layered by distance.
+
+        Downstream answers "which views break if this changes?"; upstream
+        lists everything the object reads from. Cycles touching either
+        closure are reported as well.
+        """
+        graph = self.get_lineage()
+        node = (schema, name)
+        downstream = graph.downstream(node, max_depth)
+        upstream = graph.upstream(node, max_depth)
+        involved = set(downstream) | set(upstream) | {node}
+        return {
+            'node': node,
+            'kind': graph.kinds.get(node),
+            'downstream': downstream,
+            'upstream': upstream,
+            'downstream_layers': graph.layers(downstream),
+            'upstream_layers': graph.layers(upstream),
+            'cycles': [cycle for cycle in graph.cycles() if involved.intersection(cycle)],
+        }
+
+    def get_view_hierarchy(self, root_schema: str, root_view: str, max_depth: int = 10) -> Dict:
+        """Dependency graph of a view as JSON-ready nodes and edges.
+
+        Nodes carry their distance from the root in ``depth``; ``hash``
+        identifies the graph's content for render caching.
+        """
+        graph = self.get_lineage()
+        root = (root_schema, root_view)
+        hier_nodes, hier_edges = graph.hierarchy(root, max_depth)
+        depths = graph.upstream(root, max_depth)
+        depths[root] = 0
+        result = graph.to_json(hier_nodes, hier_edges)
+        for node, entry in zip(hier_nodes, result['nodes']):
+            entry['depth'] = depths.get(node, 0)
+        result['root'] = node_id(root)
+        result['hash'] = graph_hash(result)
+        return result
+
     def build_view_hierarchy(self,
                             root_schema: str,
                             root_view: str,
@@ -1976,107 +3048,13 @@ class DatabaseAnalyzer:
 
         Note: uses graphviz if available; fallback to networkx+matplotlib.
         """
-        try:
-            from graphviz import Digraph
-            use_graphviz = True
-        except Exception:
-            use_graphviz = False
-
-        # Helper to normalize names for node ids
-        def node_id(schema, name):
-            return f"{schema}.{name}" if schema else name
-
-        graph_edges = []  # list of (parent, child)
-        nodes = set()
-        visited = set()
-
-        # queue for DFS/BFS: tuples (schema, name, depth)
-        stack = [(root_schema, root_view, 0)]
-
-        while stack:
-            schema, name, depth = stack.pop()
-            key = (schema or '', name.lower())
-            if key in visited or depth > max_depth:
-                continue
-            visited.add(key)
-
-            this_node = node_id(schema, name)
-            nodes.add(this_node)
-
-            # Get view definition (if view) otherwise try to skip fetching for tables
-            definition = None
-            try:
-                definition = self._get_view_definition(schema, name)
-            except Exception:
-                definition = None
-
-            # If it's a view and we could get definition, parse for dependencies
-            if definition:
-                refs = self._parse_sql_references(definition)
-                for ref_schema, ref_name in refs:
-                    # resolve schema: if None, assume same schema as view (best-effort)
-                    resolved_schema = ref_schema or schema
-                    child = node_id(resolved_schema, ref_name)
-                    graph_edges.append((this_node, child))
-                    nodes.add(child)
-
-                    # If referenced object is itself a view, recurse
-                    try:
-                        if self._is_view(resolved_schema, ref_name):
-                            stack.append((resolved_schema, ref_name, depth + 1))
-                    except Exception:
-                        # If check fails, still add node but don't recurse
-                        pass
-            else:
-                # If we couldn't fetch definition, optionally try to detect dependencies using information_schema (rare)
-                pass
-
-        # Render graph
+        graph = self.get_view_hierarchy(root_schema, root_view, max_depth)
         output_file = f"{output_path}.{output_format}"
-        if use_graphviz:
-            dot = Digraph(comment=f"Dependency graph for {node_id(root_schema, root_view)}")
-            # add nodes
-            for n in nodes:
-                dot.node(n, n)
-            for a, b in graph_edges:
-                dot.edge(a, b)
-            try:
-                dot.render(filename=output_path, format=output_format, cleanup=True)
-                return output_file
-            except Exception as e:
-                # fallback if graphviz binary missing or render failed
-                use_graphviz = False
-
-        # Fallback: networkx + matplotlib
-        try:
-            import networkx as nx
-            import matplotlib.pyplot as plt
-        except Exception as e:
-            raise RuntimeError("Neither graphviz nor networkx+matplotlib are available to render the graph.") from e
-
-        G = nx.DiGraph()
-        for n in nodes:
-            G.add_node(n)
-        for a, b in graph_edges:
-            G.add_edge(a, b)
-
-        plt.figure(figsize=(12, max(6, len(nodes) * 0.3)))
-        try:
-            pos = nx.nx_agraph.graphviz_layout(G, prog="dot")
-        except Exception:
-            pos = nx.spring_layout(G)
-        nx.draw(G, pos, with_labels=True, arrows=True, node_size=2000, font_size=8)
-        plt.tight_layout()
-        plt.savefig(output_file, dpi=150)
-        plt.close()
+        with open(output_file, "wb") as f:
+            f.write(render_graph(graph, output_format))
         return output_file
 
 
-
-
-
-
-
 def main():
     """Main application loop with enhanced menu system."""
     print("🗄️  Enhanced Database Schema Analyzer")
@@ -2126,33 +3104,41 @@ def main():
                 print("-" * 40)
                 tables = analyzer.get_tables()
                 if tables:
-                    # Get row counts and column info for each table
+                    # Row counts in one statistics query (exact below the threshold)
+                    row_counts = analyzer.get_row_counts(tables)
+                    try:
+                        table_sizes = analyzer.get_table_sizes()
+                    except Exception:
+                        table_sizes = {}
                     table_stats = []
                     for schema, table_name in tables:
-                        # Use schema-qualified name for querying row count
                         qualified_name = f"{schema}.{table_name}"
-                        analyzer.cursor.execute(f"SELECT COUNT(*) FROM {qualified_name}")
-                        row_count = analyzer.cursor.fetchone()[0]
+                        count = row_counts[(schema, table_name)]
 
                         # Get column info using schema and table name
                         columns_info = analyzer._get_column_info(schema, table_name)
 
                         # Store stats
-                        table_stats.append((qualified_name, row_count, len(columns_info)))
+                        size = table_sizes.get((schema, table_name), {}).get('total')
+                        table_stats.append((qualified_name, count, len(columns_info), size))
 
-                    # Sort by row count descending
-                    table_stats.sort(key=lambda x: x[1], reverse=True)
+                    # Sort by row count descending, unknown counts last
+                    table_stats.sort(key=lambda x: (x[1]['rows'] is None, -(x[1]['rows'] or 0)))
 
                     # Get max length of table names for spacing
-                    max_len = max(len(name) for name, _, _ in table_stats)
+                    max_len = max(len(name) for name, _, _, _ in table_stats)
 
                     # Print header
-                    print(f"{'No.':<4} {'Tables':<{max_len}}   {'Rows':>6}   {'Columns':>7}")
-                    print('-' * (max_len + 25))
+                    print(f"{'No.':<4} {'Tables':<{max_len}}   {'Rows':>14}   {'Columns':>7}   {'Size':>10}")
+                    print('-' * (max_len + 46))
 
                     # Print each table's stats
-                    for i, (qualified_name, row_count, col_count) in enumerate(table_stats, 1):
-                        print(f"{i:<4} {qualified_name:<{max_len}}   {row_count:>6}   {col_count:>7}")
+                    for i, (qualified_name, count, col_count, size) in enumerate(table_stats, 1):
+                        size_display = analyzer._format_bytes(size) or "N/A"
+                        print(f"{i:<4} {qualified_name:<{max_len}}   {analyzer._format_row_count(count):>14}   {col_count:>7}   {size_display:>10}")
+
+                    if any(count['estimated'] for _, count, _, _ in table_stats):
+                        print("~ = estimated from table statistics")
 
                 else:
                     print("ℹ️  No tables found in the database.")
@@ -2255,8 +3241,10 @@ def main():
                 print("-" * 30)
                 print("1. Analyze single table")
                 print("2. Export all tables analysis to Excel")
+                print("3. Column statistics (distributions, quantiles, histograms)")
+                print("4. Most frequent values per column")
                 
-                analysis_choice = input("Choose option (1/2): ").strip()
+                analysis_choice = input("Choose option (1/2/3/4): ").strip()
                 
                 if analysis_choice == "1":
                     # Your existing single table analysis code
@@ -2282,6 +3270,24 @@ def main():
                             
                 elif analysis_choice == "2":
                     analyzer.export_all_tables_analysis()
+                elif analysis_choice == "3":
+                    for i, (schema, table_name) in enumerate(tables, 1):
+                        print(f"{i:3d}. {schema}.{table_name}")
+                    try:
+                        table_choice = int(input(f"\nEnter table number (1-{len(tables)}) or 0 to go back: "))
+                        if 1 <= table_choice <= len(tables):
+                            analyzer.show_column_statistics(*tables[table_choice - 1])
+                    except ValueError:
+                        print("Invalid input. Please enter a number.")
+                elif analysis_choice == "4":
+                    for i, (schema, table_name) in enumerate(tables, 1):
+                        print(f"{i:3d}. {schema}.{table_name}")
+                    try:
+                        table_choice = int(input(f"\nEnter table number (1-{len(tables)}) or 0 to go back: "))
+                        if 1 <= table_choice <= len(tables):
+                            analyzer.show_column_frequencies(*tables[table_choice - 1])
+                    except ValueError:
+                        print("Invalid input. Please enter a number.")
                 else:
                     print("Invalid choice.")
 
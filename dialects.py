@@ -0,0 +1,822 @@
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from connection_pool import PooledConnection
+
+
+class StatementTimeoutError(Exception):
+    """Work stopped client-side because its deadline passed (see DatabaseAnalyzer.statement_timeout())."""
+
+
+class Dialect:
+    """Catalog SQL and driver quirks for one database engine.
+
+    Every catalog query lives in ``statements`` under a stable name and is
+    written as a parameterized statement in the driver's paramstyle, so the
+    SQL text never changes between calls. Subclasses that can use
+    server-side prepared statements override prepare_and_execute().
+    """
+
+    name: str = ""
+    placeholder: str = "%s"
+    statements: Dict[str, str] = {}
+    # Server-side approximate COUNT(DISTINCT) for "{col}" (None: sketch client-side)
+    # and its relative error; gated by the 'approx_distinct_available' statement
+    approx_distinct: Optional[str] = None
+    approx_distinct_error: Optional[float] = None
+    # No TABLESAMPLE: SYSTEM samples read a primary-key range passed to sample_source()
+    sample_by_key_range: bool = False
+
+    def has(self, name: str) -> bool:
+        return name in self.statements
+
+    def sql(self, name: str) -> str:
+        try:
+            return self.statements[name]
+        except KeyError:
+            raise NotImplementedError(f"{self.name} dialect has no '{name}' statement") from None
+
+    def quote_ident(self, identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def qualify(self, schema: Optional[str], name: str) -> str:
+        """Quoted ``schema.name`` for use where identifiers cannot be bound."""
+        if schema:
+            return f"{self.quote_ident(schema)}.{self.quote_ident(name)}"
+        return self.quote_ident(name)
+
+    def set_statement_timeout(self, pooled: Optional[PooledConnection], cursor, seconds: Optional[float]):
+        """Bound how long each following statement may run; None or 0 removes the limit."""
+
+    def is_statement_timeout(self, error: BaseException) -> bool:
+        """Whether error is a statement cancelled by set_statement_timeout(), or a passed deadline."""
+        return isinstance(error, StatementTimeoutError)
+
+    def stream_cursor(self, pooled: PooledConnection):
+        """Cursor that fetches rows from the server in batches rather than all at once."""
+        return pooled.raw.cursor()
+
+    def sample_source(self, table_sql: str, sample: Dict, key_range: Optional[Tuple[str, int, int]] = None) -> Tuple[str, str]:
+        """FROM item reading about sample['percent']% of table_sql, repeatably for sample['seed'].
+
+        Returns (sql, method actually used). ``key_range`` is a
+        (quoted key column, low, high) block for engines without TABLESAMPLE.
+        """
+        raise NotImplementedError(f"{self.name} dialect does not support sampling")
+
+    def row_hash(self, columns: Sequence[Dict]) -> str:
+        """SQL expression hashing the given columns of a row to a hex string.
+
+        Values are rendered to a canonical text first, so NULL, '' and
+        values containing the separator never collide, and any column type
+        (LOB, XML, JSON) can take part; rows hash equal exactly when the
+        columns are equal.
+        """
+        raise NotImplementedError(f"{self.name} dialect does not support row hashing")
+
+    def paginate(self, sql: str, limit: int, offset: int = 0) -> str:
+        """sql (ending in ORDER BY) limited to ``limit`` rows after skipping ``offset``."""
+        return f"{sql} LIMIT {int(limit)} OFFSET {int(offset)}"
+
+    def read_column_stats(self, rows: List[Tuple], row_count: int) -> Dict[str, Dict]:
+        """Normalize 'optimizer_column_stats' rows to {column: {'null_frac', 'empty_frac', 'distinct'}}.
+
+        Fractions are of all rows; 'distinct' is an estimated count of
+        non-NULL distinct values. The base form reads (column, rows
+        described, NULL rows, distinct values, empty-string rows) counts.
+        """
+        stats = {}
+        for name, total, nulls, distinct, empty in rows:
+            if name in stats or not total:
+                continue
+            stats[name] = {
+                'null_frac': float(nulls or 0) / float(total),
+                'empty_frac': float(empty or 0) / float(total),
+                'distinct': int(round(float(distinct or 0))),
+            }
+        return stats
+
+    def fetchall(self, pooled: Optional[PooledConnection], cursor, name: str, params: Sequence = ()) -> List[Tuple]:
+        """Execute a named statement and return every row."""
+        return self.prepare_and_execute(pooled, cursor, name, tuple(params))
+
+    def fetchone(self, pooled: Optional[PooledConnection], cursor, name: str, params: Sequence = ()) -> Optional[Tuple]:
+        rows = self.fetchall(pooled, cursor, name, params)
+        return rows[0] if rows else None
+
+    def prepare_and_execute(self, pooled: Optional[PooledConnection], cursor, name: str, params: Tuple) -> List[Tuple]:
+        if params:
+            cursor.execute(self.sql(name), params)
+        else:
+            cursor.execute(self.sql(name))
+        return cursor.fetchall()
+
+
+DIALECTS: Dict[str, Type[Dialect]] = {}
+
+
+def register_dialect(cls: Type[Dialect]) -> Type[Dialect]:
+    """Class decorator that makes a dialect available to get_dialect()."""
+    DIALECTS[cls.name] = cls
+    return cls
+
+
+def get_dialect(db_type: str) -> Dialect:
+    try:
+        return DIALECTS[db_type]()
+    except KeyError:
+        raise ValueError(f"Unsupported db_type: {db_type}") from None
+
+
+@register_dialect
+class PostgresDialect(Dialect):
+    """PostgreSQL via psycopg2, using PREPARE/EXECUTE per pooled connection."""
+
+    name = "postgresql"
+    placeholder = "%s"
+    # postgresql-hll extension at its default 2**11 registers
+    approx_distinct = "hll_cardinality(hll_add_agg(hll_hash_any({col})))"
+    approx_distinct_error = 1.04 / 2 ** 5.5
+
+    statements = {
+        'catalog_objects': """
+            SELECT table_schema, table_name, 'table'
+            FROM information_schema.tables
+            WHERE table_type='BASE TABLE'
+            UNION ALL
+            SELECT table_schema, table_name, 'view'
+            FROM information_schema.views
+            WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
+        """,
+        'catalog_columns': """
+            SELECT table_schema, table_name, column_name, data_type, is_nullable, column_default
+            FROM information_schema.columns
+            ORDER BY table_schema, table_name, ordinal_position
+        """,
+        'columns': """
+            SELECT column_name, data_type, is_nullable, column_default
+            FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s
+            ORDER BY ordinal_position
+        """,
+        'views_count': "SELECT COUNT(*) FROM information_schema.views WHERE table_schema='public'",
+        'schemas_count': "SELECT COUNT(*) FROM information_schema.schemata",
+        # Relation checksum: any DDL writes new row versions into these catalogs
+        'schema_version': """
+            SELECT (SELECT count(*) || ':' || coalesce(sum(xmin::text::bigint), 0) FROM pg_class)
+                || '/' || (SELECT count(*) || ':' || coalesce(sum(xmin::text::bigint), 0) FROM pg_attribute)
+                || '/' || (SELECT count(*) || ':' || coalesce(sum(xmin::text::bigint), 0) FROM pg_rewrite)
+        """,
+        'database_size': "SELECT pg_size_pretty(pg_database_size(current_database()))",
+        'approx_distinct_available': "SELECT 1 FROM pg_extension WHERE extname = 'hll'",
+        # Planner statistics; reltuples is -1 until the table is first analyzed
+        'row_estimates': """
+            SELECT n.nspname, c.relname,
+                   CASE
+                       WHEN c.relkind = 'p' THEN (
+                           SELECT sum(GREATEST(ch.reltuples, 0))::bigint
+                           FROM pg_inherits i
+                           JOIN pg_class ch ON ch.oid = i.inhrelid
+                           WHERE i.inhparent = c.oid)
+                       WHEN c.reltuples < 0 THEN NULL
+                       ELSE c.reltuples::bigint
+                   END
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('r', 'p')
+              AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+        """,
+        # Row activity counters plus the relfilenode, which TRUNCATE and table rewrites replace;
+        # partitioned parents have no counters and are always treated as changed
+        'table_change_counters': """
+            SELECT schemaname, relname,
+                   n_tup_ins || ':' || n_tup_upd || ':' || n_tup_del || ':' || pg_relation_filenode(relid)
+            FROM pg_stat_user_tables
+        """,
+        # Bytes per table: heap (+fsm/vm), indexes, TOAST (with its index); partitioned parents sum their partitions
+        'table_sizes': """
+            WITH rel AS (
+                SELECT c.oid, n.nspname, c.relname, c.relkind,
+                       pg_table_size(c.oid) AS table_bytes,
+                       pg_indexes_size(c.oid) AS index_bytes,
+                       COALESCE(pg_total_relation_size(NULLIF(c.reltoastrelid, 0)), 0) AS toast_bytes
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relkind IN ('r', 'p')
+                  AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+            ), totals AS (
+                SELECT r.nspname, r.relname,
+                       r.table_bytes - r.toast_bytes + COALESCE(SUM(ch.table_bytes - ch.toast_bytes), 0) AS data_bytes,
+                       r.index_bytes + COALESCE(SUM(ch.index_bytes), 0) AS index_bytes,
+                       r.toast_bytes + COALESCE(SUM(ch.toast_bytes), 0) AS toast_bytes
+                FROM rel r
+                LEFT JOIN pg_inherits i ON r.relkind = 'p' AND i.inhparent = r.oid
+                LEFT JOIN rel ch ON ch.oid = i.inhrelid
+                GROUP BY r.nspname, r.relname, r.table_bytes, r.index_bytes, r.toast_bytes
+            )
+            SELECT nspname, relname, data_bytes, index_bytes, toast_bytes,
+                   data_bytes + index_bytes + toast_bytes
+            FROM totals
+        """,
+        # One row per index column: key columns first (ordinal <= indnkeyatts), then INCLUDE columns
+        'index_columns': """
+            SELECT n.nspname, t.relname, i.relname,
+                   pg_get_indexdef(ix.indexrelid, k.ord, true),
+                   k.ord,
+                   k.ord > ix.indnkeyatts,
+                   ix.indisunique,
+                   ix.indisprimary,
+                   am.amname,
+                   pg_relation_size(i.oid)
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_class t ON t.oid = ix.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            JOIN pg_am am ON am.oid = i.relam
+            CROSS JOIN LATERAL generate_series(1, ix.indnatts) AS k(ord)
+            WHERE n.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+              AND t.relpersistence <> 't'
+            ORDER BY n.nspname, t.relname, i.relname, k.ord
+        """,
+        'view_definition': """
+            SELECT view_definition
+            FROM information_schema.views
+            WHERE table_schema = %s AND table_name = %s
+        """,
+        'view_definitions': """
+            SELECT table_schema, table_name, view_definition
+            FROM information_schema.views
+            WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
+        """,
+        # View -> relation edges recorded for each view's rewrite rule
+        'view_dependencies': """
+            SELECT DISTINCT vn.nspname AS view_schema, v.relname AS view_name,
+                   tn.nspname AS ref_schema, t.relname AS ref_name,
+                   CASE t.relkind
+                       WHEN 'r' THEN 'table' WHEN 'p' THEN 'table'
+                       WHEN 'v' THEN 'view' WHEN 'm' THEN 'materialized view'
+                       WHEN 'f' THEN 'foreign table' ELSE 'other'
+                   END AS ref_kind
+            FROM pg_rewrite r
+            JOIN pg_class v ON v.oid = r.ev_class
+            JOIN pg_namespace vn ON vn.oid = v.relnamespace
+            JOIN pg_depend d ON d.classid = 'pg_rewrite'::regclass AND d.objid = r.oid
+                            AND d.refclassid = 'pg_class'::regclass
+            JOIN pg_class t ON t.oid = d.refobjid
+            JOIN pg_namespace tn ON tn.oid = t.relnamespace
+            WHERE v.relkind IN ('v', 'm') AND t.oid <> v.oid
+              AND vn.nspname NOT IN ('pg_catalog', 'information_schema')
+        """,
+        'is_view': "SELECT 1 FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+        # ANALYZE results; the empty string's frequency is known only if it is a most common value.
+        # Inherited rows (parent plus children) sort first, matching what a scan of the parent reads
+        'optimizer_column_stats': """
+            SELECT attname, null_frac, n_distinct,
+                   COALESCE(most_common_freqs[array_position(most_common_vals::text::text[], '')], 0)
+            FROM pg_stats
+            WHERE schemaname = %s AND tablename = %s
+            ORDER BY attname, inherited DESC
+        """,
+    }
+
+    # One view's edges, for incremental lineage updates
+    statements['view_dependencies_of'] = (
+        "SELECT * FROM (" + statements['view_dependencies'] + ") deps"
+        " WHERE deps.view_schema = %s AND deps.view_name = %s"
+    )
+
+    _PLACEHOLDER = re.compile(r"%%|%s")
+
+    def read_column_stats(self, rows, row_count):
+        stats = {}
+        for name, null_frac, n_distinct, empty_frac in rows:
+            if name in stats:
+                continue
+            # Negative n_distinct is minus the distinct count as a fraction of the rows
+            distinct = n_distinct if n_distinct >= 0 else -n_distinct * row_count
+            stats[name] = {
+                'null_frac': float(null_frac),
+                'empty_frac': float(empty_frac or 0),
+                'distinct': int(round(distinct)),
+            }
+        return stats
+
+    def set_statement_timeout(self, pooled, cursor, seconds):
+        milliseconds = int((seconds or 0) * 1000)
+        cursor.execute("SET statement_timeout = %s", (milliseconds,))
+        if pooled is not None:
+            # A rollback reverts the SET; prepare_and_execute() re-applies it after its own
+            pooled.state['statement_timeout_ms'] = milliseconds
+
+    def is_statement_timeout(self, error):
+        # query_canceled
+        return super().is_statement_timeout(error) or getattr(error, 'pgcode', None) == '57014'
+
+    def row_hash(self, columns):
+        # A row value's text form quotes and escapes every field, and leaves NULLs empty
+        return f"md5(ROW({', '.join(self.quote_ident(column['name']) for column in columns)})::text)"
+
+    def sample_source(self, table_sql, sample, key_range=None):
+        method = sample['method'].upper()
+        return f"{table_sql} TABLESAMPLE {method} ({sample['percent']!r}) REPEATABLE ({sample['seed']})", sample['method']
+
+    def stream_cursor(self, pooled):
+        # Named cursors are server-side; rows arrive itersize at a time
+        pooled.state['stream_cursors'] = pooled.state.get('stream_cursors', 0) + 1
+        cursor = pooled.raw.cursor(name=f"dba_stream_{pooled.state['stream_cursors']}")
+        cursor.itersize = 10000
+        return cursor
+
+    def prepare_and_execute(self, pooled, cursor, name, params):
+        if pooled is None:
+            return super().prepare_and_execute(pooled, cursor, name, params)
+
+        prepared = pooled.state.setdefault('pg_prepared', {})
+        stmt = f"dba_{name}"
+        if name not in prepared:
+            try:
+                cursor.execute(f"PREPARE {stmt} AS {self._to_server_params(self.sql(name))}")
+                prepared[name] = True
+            except Exception:
+                # e.g. insufficient privileges or a pooler that forbids PREPARE
+                pooled.raw.rollback()
+                prepared[name] = False
+                if pooled.state.get('statement_timeout_ms'):
+                    cursor.execute("SET statement_timeout = %s", (pooled.state['statement_timeout_ms'],))
+
+        if not prepared[name]:
+            return super().prepare_and_execute(pooled, cursor, name, params)
+
+        if params:
+            cursor.execute(f"EXECUTE {stmt} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {stmt}")
+        return cursor.fetchall()
+
+    def _to_server_params(self, sql: str) -> str:
+        # psycopg2 %s placeholders -> $1, $2, ...; %% -> literal %
+        counter = iter(range(1, 1000))
+        return self._PLACEHOLDER.sub(lambda m: '%' if m.group(0) == '%%' else f"${next(counter)}", sql)
+
+
+@register_dialect
+class MySQLDialect(Dialect):
+    """MySQL via mysql.connector, reusing one prepared cursor per statement and connection."""
+
+    name = "mysql"
+    placeholder = "%s"
+    sample_by_key_range = True
+
+    statements = {
+        'catalog_objects': """
+            SELECT TABLE_SCHEMA, TABLE_NAME,
+                   CASE WHEN TABLE_TYPE = 'VIEW' THEN 'view' ELSE 'table' END
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_TYPE = 'BASE TABLE'
+               OR (TABLE_TYPE = 'VIEW'
+                   AND TABLE_SCHEMA NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys'))
+        """,
+        'catalog_columns': """
+            SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+            FROM INFORMATION_SCHEMA.COLUMNS
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+        """,
+        'columns': """
+            SELECT COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+            ORDER BY ORDINAL_POSITION
+        """,
+        'table_creation_date': """
+            SELECT CREATE_TIME
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        """,
+        'views_count': "SELECT COUNT(*) FROM information_schema.views WHERE table_schema = DATABASE()",
+        'schemas_count': "SELECT COUNT(*) FROM information_schema.schemata",
+        'schema_version': """
+            SELECT CONCAT(COUNT(*), '/', COALESCE(MAX(CREATE_TIME), ''), '/', COALESCE(MAX(UPDATE_TIME), ''))
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
+        """,
+        'database_size': """
+            SELECT ROUND(SUM(data_length + index_length) / 1024 / 1024, 2) AS 'DB Size in MB'
+            FROM information_schema.tables
+            WHERE table_schema = DATABASE()
+        """,
+        # InnoDB TABLE_ROWS is sampled (and cached per information_schema_stats_expiry)
+        'row_estimates': """
+            SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_ROWS
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_TYPE = 'BASE TABLE'
+        """,
+        # UPDATE_TIME is NULL for tables untouched since the server started (unknown: re-profile);
+        # CREATE_TIME catches TRUNCATE and rebuilds
+        'table_change_counters': """
+            SELECT TABLE_SCHEMA, TABLE_NAME, CONCAT(UPDATE_TIME, '|', CREATE_TIME)
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_TYPE = 'BASE TABLE'
+        """,
+        # MySQL 8 otherwise serves UPDATE_TIME from a cache up to a day old
+        'table_change_counters_setup': "SET SESSION information_schema_stats_expiry = 0",
+        # InnoDB keeps off-page BLOB/TEXT inside DATA_LENGTH, so there is no separate LOB figure
+        'table_sizes': """
+            SELECT TABLE_SCHEMA, TABLE_NAME, DATA_LENGTH, INDEX_LENGTH, NULL,
+                   COALESCE(DATA_LENGTH, 0) + COALESCE(INDEX_LENGTH, 0)
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_TYPE = 'BASE TABLE'
+        """,
+        # Index size comes from InnoDB persistent statistics (needs SELECT on mysql.*)
+        'index_columns': """
+            SELECT s.TABLE_SCHEMA, s.TABLE_NAME, s.INDEX_NAME,
+                   CASE WHEN s.SUB_PART IS NULL THEN s.COLUMN_NAME
+                        ELSE CONCAT(s.COLUMN_NAME, '(', s.SUB_PART, ')') END,
+                   s.SEQ_IN_INDEX,
+                   0,
+                   s.NON_UNIQUE = 0,
+                   s.INDEX_NAME = 'PRIMARY',
+                   s.INDEX_TYPE,
+                   st.stat_value * @@innodb_page_size
+            FROM INFORMATION_SCHEMA.STATISTICS s
+            LEFT JOIN mysql.innodb_index_stats st
+              ON st.database_name = s.TABLE_SCHEMA COLLATE utf8_bin
+             AND st.table_name = s.TABLE_NAME COLLATE utf8_bin
+             AND st.index_name = s.INDEX_NAME COLLATE utf8_bin
+             AND st.stat_name = 'size'
+            WHERE s.TABLE_SCHEMA NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
+            ORDER BY s.TABLE_SCHEMA, s.TABLE_NAME, s.INDEX_NAME, s.SEQ_IN_INDEX
+        """,
+        'index_columns_fallback': """
+            SELECT TABLE_SCHEMA, TABLE_NAME, INDEX_NAME,
+                   CASE WHEN SUB_PART IS NULL THEN COLUMN_NAME
+                        ELSE CONCAT(COLUMN_NAME, '(', SUB_PART, ')') END,
+                   SEQ_IN_INDEX,
+                   0,
+                   NON_UNIQUE = 0,
+                   INDEX_NAME = 'PRIMARY',
+                   INDEX_TYPE,
+                   NULL
+            FROM INFORMATION_SCHEMA.STATISTICS
+            WHERE TABLE_SCHEMA NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+        """,
+        'view_definition': """
+            SELECT VIEW_DEFINITION
+            FROM INFORMATION_SCHEMA.VIEWS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        """,
+        'view_definitions': """
+            SELECT TABLE_SCHEMA, TABLE_NAME, VIEW_DEFINITION
+            FROM INFORMATION_SCHEMA.VIEWS
+            WHERE TABLE_SCHEMA NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
+        """,
+        # MySQL 8.0.13+; older servers fall back to parsing view definitions
+        'view_dependencies': """
+            SELECT VIEW_SCHEMA AS view_schema, VIEW_NAME AS view_name,
+                   TABLE_SCHEMA AS ref_schema, TABLE_NAME AS ref_name, NULL AS ref_kind
+            FROM INFORMATION_SCHEMA.VIEW_TABLE_USAGE
+            WHERE VIEW_SCHEMA NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys')
+        """,
+        'is_view': "SELECT 1 FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+        # MySQL 8 histograms, only for columns someone ran ANALYZE TABLE ... UPDATE HISTOGRAM on
+        'optimizer_column_stats': """
+            SELECT COLUMN_NAME, HISTOGRAM
+            FROM INFORMATION_SCHEMA.COLUMN_STATISTICS
+            WHERE SCHEMA_NAME = %s AND TABLE_NAME = %s
+        """,
+    }
+
+    # One view's edges, for incremental lineage updates
+    statements['view_dependencies_of'] = (
+        "SELECT * FROM (" + statements['view_dependencies'] + ") deps"
+        " WHERE deps.view_schema = %s AND deps.view_name = %s"
+    )
+
+    def quote_ident(self, identifier: str) -> str:
+        return '`' + identifier.replace('`', '``') + '`'
+
+    @staticmethod
+    def _is_empty_string(value) -> bool:
+        # Histogram strings are written as 'base64:type<N>:<payload>'
+        return isinstance(value, str) and value.startswith('base64:') and value.split(':', 2)[-1] == ''
+
+    def read_column_stats(self, rows, row_count):
+        stats = {}
+        for name, histogram in rows:
+            if isinstance(histogram, (bytes, bytearray)):
+                histogram = histogram.decode('utf-8')
+            data = json.loads(histogram) if isinstance(histogram, str) else histogram
+            buckets = data.get('buckets') or []
+            empty = 0.0
+            previous = 0.0
+            if data.get('histogram-type') == 'singleton':
+                # [value, cumulative frequency]: one bucket per distinct value
+                distinct = len(buckets)
+                for value, cumulative in buckets:
+                    if self._is_empty_string(value):
+                        empty = cumulative - previous
+                    previous = cumulative
+            else:
+                # [lower, upper, cumulative frequency, distinct values in bucket]
+                distinct = sum(bucket[3] for bucket in buckets)
+                for lower, upper, cumulative, _ in buckets:
+                    if self._is_empty_string(lower) and self._is_empty_string(upper):
+                        empty = cumulative - previous
+                    previous = cumulative
+            stats[name] = {
+                'null_frac': float(data.get('null-values') or 0),
+                'empty_frac': float(empty),
+                'distinct': int(distinct),
+            }
+        return stats
+
+    _SPATIAL_TYPES = ('geometry', 'point', 'linestring', 'polygon', 'multipoint', 'multilinestring',
+                      'multipolygon', 'geometrycollection', 'geomcollection')
+
+    def row_hash(self, columns):
+        # Each value as "<length>:<text>" (N for NULL), so no separator inside a value can shift fields
+        parts = []
+        for column in columns:
+            col = self.quote_ident(column['name'])
+            lowered = (column['type'] or '').lower()
+            if 'binary' in lowered or 'blob' in lowered:
+                text = f"HEX({col})"
+            elif lowered in self._SPATIAL_TYPES:
+                text = f"HEX(ST_AsBinary({col}))"
+            elif lowered == 'bit':
+                text = f"BIN({col})"
+            else:
+                # CAST to the connection character set keeps mixed-collation columns comparable
+                text = f"CAST({col} AS CHAR)"
+            parts.append(f"CASE WHEN {col} IS NULL THEN 'N' ELSE CONCAT(CHAR_LENGTH({text}), ':', {text}) END")
+        return f"SHA2(CONCAT_WS(',', {', '.join(parts)}), 256)"
+
+    def sample_source(self, table_sql, sample, key_range=None):
+        # No TABLESAMPLE: a contiguous primary-key block stands in for SYSTEM,
+        # otherwise a seeded RAND() filter gives a (full-scan) row-level sample
+        if sample['method'] == 'system' and key_range is not None:
+            column, low, high = key_range
+            return (f"(SELECT * FROM {table_sql} WHERE {column} BETWEEN {int(low)} AND {int(high)}) AS dba_sample",
+                    'system')
+        fraction = sample['percent'] / 100.0
+        return f"(SELECT * FROM {table_sql} WHERE RAND({sample['seed']}) < {fraction!r}) AS dba_sample", 'bernoulli'
+
+    def set_statement_timeout(self, pooled, cursor, seconds):
+        # MySQL 5.7.8+; only applies to read-only SELECTs
+        cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (int((seconds or 0) * 1000),))
+
+    def is_statement_timeout(self, error):
+        # ER_QUERY_TIMEOUT: maximum statement execution time exceeded
+        return super().is_statement_timeout(error) or getattr(error, 'errno', None) == 3024
+
+    def prepare_and_execute(self, pooled, cursor, name, params):
+        if pooled is None:
+            return super().prepare_and_execute(pooled, cursor, name, params)
+
+        cursors = pooled.state.setdefault('mysql_prepared', {})
+        prepared_cursor = cursors.get(name)
+        if prepared_cursor is None:
+            prepared_cursor = pooled.raw.cursor(prepared=True)
+            cursors[name] = prepared_cursor
+        prepared_cursor.execute(self.sql(name), params)
+        return prepared_cursor.fetchall()
+
+
+@register_dialect
+class SqlServerDialect(Dialect):
+    """SQL Server via pyodbc.
+
+    pyodbc sends parameterized statements through sp_prepexec and re-uses the
+    prepared handle when the same SQL runs again, so no explicit PREPARE step
+    is needed here.
+    """
+
+    name = "sqlserver"
+    placeholder = "?"
+    # SQL Server 2019+; documented as within 2% at 97% probability
+    approx_distinct = "APPROX_COUNT_DISTINCT({col})"
+    approx_distinct_error = 0.02
+
+    statements = {
+        'catalog_objects': """
+            SELECT TABLE_SCHEMA, TABLE_NAME, 'table'
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_TYPE = 'BASE TABLE'
+            UNION ALL
+            SELECT TABLE_SCHEMA, TABLE_NAME, 'view'
+            FROM INFORMATION_SCHEMA.VIEWS
+        """,
+        'catalog_columns': """
+            SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+            FROM INFORMATION_SCHEMA.COLUMNS
+            ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+        """,
+        'columns': """
+            SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?
+            ORDER BY ORDINAL_POSITION
+        """,
+        'table_creation_date': """
+            SELECT create_date
+            FROM sys.tables t
+            JOIN sys.schemas s ON t.schema_id = s.schema_id
+            WHERE s.name = ? and t.name = ?
+        """,
+        'views_count': "SELECT COUNT(*) FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = 'dbo'",
+        'schemas_count': "SELECT COUNT(*) FROM sys.schemas",
+        'schema_version': """
+            SELECT CONCAT(COUNT(*), '/', CONVERT(varchar(33), MAX(modify_date), 126))
+            FROM sys.objects
+        """,
+        'database_size': """
+            SELECT
+                CAST(SUM(CAST(FILEPROPERTY(name, 'SpaceUsed') AS bigint) * 8192.) / 1024 / 1024 AS DECIMAL(15,2)) as 'DatabaseSizeInMB'
+            FROM sys.database_files
+            WHERE type_desc='ROWS'
+        """,
+        'approx_distinct_available': "SELECT 1 WHERE CAST(SERVERPROPERTY('ProductMajorVersion') AS int) >= 15",
+        # Heap (index_id 0) or clustered index (1) rows; needs VIEW DATABASE STATE
+        'row_estimates': """
+            SELECT s.name, t.name, SUM(ps.row_count)
+            FROM sys.tables t
+            JOIN sys.schemas s ON t.schema_id = s.schema_id
+            JOIN sys.dm_db_partition_stats ps ON ps.object_id = t.object_id AND ps.index_id IN (0, 1)
+            GROUP BY s.name, t.name
+        """,
+        # Same figure from sys.partitions, readable without VIEW DATABASE STATE
+        'row_estimates_fallback': """
+            SELECT s.name, t.name, SUM(p.rows)
+            FROM sys.tables t
+            JOIN sys.schemas s ON t.schema_id = s.schema_id
+            JOIN sys.partitions p ON p.object_id = t.object_id AND p.index_id IN (0, 1)
+            GROUP BY s.name, t.name
+        """,
+        # Rows, last DDL and last write from index usage stats (UPDATEs leave row_count alone;
+        # needs VIEW SERVER STATE, and the usage stats reset with the instance)
+        'table_change_counters': """
+            SELECT s.name, t.name,
+                   CONCAT(SUM(ps.row_count), '|', CONVERT(varchar(33), t.modify_date, 126), '|',
+                          CONVERT(varchar(33), (SELECT MAX(us.last_user_update)
+                                                FROM sys.dm_db_index_usage_stats us
+                                                WHERE us.database_id = DB_ID() AND us.object_id = t.object_id), 126))
+            FROM sys.tables t
+            JOIN sys.schemas s ON t.schema_id = s.schema_id
+            JOIN sys.dm_db_partition_stats ps ON ps.object_id = t.object_id AND ps.index_id IN (0, 1)
+            GROUP BY s.name, t.name, t.object_id, t.modify_date
+        """,
+        # Rows and last DDL only: in-place UPDATEs go unnoticed until row_count or schema moves
+        'table_change_counters_fallback': """
+            SELECT s.name, t.name,
+                   CONCAT(SUM(ps.row_count), '|', CONVERT(varchar(33), t.modify_date, 126))
+            FROM sys.tables t
+            JOIN sys.schemas s ON t.schema_id = s.schema_id
+            JOIN sys.dm_db_partition_stats ps ON ps.object_id = t.object_id AND ps.index_id IN (0, 1)
+            GROUP BY s.name, t.name, t.modify_date
+        """,
+        # Used pages per allocation unit: in-row/overflow data of the heap or
+        # clustered index, nonclustered indexes, and LOB data
+        'table_sizes': """
+            SELECT s.name, t.name,
+                   SUM(CASE WHEN p.index_id IN (0, 1) AND au.type IN (1, 3) THEN au.used_pages ELSE 0 END) * 8192,
+                   SUM(CASE WHEN p.index_id > 1 THEN au.used_pages ELSE 0 END) * 8192,
+                   SUM(CASE WHEN p.index_id IN (0, 1) AND au.type = 2 THEN au.used_pages ELSE 0 END) * 8192,
+                   SUM(au.used_pages) * 8192
+            FROM sys.tables t
+            JOIN sys.schemas s ON t.schema_id = s.schema_id
+            JOIN sys.partitions p ON p.object_id = t.object_id
+            JOIN sys.allocation_units au
+              ON au.container_id = CASE WHEN au.type IN (1, 3) THEN p.hobt_id ELSE p.partition_id END
+            GROUP BY s.name, t.name
+        """,
+        # Key columns in key order, then included columns; size from allocation units
+        'index_columns': """
+            SELECT s.name, t.name, ind.name, c.name,
+                   ROW_NUMBER() OVER (PARTITION BY ind.object_id, ind.index_id
+                                      ORDER BY ic.is_included_column, ic.key_ordinal, ic.index_column_id),
+                   ic.is_included_column,
+                   ind.is_unique,
+                   ind.is_primary_key,
+                   ind.type_desc,
+                   sz.used_pages * 8192
+            FROM sys.indexes ind
+            JOIN sys.tables t ON t.object_id = ind.object_id
+            JOIN sys.schemas s ON s.schema_id = t.schema_id
+            JOIN sys.index_columns ic ON ic.object_id = ind.object_id AND ic.index_id = ind.index_id
+            JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+            LEFT JOIN (
+                SELECT p.object_id, p.index_id, SUM(au.used_pages) AS used_pages
+                FROM sys.partitions p
+                JOIN sys.allocation_units au
+                  ON au.container_id = CASE WHEN au.type IN (1, 3) THEN p.hobt_id ELSE p.partition_id END
+                GROUP BY p.object_id, p.index_id
+            ) sz ON sz.object_id = ind.object_id AND sz.index_id = ind.index_id
+            WHERE t.is_ms_shipped = 0 AND ind.is_hypothetical = 0 AND ind.index_id > 0
+            ORDER BY s.name, t.name, ind.name, 5
+        """,
+        'view_definition': """
+            SELECT m.definition
+            FROM sys.views v
+            JOIN sys.schemas s ON v.schema_id = s.schema_id
+            JOIN sys.sql_modules m ON v.object_id = m.object_id
+            WHERE s.name = ? AND v.name = ?
+        """,
+        'view_definitions': """
+            SELECT s.name, v.name, m.definition
+            FROM sys.views v
+            JOIN sys.schemas s ON v.schema_id = s.schema_id
+            JOIN sys.sql_modules m ON v.object_id = m.object_id
+        """,
+        # Same-database object references of every view; unqualified names resolve to the view's schema
+        'view_dependencies': """
+            SELECT DISTINCT s.name AS view_schema, v.name AS view_name,
+                   COALESCE(OBJECT_SCHEMA_NAME(d.referenced_id), d.referenced_schema_name, s.name) AS ref_schema,
+                   d.referenced_entity_name AS ref_name,
+                   CASE ro.type WHEN 'U' THEN 'table' WHEN 'V' THEN 'view'
+                                ELSE LOWER(ro.type_desc) END AS ref_kind
+            FROM sys.sql_expression_dependencies d
+            JOIN sys.views v ON v.object_id = d.referencing_id
+            JOIN sys.schemas s ON s.schema_id = v.schema_id
+            LEFT JOIN sys.objects ro ON ro.object_id = d.referenced_id
+            WHERE d.referencing_class = 1
+              AND d.referenced_class = 1
+              AND d.referenced_database_name IS NULL
+        """,
+        'is_view': "SELECT 1 FROM INFORMATION_SCHEMA.VIEWS WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ?",
+        # Histogram of the newest statistics object led by each column (2016 SP1 CU2+). Step
+        # counts are scaled to the rows at the time of the update; the NULL step has a NULL key
+        'optimizer_column_stats': """
+            WITH leading_stats AS (
+                SELECT st.object_id, st.stats_id, c.name AS column_name,
+                       ROW_NUMBER() OVER (PARTITION BY sc.column_id ORDER BY sp.last_updated DESC) AS pick
+                FROM sys.stats st
+                JOIN sys.stats_columns sc
+                  ON sc.object_id = st.object_id AND sc.stats_id = st.stats_id AND sc.stats_column_id = 1
+                JOIN sys.columns c ON c.object_id = sc.object_id AND c.column_id = sc.column_id
+                CROSS APPLY sys.dm_db_stats_properties(st.object_id, st.stats_id) sp
+                WHERE st.object_id = OBJECT_ID(QUOTENAME(?) + '.' + QUOTENAME(?))
+            )
+            SELECT l.column_name,
+                   SUM(h.equal_rows + h.range_rows),
+                   SUM(CASE WHEN h.range_high_key IS NULL THEN h.equal_rows ELSE 0 END),
+                   SUM(h.distinct_range_rows) + SUM(CASE WHEN h.range_high_key IS NULL THEN 0 ELSE 1 END),
+                   SUM(CASE WHEN CONVERT(nvarchar(4000), h.range_high_key) = N'' THEN h.equal_rows ELSE 0 END)
+            FROM leading_stats l
+            CROSS APPLY sys.dm_db_stats_histogram(l.object_id, l.stats_id) h
+            WHERE l.pick = 1
+            GROUP BY l.column_name
+        """,
+    }
+
+    # One view's edges, for incremental lineage updates
+    statements['view_dependencies_of'] = (
+        "SELECT * FROM (" + statements['view_dependencies'] + ") deps"
+        " WHERE deps.view_schema = ? AND deps.view_name = ?"
+    )
+
+    def quote_ident(self, identifier: str) -> str:
+        return '[' + identifier.replace(']', ']]') + ']'
+
+    # CONVERT styles with a lossless text form where the default is lossy (float, money, dates) or unusable (binary)
+    _HASH_STYLES = {
+        'binary': 1, 'varbinary': 1, 'image': 1, 'timestamp': 1, 'rowversion': 1,
+        'date': 126, 'time': 126, 'datetime': 126, 'datetime2': 126, 'smalldatetime': 126, 'datetimeoffset': 126,
+        'float': 3, 'real': 3, 'money': 2, 'smallmoney': 2,
+    }
+
+    def row_hash(self, columns):
+        # HASHBYTES takes any length from SQL Server 2016; each value hashes as "<bytes>:<text>" (N for NULL)
+        parts = []
+        for column in columns:
+            col = self.quote_ident(column['name'])
+            lowered = (column['type'] or '').lower()
+            style = self._HASH_STYLES.get(lowered)
+            if style == 1:
+                text = f"CONVERT(nvarchar(max), CONVERT(varbinary(max), {col}), 1)"
+            elif style is not None:
+                text = f"CONVERT(nvarchar(64), {col}, {style})"
+            elif lowered in ('geometry', 'geography', 'hierarchyid'):
+                text = f"{col}.ToString()"
+            else:
+                text = f"CONVERT(nvarchar(max), {col})"
+            parts.append(f"CASE WHEN {col} IS NULL THEN N'N' ELSE CONCAT(DATALENGTH({text}), N':', {text}) END")
+        joined = " + N',' + ".join(parts)
+        return f"CONVERT(char(64), HASHBYTES('SHA2_256', {joined}), 2)"
+
+    def paginate(self, sql, limit, offset=0):
+        return f"{sql} OFFSET {int(offset)} ROWS FETCH NEXT {int(limit)} ROWS ONLY"
+
+    def sample_source(self, table_sql, sample, key_range=None):
+        # SQL Server only samples whole pages; BERNOULLI has no equivalent
+        return f"{table_sql} TABLESAMPLE SYSTEM ({sample['percent']!r} PERCENT) REPEATABLE ({sample['seed']})", 'system'
+
+    def set_statement_timeout(self, pooled, cursor, seconds):
+        # No session setting exists; pyodbc applies a per-connection query timeout
+        if pooled is not None:
+            pooled.raw.timeout = max(1, int(seconds)) if seconds else 0
+
+    def is_statement_timeout(self, error):
+        # SQLSTATE HYT00: query timeout expired
+        return (super().is_statement_timeout(error)
+                or bool(getattr(error, 'args', None)) and error.args[0] == 'HYT00')
@@ -0,0 +1,144 @@
+import json
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+from crawler import TableCrawler
+from profiler import STREAM_BATCH_ROWS, stream_batches
+from sketches import CountMinSketch, MisraGries
+
+TOP_K = 10
+# Misra-Gries counters kept per column for each value reported
+CANDIDATES_PER_VALUE = 10
+# Count-Min shape: e/2048 (0.13%) of the rows at 1 - e**-5 (99.3%) confidence
+COUNT_MIN_WIDTH = 2048
+COUNT_MIN_DEPTH = 5
+
+
+def _hashable(value: Any) -> Any:
+    # psycopg2 returns json/jsonb as dict or list and arrays as list: count their canonical JSON text
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    if isinstance(value, (memoryview, bytearray)):
+        return bytes(value)
+    return value
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    return value
+
+
+class ColumnFrequencies:
+    """Most frequent values of one column from a Misra-Gries summary and a Count-Min sketch.
+
+    Misra-Gries picks the candidates and gives each a guaranteed lower
+    bound; the Count-Min sketch (also bounded by the Misra-Gries error)
+    gives the upper bound. Both are fixed-size and mergeable, so partial
+    results from partitions or parallel workers combine with merge().
+    """
+
+    def __init__(self, column: Dict, top_k: int = TOP_K):
+        self.column = column
+        self.top_k = top_k
+        self.nulls = 0
+        self.summary = MisraGries(max(100, top_k * CANDIDATES_PER_VALUE))
+        self.sketch = CountMinSketch(COUNT_MIN_WIDTH, COUNT_MIN_DEPTH)
+
+    def update(self, values: Sequence):
+        """Fold in this column's values from one fetched batch."""
+        counts = Counter(map(_hashable, values))
+        self.nulls += counts.pop(None, 0)
+        self.summary.update_counts(counts)
+        self.sketch.update_counts(counts)
+
+    def merge(self, other: "ColumnFrequencies"):
+        self.nulls += other.nulls
+        self.summary.merge(other.summary)
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> Dict:
+        summary = self.summary
+        candidates = []
+        for value, lower in summary.top(summary.capacity):
+            upper = min(lower + summary.error, self.sketch.estimate(value))
+            candidates.append((value, lower, upper))
+        candidates.sort(key=lambda candidate: (-candidate[2], -candidate[1]))
+        listed, rest = candidates[:self.top_k], candidates[self.top_k:]
+        # No value outside the list can be more frequent than this
+        outside = max([summary.error] + [upper for _, _, upper in rest])
+        total = summary.total
+        return {
+            'name': self.column['name'],
+            'type': self.column['type'],
+            'nullable': self.column['nullable'],
+            'null_count': self.nulls,
+            'non_null_count': total,
+            'top_values': [{
+                'value': _json_value(value),
+                # The true count lies in [lower_bound, upper_bound]
+                'lower_bound': lower,
+                'upper_bound': upper,
+                # Largest share of the non-NULL rows the value can have
+                'max_fraction': upper / total if total else 0.0,
+                # Certainly among the top_k most frequent values
+                'guaranteed': lower >= outside,
+            } for value, lower, upper in listed],
+            # Any count is off by at most this many rows
+            'count_error': min(summary.error, int(self.sketch.error_bound)),
+            'count_error_confidence': self.sketch.confidence,
+        }
+
+
+class FrequencyProfiler:
+    """Top-k values per column from streamed scans, in bounded memory.
+
+    Each source (the table, a sample, or one key-range partition of it) is
+    read through the dialect's server-side cursor in batches of
+    ``batch_rows``; every batch is counted once and folded into each
+    column's sketches. Several sources are scanned in parallel on pooled
+    connections and their sketches merged.
+    """
+
+    def __init__(self, analyzer, top_k: int = TOP_K, batch_rows: int = STREAM_BATCH_ROWS):
+        self.analyzer = analyzer
+        self.top_k = max(1, top_k)
+        self.batch_rows = max(1, batch_rows)
+
+    def scan(self, source: str, columns: List[Dict]) -> Dict:
+        """Sketches for one FROM item on the current connection: {'columns', 'row_count', 'batches'}."""
+        select_list = ", ".join(self.analyzer.dialect.quote_ident(column['name']) for column in columns)
+        frequencies = [ColumnFrequencies(column, self.top_k) for column in columns]
+        row_count = 0
+        batches = 0
+        for rows in stream_batches(self.analyzer, f"SELECT {select_list} FROM {source}", self.batch_rows):
+            row_count += len(rows)
+            batches += 1
+            for column_frequencies, values in zip(frequencies, zip(*rows)):
+                column_frequencies.update(values)
+        return {'columns': frequencies, 'row_count': row_count, 'batches': batches}
+
+    def profile(self, sources: List[str], columns: List[Dict]) -> Dict:
+        """Merged top-k values over every source: {'row_count', 'columns', 'batches', 'partitions'}."""
+        if len(sources) == 1:
+            parts = [self.scan(sources[0], columns)]
+        else:
+            analyzer = self.analyzer
+            crawler = TableCrawler(analyzer, analyzer.crawl_concurrency, analyzer.crawl_timeout)
+            results = crawler.run([(index, None) for index in range(len(sources))],
+                                  lambda index: self.scan(sources[index], columns))
+            failed = next((result.error for result in results.values() if not result.ok), None)
+            if failed is not None:
+                raise failed
+            parts = [results[index].value for index in range(len(sources))]
+
+        merged = parts[0]['columns']
+        for part in parts[1:]:
+            for column_frequencies, other in zip(merged, part['columns']):
+                column_frequencies.merge(other)
+        return {
+            'row_count': sum(part['row_count'] for part in parts),
+            'columns': [column_frequencies.to_dict() for column_frequencies in merged],
+            'batches': sum(part['batches'] for part in parts),
+            'partitions': len(parts),
+        }
@@ -4,6 +4,15 @@ const api = axios.create({
   baseURL: '/api',
 })
 
+const SESSION_KEY = 'dbAnalyzerSession'
+
+// Every request after /connect identifies its database session by token
+api.interceptors.request.use((config) => {
+  const sessionId = localStorage.getItem(SESSION_KEY)
+  if (sessionId) config.headers.set('X-Session-Id', sessionId)
+  return config
+})
+
 export type ConnectPayload = {
   db_type: 'postgresql' | 'mysql' | 'sqlserver'
   host?: string
@@ -17,7 +26,17 @@ export type ConnectPayload = {
 
 export async function apiConnect(payload: ConnectPayload) {
   const { data } = await api.post('/connect', payload)
-  return data as { status: string; db_type: string }
+  const res = data as { status: string; db_type: string; session_id: string }
+  localStorage.setItem(SESSION_KEY, res.session_id)
+  return res
+}
+
+export async function apiDisconnect() {
+  try {
+    await api.post('/disconnect')
+  } finally {
+    localStorage.removeItem(SESSION_KEY)
+  }
 }
 
 export async function apiOverview() {
@@ -46,14 +65,304 @@ export async function apiTableDetails(schema: string, table: string) {
   return data as {
     schema: string
     table: string
-    row_count: number
+    row_count: number | null
+    row_count_estimated: boolean
     columns: { name: string; type: string; nullable: string; default: string | null }[]
     estimated_size?: string | null
+    size_bytes?: { data: number | null; index: number | null; toast: number | null; total: number | null } | null
   }
 }
 
+export type IndexInfo = {
+  schema: string
+  table: string
+  index_name: string
+  columns: string[]
+  include_columns: string[]
+  is_unique: boolean
+  is_primary: boolean
+  index_type: string
+  size_bytes: number | null
+}
+
 export async function apiTableIndexes(schema: string, table: string) {
   const { data } = await api.post('/table/indexes', { schema, table })
-  return data as { schema: string; table: string; indexes: any[] }
+  return data as { schema: string; table: string; indexes: IndexInfo[] }
+}
+
+export type ColumnProfile = {
+  name: string
+  type: string
+  nullable: string
+  null_count?: number
+  empty_count?: number
+  distinct_count?: number
+  null_pct?: number
+  empty_pct?: number
+  distinct_pct?: number
+  distinct_approximate?: boolean
+  distinct_error?: number
+  // Sampled profiles only: 95% confidence intervals (percent)
+  null_rate_ci?: [number, number]
+  empty_rate_ci?: [number, number]
+  // 'stats' mode: whether the figures came from optimizer statistics or a scan
+  source?: 'statistics' | 'scan'
+  status?: 'ok' | 'warning'
+  notes?: string[]
+  error?: string
+}
+
+export type SampleInfo = {
+  method: 'system' | 'bernoulli'
+  // Rows drawn independently; only then are the *_rate_ci and estimated_duplicate_pairs fields reported
+  row_level: boolean
+  percent: number
+  seed: number
+  rows: number
+  estimated_total_rows: number
+}
+
+export type TableProfile = {
+  schema: string
+  table: string
+  row_count: number | null
+  mode: 'exact' | 'approximate' | 'stats'
+  columns: ColumnProfile[]
+  scanned_columns?: string[]
+  queries: number
+  sample?: SampleInfo
+  // true when served from the stored profile because the table is unchanged
+  cached: boolean
+  profiled_at: number
+  change_fingerprint: string | null
+}
+
+export type SampleOptions = {
+  sample_percent: number
+  sample_method?: 'system' | 'bernoulli'
+  sample_seed?: number
+}
+
+export async function apiTableProfile(schema: string, table: string, mode: 'exact' | 'approximate' | 'auto' | 'stats' = 'auto',
+                                      sample?: SampleOptions, refresh = false) {
+  const { data } = await api.post('/table/profile', { schema, table, mode, refresh, ...sample })
+  return data as TableProfile
+}
+
+export type ValueSummary = { min: number | null; max: number | null; mean: number | null; stddev: number | null }
+
+export type ColumnStatistics = {
+  name: string
+  type: string
+  nullable: string
+  kind: 'numeric' | 'string' | 'other'
+  null_count: number
+  non_null_count: number
+  // numeric columns
+  min?: number | null
+  max?: number | null
+  mean?: number | null
+  stddev?: number | null
+  quantiles?: Record<string, number | null>
+  histogram?: { edges: number[]; counts: number[] } | null
+  // string columns: [length, count] pairs up to 255 characters
+  length?: ValueSummary
+  length_counts?: [number, number][]
+  longer_than_tracked?: number
+}
+
+export type TableStatistics = {
+  schema: string
+  table: string
+  row_count: number
+  batches: number
+  columns: ColumnStatistics[]
+  sample?: SampleInfo
+}
+
+export async function apiTableStatistics(schema: string, table: string, bins = 20, sample?: SampleOptions) {
+  const { data } = await api.post('/table/statistics', { schema, table, bins, ...sample })
+  return data as TableStatistics
+}
+
+export type FrequentValue = {
+  value: unknown
+  // The true count lies in [lower_bound, upper_bound]
+  lower_bound: number
+  upper_bound: number
+  max_fraction: number
+  // Certainly among the top_k most frequent values
+  guaranteed: boolean
+}
+
+export type ColumnFrequencies = {
+  name: string
+  type: string
+  nullable: string
+  null_count: number
+  non_null_count: number
+  top_values: FrequentValue[]
+  count_error: number
+  count_error_confidence: number
+}
+
+export type TableFrequencies = {
+  schema: string
+  table: string
+  top_k: number
+  row_count: number
+  batches: number
+  partitions: number
+  columns: ColumnFrequencies[]
+  sample?: SampleInfo
+}
+
+export async function apiTableFrequencies(schema: string, table: string, top_k = 10,
+  options: { columns?: string[]; partitions?: number } = {}, sample?: SampleOptions) {
+  const { data } = await api.post('/table/frequencies', { schema, table, top_k, ...options, ...sample })
+  return data as TableFrequencies
+}
+
+export type DuplicateGroups = {
+  schema: string
+  table: string
+  columns: string[]
+  total_groups: number
+  // Copies beyond the first in every group
+  duplicate_rows: number
+  duplicate_pairs: number
+  limit: number
+  offset: number
+  groups: { row_hash: string; count: number }[]
+  // First page only
+  rows_scanned?: number
+  duplicate_rate?: number
+  duplicate_rate_ci?: [number, number]
+  sample?: SampleInfo
+  estimated_duplicate_pairs?: number
+}
+
+export async function apiTableDuplicates(schema: string, table: string,
+  options: { columns?: string[]; limit?: number; offset?: number } = {}, sample?: SampleOptions) {
+  const { data } = await api.post('/table/duplicates', { schema, table, ...options, ...sample })
+  return data as DuplicateGroups
 }
 
+export async function apiDuplicateRows(schema: string, table: string, row_hash: string,
+  options: { columns?: string[]; limit?: number; offset?: number } = {}) {
+  const { data } = await api.post('/table/duplicates/rows', { schema, table, row_hash, ...options })
+  return data as { row_hash: string; limit: number; offset: number; rows: Record<string, unknown>[] }
+}
+
+export type ProfileMode = 'exact' | 'approximate' | 'auto' | 'stats'
+
+export type QualityWarning = { column: string; message: string }
+
+export type ColumnQuality = {
+  name: string
+  type: string
+  nullable: string
+  status: 'ok' | 'warning' | 'error'
+  warnings: string[]
+  metrics?: Pick<ColumnProfile, 'null_count' | 'null_pct' | 'empty_count' | 'empty_pct' | 'distinct_count'
+    | 'distinct_pct' | 'distinct_approximate' | 'distinct_error' | 'null_rate_ci' | 'empty_rate_ci' | 'source'>
+  error?: string
+}
+
+export type TableQuality = {
+  schema: string
+  table: string
+  status: 'ok' | 'warning' | 'error'
+  row_count?: number
+  mode?: 'exact' | 'approximate' | 'stats'
+  cached?: boolean
+  profiled_at?: number
+  sample?: SampleInfo
+  scanned_columns?: string[]
+  columns?: ColumnQuality[]
+  warnings?: QualityWarning[]
+  issues?: string[]
+  // Set when the table could not be analyzed (bulk /quality only)
+  error?: string
+  timed_out?: boolean
+}
+
+export async function apiTableQuality(schema: string, table: string, mode: ProfileMode = 'auto',
+  sample?: SampleOptions, refresh = false, timeout?: number) {
+  const { data } = await api.post('/table/quality', { schema, table, mode, ...sample, refresh, timeout })
+  return data as TableQuality
+}
+
+export async function apiQuality(tables?: { schema: string; table: string }[], mode: ProfileMode = 'auto',
+  options: { sample_percent?: number; sample_method?: 'system' | 'bernoulli'; refresh?: boolean; timeout?: number } = {}) {
+  const { data } = await api.post('/quality', { tables, mode, ...options })
+  return data as TableQuality[]
+}
+
+export async function apiIndexes(schema?: string) {
+  const { data } = await api.get('/indexes', { params: schema ? { schema } : {} })
+  return data as { schema: string | null; count: number; indexes: IndexInfo[] }
+}
+
+
+export type ColumnSearchMode = 'exact' | 'prefix' | 'substring' | 'fuzzy' | 'auto'
+
+export async function apiColumnSearch(column_name: string, mode: ColumnSearchMode = 'auto', limit = 50, offset = 0) {
+  const { data } = await api.post('/column/search', { column_name, mode, limit, offset })
+  return data as {
+    column: string
+    mode: ColumnSearchMode
+    total: number
+    limit: number
+    offset: number
+    tables: { schema: string; table: string; column: string; data_type: string; match: string; distance: number }[]
+  }
+}
+
+export type LineageGraph = {
+  root?: string
+  nodes: { id: string; schema: string; name: string; kind: string; source: string | null }[]
+  edges: { source: string; target: string }[]
+}
+
+export async function apiLineage(schema?: string, view?: string, max_depth = 10) {
+  const { data } = await api.get('/lineage', { params: view ? { schema, view, max_depth } : {} })
+  return data as LineageGraph
+}
+
+export type LineageNode = { id: string; schema: string; name: string; kind: string }
+
+export type LineageImpact = {
+  schema: string
+  name: string
+  kind: string | null
+  downstream: { count: number; layers: LineageNode[][] }
+  upstream: { count: number; layers: LineageNode[][] }
+  cycles: string[][]
+}
+
+export async function apiLineageImpact(schema: string, name: string, max_depth?: number) {
+  const { data } = await api.get('/lineage/impact', { params: { schema, name, max_depth } })
+  return data as LineageImpact
+}
+
+export async function apiLineageCycles() {
+  const { data } = await api.get('/lineage/cycles')
+  return data as { count: number; cycles: string[][] }
+}
+
+export async function apiLineageRefresh(schema: string, view: string) {
+  const { data } = await api.post('/lineage/refresh', { schema, view })
+  return data as { schema: string; view: string; exists: boolean; dependencies: string[]; edge_count: number }
+}
+
+export type ViewHierarchy = Omit<LineageGraph, 'nodes'> & {
+  nodes: { id: string; schema: string; name: string; kind: string; source: string | null; depth: number }[]
+  hash: string
+  render?: { format: string; status: string; url: string }
+}
+
+export async function apiViewHierarchy(schema: string, view: string, max_depth = 10, render?: 'svg' | 'png') {
+  const { data } = await api.post('/view/hierarchy', { schema, view, max_depth, render })
+  return data as ViewHierarchy
+}
@@ -1,8 +1,8 @@
 import { useEffect, useMemo, useState } from 'react'
-import { Alert, Box, Card, CardContent, CircularProgress, Dialog, DialogContent, DialogTitle, IconButton, InputAdornment, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, TextField, Typography } from '@mui/material'
+import { Alert, Box, Button, Card, CardContent, CircularProgress, Dialog, DialogContent, DialogTitle, IconButton, InputAdornment, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, TextField, Typography } from '@mui/material'
 import SearchIcon from '@mui/icons-material/Search'
 import InfoIcon from '@mui/icons-material/Info'
-import { apiTableDetails, apiTableIndexes, apiTables } from '../lib/api'
+import { apiTableDetails, apiTableIndexes, apiTableProfile, apiTables, TableProfile } from '../lib/api'
 
 type TableRowItem = { schema: string; table: string }
 
@@ -14,6 +14,8 @@ export default function TablesPage() {
   const [selected, setSelected] = useState<TableRowItem | null>(null)
   const [details, setDetails] = useState<any | null>(null)
   const [indexes, setIndexes] = useState<any[] | null>(null)
+  const [profile, setProfile] = useState<TableProfile | null>(null)
+  const [profiling, setProfiling] = useState(false)
 
   useEffect(() => {
     (async () => {
@@ -39,6 +41,7 @@ export default function TablesPage() {
     setSelected(row)
     setDetails(null)
     setIndexes(null)
+    setProfile(null)
     try {
       const [d, i] = await Promise.all([
         apiTableDetails(row.schema, row.table),
@@ -51,6 +54,24 @@ export default function TablesPage() {
     }
   }
 
+  // Sample percent reading ~100k rows, offered for tables over 1M rows
+  const samplePercent = details?.row_count > 1000000
+    ? Math.max(0.01, Math.min(100, Number((1e7 / details.row_count).toFixed(4))))
+    : null
+
+  const runProfile = async (sample_percent?: number, mode: 'auto' | 'stats' = 'auto') => {
+    if (!selected) return
+    setProfiling(true)
+    try {
+      const sample = sample_percent ? { sample_percent } : undefined
+      setProfile(await apiTableProfile(selected.schema, selected.table, mode, sample))
+    } catch (err: any) {
+      setError(err?.response?.data?.detail ?? err.message)
+    } finally {
+      setProfiling(false)
+    }
+  }
+
   return (
     <Box sx={{ display: 'grid', gap: 2 }}>
       <TextField
@@ -100,8 +121,17 @@ export default function TablesPage() {
             <CircularProgress />
           ) : (
             <Box sx={{ display: 'grid', gap: 2 }}>
-              <Typography variant="subtitle1">Rows: {details.row_count?.toLocaleString?.() ?? details.row_count}</Typography>
+              <Typography variant="subtitle1">
+                Rows: {details.row_count?.toLocaleString?.() ?? 'N/A'}
+                {details.row_count_estimated ? ' (est.)' : ''}
+              </Typography>
               <Typography variant="subtitle1">Estimated Size: {details.estimated_size ?? 'N/A'}</Typography>
+              {details.size_bytes && (
+                <Typography variant="body2" color="text.secondary">
+                  Data {details.size_bytes.data?.toLocaleString() ?? 'N/A'} B · Indexes {details.size_bytes.index?.toLocaleString() ?? 'N/A'} B
+                  {details.size_bytes.toast != null ? ` · TOAST/LOB ${details.size_bytes.toast.toLocaleString()} B` : ''}
+                </Typography>
+              )}
               <Typography variant="h6">Columns</Typography>
               <Table size="small">
                 <TableHead>
@@ -134,20 +164,90 @@ export default function TablesPage() {
                       <TableCell>Unique</TableCell>
                       <TableCell>Primary</TableCell>
                       <TableCell>Type</TableCell>
+                      <TableCell>Size</TableCell>
                     </TableRow>
                   </TableHead>
                   <TableBody>
                     {indexes.map((ix: any, idx: number) => (
                       <TableRow key={idx}>
                         <TableCell>{ix.index_name ?? ix.index}</TableCell>
-                        <TableCell>{ix.columns ?? ix.column}</TableCell>
+                        <TableCell>
+                          {Array.isArray(ix.columns) ? ix.columns.join(', ') : ix.columns}
+                          {ix.include_columns?.length ? ` INCLUDE (${ix.include_columns.join(', ')})` : ''}
+                        </TableCell>
                         <TableCell>{String(ix.is_unique ?? false)}</TableCell>
                         <TableCell>{String(ix.is_primary ?? false)}</TableCell>
                         <TableCell>{ix.index_type}</TableCell>
+                        <TableCell>{ix.size_bytes != null ? `${ix.size_bytes.toLocaleString()} B` : 'N/A'}</TableCell>
+                      </TableRow>
+                    ))}
+                  </TableBody>
+                </Table>
+              )}
+
+              <Typography variant="h6" sx={{ mt: 2 }}>Data Quality</Typography>
+              {!profile ? (
+                <Box sx={{ display: 'flex', gap: 1 }}>
+                  <Button variant="outlined" onClick={() => runProfile()} disabled={profiling}>
+                    {profiling ? 'Profiling...' : 'Profile columns'}
+                  </Button>
+                  <Button variant="outlined" onClick={() => runProfile(undefined, 'stats')} disabled={profiling}>
+                    From statistics
+                  </Button>
+                  {samplePercent && (
+                    <Button variant="outlined" onClick={() => runProfile(samplePercent)} disabled={profiling}>
+                      Profile {samplePercent}% sample
+                    </Button>
+                  )}
+                </Box>
+              ) : (
+                <>
+                {profile.cached && (
+                  <Typography variant="body2" color="text.secondary">
+                    Unchanged since {new Date(profile.profiled_at * 1000).toLocaleString()}; stored profile shown
+                  </Typography>
+                )}
+                {profile.mode === 'stats' && (
+                  <Typography variant="body2" color="text.secondary">
+                    Estimated from optimizer statistics
+                    {profile.scanned_columns?.length ? `; scanned ${profile.scanned_columns.join(', ')}` : ''}
+                  </Typography>
+                )}
+                {profile.sample && (
+                  <Typography variant="body2" color="text.secondary">
+                    {profile.sample.method.toUpperCase()} sample of {profile.sample.percent}%:{' '}
+                    {profile.sample.rows.toLocaleString()} rows; counts describe the sample
+                  </Typography>
+                )}
+                <Table size="small">
+                  <TableHead>
+                    <TableRow>
+                      <TableCell>Column</TableCell>
+                      <TableCell align="right">NULLs</TableCell>
+                      <TableCell align="right">Empty</TableCell>
+                      <TableCell align="right">Distinct</TableCell>
+                      <TableCell>Notes</TableCell>
+                    </TableRow>
+                  </TableHead>
+                  <TableBody>
+                    {profile.columns.map((c) => (
+                      <TableRow key={c.name} sx={c.status === 'warning' || c.error ? { bgcolor: '#fff3f3' } : undefined}>
+                        <TableCell>{c.name}</TableCell>
+                        <TableCell align="right">
+                          {c.null_count?.toLocaleString() ?? ''}
+                          {c.null_rate_ci ? ` (${c.null_rate_ci[0].toFixed(1)}-${c.null_rate_ci[1].toFixed(1)}%)` : ''}
+                        </TableCell>
+                        <TableCell align="right">{c.empty_count?.toLocaleString() ?? ''}</TableCell>
+                        <TableCell align="right">
+                          {c.distinct_approximate ? '~' : ''}{c.distinct_count?.toLocaleString() ?? ''}
+                          {c.distinct_approximate && c.distinct_error ? ` ±${(c.distinct_error * 100).toFixed(1)}%` : ''}
+                        </TableCell>
+                        <TableCell>{c.error ?? c.notes?.join('; ')}</TableCell>
                       </TableRow>
                     ))}
                   </TableBody>
                 </Table>
+                </>
               )}
             </Box>
           )}
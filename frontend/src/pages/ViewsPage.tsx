@@ -1,15 +1,78 @@
 import { useEffect, useMemo, useState } from 'react'
-import { Alert, Box, Card, CardContent, CircularProgress, InputAdornment, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, TextField, Typography } from '@mui/material'
+import { Alert, Box, Card, CardContent, CircularProgress, Dialog, DialogContent, DialogTitle, IconButton, InputAdornment, Table, TableBody, TableCell, TableContainer, TableHead, TableRow, TextField, Typography } from '@mui/material'
 import SearchIcon from '@mui/icons-material/Search'
-import { apiViews } from '../lib/api'
+import AccountTreeIcon from '@mui/icons-material/AccountTree'
+import { apiLineageImpact, apiViewHierarchy, apiViews, LineageImpact, LineageNode, ViewHierarchy } from '../lib/api'
 
 type ViewRow = { schema: string; view: string }
 
+function ImpactLayers({ title, layers, count }: { title: string; layers: LineageNode[][]; count: number }) {
+  return (
+    <Box>
+      <Typography variant="h6">{title} ({count})</Typography>
+      {layers.length === 0 ? (
+        <Typography variant="body2" color="text.secondary">None</Typography>
+      ) : (
+        <Table size="small">
+          <TableHead>
+            <TableRow>
+              <TableCell>Depth</TableCell>
+              <TableCell>Objects</TableCell>
+            </TableRow>
+          </TableHead>
+          <TableBody>
+            {layers.map((layer, depth) => (
+              <TableRow key={depth}>
+                <TableCell>{depth + 1}</TableCell>
+                <TableCell>{layer.map((n) => `${n.id}${n.kind !== 'view' ? ` (${n.kind})` : ''}`).join(', ')}</TableCell>
+              </TableRow>
+            ))}
+          </TableBody>
+        </Table>
+      )}
+    </Box>
+  )
+}
+
+// Layered drawing: one column per depth, dependencies to the right of their views
+function HierarchyGraph({ graph }: { graph: ViewHierarchy }) {
+  const colWidth = 220
+  const rowHeight = 36
+  const columns: string[][] = []
+  graph.nodes.forEach((n) => { (columns[n.depth] ??= []).push(n.id) })
+  const pos: Record<string, { x: number; y: number }> = {}
+  columns.forEach((ids, depth) => ids.forEach((id, i) => { pos[id] = { x: depth * colWidth + 10, y: i * rowHeight + 10 } }))
+  const width = Math.max(1, columns.length) * colWidth
+  const height = Math.max(...columns.map((c) => c.length), 1) * rowHeight + 10
+  const kinds = Object.fromEntries(graph.nodes.map((n) => [n.id, n.kind]))
+
+  return (
+    <Box sx={{ overflow: 'auto' }}>
+      <svg width={width} height={height}>
+        {graph.edges.map((e) => (
+          <line key={`${e.source}->${e.target}`} x1={pos[e.source].x + 180} y1={pos[e.source].y + 12}
+                x2={pos[e.target].x} y2={pos[e.target].y + 12} stroke="#999" />
+        ))}
+        {Object.entries(pos).map(([id, p]) => (
+          <g key={id}>
+            <rect x={p.x} y={p.y} width={180} height={24} rx={4}
+                  fill={kinds[id] === 'view' ? '#e3f2fd' : '#f5f5f5'} stroke="#90a4ae" />
+            <text x={p.x + 6} y={p.y + 16} fontSize={11}>{id.length > 28 ? `${id.slice(0, 27)}…` : id}</text>
+          </g>
+        ))}
+      </svg>
+    </Box>
+  )
+}
+
 export default function ViewsPage() {
   const [views, setViews] = useState<ViewRow[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [query, setQuery] = useState('')
+  const [selected, setSelected] = useState<ViewRow | null>(null)
+  const [impact, setImpact] = useState<LineageImpact | null>(null)
+  const [hierarchy, setHierarchy] = useState<ViewHierarchy | null>(null)
 
   useEffect(() => {
     (async () => {
@@ -31,6 +94,22 @@ export default function ViewsPage() {
     return views.filter((v) => `${v.schema}.${v.view}`.toLowerCase().includes(q))
   }, [views, query])
 
+  const openImpact = async (row: ViewRow) => {
+    setSelected(row)
+    setImpact(null)
+    setHierarchy(null)
+    try {
+      const [i, h] = await Promise.all([
+        apiLineageImpact(row.schema, row.view),
+        apiViewHierarchy(row.schema, row.view),
+      ])
+      setImpact(i)
+      setHierarchy(h)
+    } catch (err: any) {
+      setError(err?.response?.data?.detail ?? err.message)
+    }
+  }
+
   return (
     <Box sx={{ display: 'grid', gap: 2 }}>
       <TextField
@@ -53,6 +132,7 @@ export default function ViewsPage() {
                   <TableRow>
                     <TableCell>Schema</TableCell>
                     <TableCell>View</TableCell>
+                    <TableCell align="right">Impact</TableCell>
                   </TableRow>
                 </TableHead>
                 <TableBody>
@@ -60,6 +140,9 @@ export default function ViewsPage() {
                     <TableRow key={`${row.schema}.${row.view}`} hover>
                       <TableCell>{row.schema}</TableCell>
                       <TableCell>{row.view}</TableCell>
+                      <TableCell align="right">
+                        <IconButton onClick={() => openImpact(row)} aria-label="impact"><AccountTreeIcon/></IconButton>
+                      </TableCell>
                     </TableRow>
                   ))}
                 </TableBody>
@@ -68,7 +151,31 @@ export default function ViewsPage() {
           </CardContent>
         </Card>
       )}
+
+      <Dialog open={!!selected} onClose={() => setSelected(null)} maxWidth="md" fullWidth>
+        <DialogTitle>{selected ? `${selected.schema}.${selected.view}` : ''}</DialogTitle>
+        <DialogContent dividers>
+          {!impact ? (
+            <CircularProgress />
+          ) : (
+            <Box sx={{ display: 'grid', gap: 2 }}>
+              {impact.cycles.length > 0 && (
+                <Alert severity="warning">
+                  Circular dependencies: {impact.cycles.map((c) => c.join(' → ')).join('; ')}
+                </Alert>
+              )}
+              <ImpactLayers title="Downstream (affected by changes)" layers={impact.downstream.layers} count={impact.downstream.count} />
+              <ImpactLayers title="Upstream (reads from)" layers={impact.upstream.layers} count={impact.upstream.count} />
+              {hierarchy && (
+                <Box>
+                  <Typography variant="h6">Hierarchy</Typography>
+                  <HierarchyGraph graph={hierarchy} />
+                </Box>
+              )}
+            </Box>
+          )}
+        </DialogContent>
+      </Dialog>
     </Box>
   )
 }
-
@@ -0,0 +1,147 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from catalog_store import default_cache_dir
+
+RENDER_FORMATS = ("svg", "png")
+
+
+def graph_hash(graph: Dict) -> str:
+    """Content hash of a {'nodes', 'edges'} graph; equal graphs render identically."""
+    canonical = {
+        'nodes': sorted(node['id'] for node in graph['nodes']),
+        'edges': sorted((edge['source'], edge['target']) for edge in graph['edges']),
+    }
+    return hashlib.sha256(json.dumps(canonical, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def render_graph(graph: Dict, output_format: str = "png") -> bytes:
+    """Render a {'nodes', 'edges'} graph to SVG/PNG bytes.
+
+    Uses graphviz if available; fallback to networkx+matplotlib. Top-level so
+    it can run in a worker process.
+    """
+    nodes = [node['id'] for node in graph['nodes']]
+    edges = [(edge['source'], edge['target']) for edge in graph['edges']]
+
+    try:
+        from graphviz import Digraph
+        dot = Digraph(comment=f"Dependency graph for {graph.get('root') or ''}")
+        for n in nodes:
+            dot.node(n, n)
+        for a, b in edges:
+            dot.edge(a, b)
+        return dot.pipe(format=output_format)
+    except Exception:
+        # graphviz package or binary missing, or render failed
+        pass
+
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        import networkx as nx
+    except Exception as e:
+        raise RuntimeError("Neither graphviz nor networkx+matplotlib are available to render the graph.") from e
+
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
+
+    fig = plt.figure(figsize=(12, max(6, len(nodes) * 0.3)))
+    try:
+        pos = nx.nx_agraph.graphviz_layout(G, prog="dot")
+    except Exception:
+        pos = nx.spring_layout(G, seed=0)
+    nx.draw(G, pos, with_labels=True, arrows=True, node_size=2000, font_size=8)
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=output_format, dpi=150)
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+class GraphRenderer:
+    """Renders graphs in a process pool and caches the files by content hash.
+
+    Rendering is CPU-bound and can take seconds, so it never runs on a
+    request thread. Each graph is rendered at most once per format: a finished
+    file is reused, and a render already in flight is shared by every caller
+    asking for the same hash.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: Optional[int] = None):
+        self.cache_dir = cache_dir or os.path.join(default_cache_dir(), "renders")
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # (hash, format) -> in-flight render
+        self._pending: Dict[Tuple[str, str], Future] = {}
+        # (hash, format) -> error message of the last failed render
+        self._errors: Dict[Tuple[str, str], str] = {}
+
+    def path(self, digest: str, output_format: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.{output_format}")
+
+    def status(self, digest: str, output_format: str) -> str:
+        """'ready', 'pending', 'failed' or 'unknown' for a rendered graph."""
+        key = (digest, output_format)
+        if os.path.exists(self.path(digest, output_format)):
+            return 'ready'
+        with self._lock:
+            if key in self._pending:
+                return 'pending'
+            if key in self._errors:
+                return 'failed'
+        return 'unknown'
+
+    def error(self, digest: str, output_format: str) -> Optional[str]:
+        with self._lock:
+            return self._errors.get((digest, output_format))
+
+    def submit(self, graph: Dict, output_format: str = "svg") -> Tuple[str, str]:
+        """Start rendering graph unless it is cached or in flight; returns (hash, status)."""
+        if output_format not in RENDER_FORMATS:
+            raise ValueError(f"output_format must be one of {', '.join(RENDER_FORMATS)}")
+        digest = graph_hash(graph)
+        key = (digest, output_format)
+        if os.path.exists(self.path(digest, output_format)):
+            return digest, 'ready'
+        with self._lock:
+            if key in self._pending:
+                return digest, 'pending'
+            self._errors.pop(key, None)
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            future = self._executor.submit(render_graph, graph, output_format)
+            self._pending[key] = future
+        future.add_done_callback(lambda f: self._finish(key, f))
+        return digest, 'pending'
+
+    def _finish(self, key: Tuple[str, str], future: Future):
+        try:
+            data = future.result()
+            os.makedirs(self.cache_dir, exist_ok=True)
+            target = self.path(*key)
+            # Write then rename so readers never see a partial file
+            tmp = f"{target}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, target)
+        except Exception as exc:
+            with self._lock:
+                self._errors[key] = str(exc)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
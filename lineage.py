@@ -0,0 +1,243 @@
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+Node = Tuple[str, str]
+
+
+def node_id(node: Node) -> str:
+    """'schema.name' label used for nodes in JSON and rendered graphs."""
+    schema, name = node
+    return f"{schema}.{name}" if schema else name
+
+
+class LineageGraph:
+    """Whole-database view dependency graph.
+
+    Edges point from a view to each object its definition reads, matching
+    the parent -> child direction of build_view_hierarchy. Built once from
+    the engine's dependency catalog (with SQL parsing only as a fallback),
+    so hierarchy lookups are dictionary walks with no database round trips.
+
+    A reverse index (``dependents``) is kept alongside the forward edges so
+    impact questions ("what breaks if this table changes?") are answered
+    just as cheaply. "Upstream" of a node means what it reads from;
+    "downstream" means the views that read from it.
+    """
+
+    def __init__(self):
+        # (schema, name) -> 'table' | 'view' | other object kind
+        self.kinds: Dict[Node, str] = {}
+        # view -> objects it depends on
+        self.dependencies: Dict[Node, Set[Node]] = {}
+        # object -> views that depend on it (reverse of dependencies)
+        self.dependents: Dict[Node, Set[Node]] = {}
+        # view -> 'catalog' | 'parsed', where its edges came from
+        self.sources: Dict[Node, str] = {}
+        # Guards incremental updates against concurrent readers
+        self._lock = threading.RLock()
+
+    def add_node(self, node: Node, kind: Optional[str] = None):
+        with self._lock:
+            if kind or node not in self.kinds:
+                self.kinds[node] = kind or self.kinds.get(node) or 'unknown'
+
+    def add_edge(self, view: Node, referenced: Node, source: str = 'catalog',
+                 view_kind: str = 'view', referenced_kind: Optional[str] = None):
+        if view == referenced:
+            return
+        with self._lock:
+            self.add_node(view, view_kind)
+            self.add_node(referenced, referenced_kind)
+            self.dependencies.setdefault(view, set()).add(referenced)
+            self.dependents.setdefault(referenced, set()).add(view)
+            self.sources.setdefault(view, source)
+
+    def update_view(self, view: Node, dependencies: Iterable[Tuple[Node, Optional[str]]],
+                    source: str = 'catalog', view_kind: str = 'view'):
+        """Replace one view's outgoing edges, patching the reverse index in place.
+
+        ``dependencies`` holds (node, kind) pairs; kind may be None if unknown.
+        """
+        with self._lock:
+            self._drop_outgoing(view)
+            self.sources.pop(view, None)
+            self.add_node(view, view_kind)
+            for ref, kind in dependencies:
+                self.add_edge(view, ref, source, view_kind, kind)
+
+    def remove_node(self, node: Node):
+        """Forget a dropped object; views that used it keep a dangling 'unknown' target."""
+        with self._lock:
+            self._drop_outgoing(node)
+            self.sources.pop(node, None)
+            if self.dependents.get(node):
+                self.kinds[node] = 'unknown'
+            else:
+                self.kinds.pop(node, None)
+                self.dependents.pop(node, None)
+
+    def _drop_outgoing(self, view: Node):
+        for ref in self.dependencies.pop(view, ()):
+            users = self.dependents.get(ref)
+            if users is not None:
+                users.discard(view)
+                if not users:
+                    del self.dependents[ref]
+
+    def __contains__(self, node: Node) -> bool:
+        return node in self.kinds
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(deps) for deps in self.dependencies.values())
+
+    def hierarchy(self, root: Node, max_depth: int = 10) -> Tuple[List[Node], List[Tuple[Node, Node]]]:
+        """Nodes and (view, dependency) edges reachable downward from root."""
+        with self._lock:
+            nodes = [root]
+            edges = []
+            seen = {root}
+            frontier = [root]
+            depth = 0
+            while frontier and depth < max_depth:
+                next_frontier = []
+                for node in frontier:
+                    for dep in sorted(self.dependencies.get(node, ())):
+                        edges.append((node, dep))
+                        if dep not in seen:
+                            seen.add(dep)
+                            nodes.append(dep)
+                            next_frontier.append(dep)
+                frontier = next_frontier
+                depth += 1
+            return nodes, edges
+
+    def _closure(self, root: Node, adjacency: Dict[Node, Set[Node]],
+                 max_depth: Optional[int]) -> Dict[Node, int]:
+        # BFS, so each node gets its shortest distance from root
+        with self._lock:
+            depths = {root: 0}
+            queue = deque([root])
+            while queue:
+                node = queue.popleft()
+                depth = depths[node]
+                if max_depth is not None and depth >= max_depth:
+                    continue
+                for nxt in adjacency.get(node, ()):
+                    if nxt not in depths:
+                        depths[nxt] = depth + 1
+                        queue.append(nxt)
+            del depths[root]
+            return depths
+
+    def upstream(self, node: Node, max_depth: Optional[int] = None) -> Dict[Node, int]:
+        """Everything node transitively reads from, with its distance in hops."""
+        return self._closure(node, self.dependencies, max_depth)
+
+    def downstream(self, node: Node, max_depth: Optional[int] = None) -> Dict[Node, int]:
+        """Every view transitively reading from node, with its distance in hops."""
+        return self._closure(node, self.dependents, max_depth)
+
+    @staticmethod
+    def layers(depths: Dict[Node, int]) -> List[List[Node]]:
+        """Group a closure into layers: index 0 holds the direct neighbours."""
+        grouped: Dict[int, List[Node]] = {}
+        for node, depth in depths.items():
+            grouped.setdefault(depth, []).append(node)
+        return [sorted(grouped[d]) for d in sorted(grouped)]
+
+    def cycles(self) -> List[List[Node]]:
+        """Strongly connected components with more than one node (Tarjan, iterative)."""
+        with self._lock:
+            index: Dict[Node, int] = {}
+            lowlink: Dict[Node, int] = {}
+            on_stack: Set[Node] = set()
+            stack: List[Node] = []
+            components: List[List[Node]] = []
+            counter = 0
+
+            for start in list(self.dependencies):
+                if start in index:
+                    continue
+                # Each work item is (node, iterator over its dependencies)
+                work = [(start, iter(self.dependencies.get(start, ())))]
+                index[start] = lowlink[start] = counter
+                counter += 1
+                stack.append(start)
+                on_stack.add(start)
+                while work:
+                    node, neighbours = work[-1]
+                    advanced = False
+                    for nxt in neighbours:
+                        if nxt not in index:
+                            index[nxt] = lowlink[nxt] = counter
+                            counter += 1
+                            stack.append(nxt)
+                            on_stack.add(nxt)
+                            work.append((nxt, iter(self.dependencies.get(nxt, ()))))
+                            advanced = True
+                            break
+                        if nxt in on_stack:
+                            lowlink[node] = min(lowlink[node], index[nxt])
+                    if advanced:
+                        continue
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1:
+                            components.append(sorted(component))
+            return sorted(components)
+
+    def to_json(self, nodes: Optional[Iterable[Node]] = None,
+                edges: Optional[Iterable[Tuple[Node, Node]]] = None) -> Dict:
+        """{'nodes': [...], 'edges': [...]} for the whole graph or a subgraph."""
+        with self._lock:
+            return self._to_json_locked(nodes, edges)
+
+    def _to_json_locked(self, nodes, edges) -> Dict:
+        if nodes is None:
+            nodes = sorted(self.kinds)
+        if edges is None:
+            edges = [(view, dep) for view in sorted(self.dependencies) for dep in sorted(self.dependencies[view])]
+        return {
+            'nodes': [
+                {'id': node_id(n), 'schema': n[0], 'name': n[1], 'kind': self.kinds.get(n, 'unknown'),
+                 'source': self.sources.get(n)}
+                for n in nodes
+            ],
+            'edges': [{'source': node_id(a), 'target': node_id(b)} for a, b in edges],
+        }
+
+    def to_dict(self) -> Dict:
+        """Compact JSON-serializable form, the inverse of from_dict()."""
+        with self._lock:
+            return self._to_dict_locked()
+
+    def _to_dict_locked(self) -> Dict:
+        return {
+            'kinds': [[schema, name, kind] for (schema, name), kind in self.kinds.items()],
+            'edges': [[v[0], v[1], d[0], d[1]] for v, deps in self.dependencies.items() for d in deps],
+            'sources': [[schema, name, source] for (schema, name), source in self.sources.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "LineageGraph":
+        graph = cls()
+        for schema, name, kind in data['kinds']:
+            graph.kinds[(schema, name)] = kind
+        for view_schema, view_name, ref_schema, ref_name in data['edges']:
+            graph.dependencies.setdefault((view_schema, view_name), set()).add((ref_schema, ref_name))
+            graph.dependents.setdefault((ref_schema, ref_name), set()).add((view_schema, view_name))
+        for schema, name, source in data['sources']:
+            graph.sources[(schema, name)] = source
+        return graph
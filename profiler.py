@@ -0,0 +1,354 @@
+import time
+from typing import Dict, List, Optional, Sequence
+
+from dialects import StatementTimeoutError
+from sampling import row_level, sample_summary, wilson_interval
+from sketches import HyperLogLog
+
+# exact: COUNT(DISTINCT); approximate: HyperLogLog; auto: exact for small tables;
+# stats: the optimizer's column statistics, scanning only columns that have none
+PROFILE_MODES = ("exact", "approximate", "auto", "stats")
+
+# Columns profiled per aggregate query; each adds three expressions to the SELECT
+DEFAULT_BATCH_SIZE = 100
+
+# Client-side HyperLogLog registers (2**14: 16 KiB per column, ~0.8% error)
+SKETCH_PRECISION = 14
+
+# Rows fetched per round trip when streaming a table through the client-side sketches
+STREAM_BATCH_ROWS = 10000
+
+_EXACT_DISTINCT = "COUNT(DISTINCT {col})"
+
+
+def is_string_type(data_type: Optional[str]) -> bool:
+    """True for character types, the only ones checked for empty strings."""
+    lowered = (data_type or '').lower()
+    return 'char' in lowered or 'text' in lowered
+
+
+def _column_expressions(dialect, column: Dict, distinct: str) -> List[str]:
+    col = dialect.quote_ident(column['name'])
+    empty = f"SUM(CASE WHEN {col} = '' THEN 1 ELSE 0 END)" if is_string_type(column['type']) else "0"
+    return [f"COUNT({col})", empty, distinct.format(col=col)]
+
+
+def build_profile_query(dialect, schema: Optional[str], table_name: str, columns: Sequence[Dict],
+                        distinct: str = _EXACT_DISTINCT, source: Optional[str] = None) -> str:
+    """One SELECT computing COUNT(*) plus non-null, empty and distinct counts for every column.
+
+    ``distinct`` is the aggregate template for "{col}", e.g. the dialect's
+    approximate distinct function. ``source`` replaces the table in the FROM
+    clause, e.g. with a TABLESAMPLE expression.
+    """
+    expressions = ["COUNT(*)"]
+    for column in columns:
+        expressions.extend(_column_expressions(dialect, column, distinct))
+    return f"SELECT {', '.join(expressions)} FROM {source or dialect.qualify(schema, table_name)}"
+
+
+def _with_interval(text: str, profile: Dict, key: str) -> str:
+    interval = profile.get(key)
+    return f"{text} (95% CI {interval[0]:.1f}-{interval[1]:.1f}%)" if interval else text
+
+
+def stream_batches(analyzer, sql: str, batch_rows: int = STREAM_BATCH_ROWS):
+    """Yield the rows of sql in fetchmany() batches through the dialect's server-side cursor.
+
+    Runs on the analyzer's current pooled connection; the cursor is closed
+    when the generator finishes or is abandoned. Every fetch is a separate
+    statement, so a statement timeout alone never ends a long scan: the
+    thread's statement_timeout() deadline is checked between batches.
+    """
+    deadline = analyzer.deadline()
+    cursor = analyzer.dialect.stream_cursor(analyzer._current_pooled())
+    try:
+        cursor.execute(sql)
+        while True:
+            if deadline is not None and time.monotonic() > deadline:
+                raise StatementTimeoutError("Streamed scan stopped: time limit exceeded")
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            yield rows
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+def assess_column(profile: Dict, row_count: int) -> Dict:
+    """Add null/empty/distinct percentages plus a status and notes to a column profile.
+
+    Rates measured on a sample quote their confidence interval, if
+    add_sample_intervals() ran first.
+    """
+    null_count = profile['null_count']
+    empty_count = profile['empty_count']
+    distinct_count = profile['distinct_count']
+    null_pct = (null_count / row_count) * 100 if row_count > 0 else 0
+    empty_pct = (empty_count / row_count) * 100 if row_count > 0 else 0
+    cardinality = (distinct_count / row_count) * 100 if row_count > 0 else 0
+
+    status = 'ok'
+    notes = []
+    issue = None
+    if profile['nullable'] != 'YES' and null_count > 0:
+        status = 'warning'
+        notes.append(f"{null_count} NULLs in non-nullable column")
+        issue = f"Column '{profile['name']}': NULL constraint violation"
+    if null_pct > 50:
+        status = 'warning'
+        notes.append(_with_interval(f"High NULL rate: {null_pct:.1f}%", profile, 'null_rate_ci'))
+    if empty_pct > 20:
+        status = 'warning'
+        notes.append(_with_interval(f"High empty string rate: {empty_pct:.1f}%", profile, 'empty_rate_ci'))
+    if cardinality < 1 and row_count > 1:
+        status = 'warning'
+        notes.append("All values identical")
+
+    profile.update({
+        'null_pct': null_pct,
+        'empty_pct': empty_pct,
+        'distinct_pct': cardinality,
+        'status': status,
+        'notes': notes,
+        'issue': issue,
+    })
+    return profile
+
+
+def stats_column_profile(column: Dict, stats: Dict, row_count: int) -> Dict:
+    """Column profile built from optimizer statistics (see Dialect.read_column_stats) without a scan."""
+    non_null = row_count * (1 - stats['null_frac'])
+    return {
+        'name': column['name'],
+        'type': column['type'],
+        'nullable': column['nullable'],
+        'null_count': int(round(row_count * stats['null_frac'])),
+        'empty_count': int(round(row_count * stats['empty_frac'])) if is_string_type(column['type']) else 0,
+        'distinct_count': min(stats['distinct'], int(round(non_null))),
+        'distinct_approximate': True,
+        # Sampled statistics carry no usable error bound
+        'distinct_error': None,
+        'source': 'statistics',
+    }
+
+
+def add_sample_intervals(profile: Dict, sample_rows: int, confidence: float = 0.95) -> Dict:
+    """Attach Wilson intervals (in percent) for the null and empty rates measured on a row-level sample."""
+    for key, count in (('null_rate_ci', profile['null_count']), ('empty_rate_ci', profile['empty_count'])):
+        low, high = wilson_interval(count, sample_rows, confidence)
+        profile[key] = [low * 100, high * 100]
+    return profile
+
+
+def profile_note(profile: Dict) -> str:
+    """One-line summary for reports: the warnings, or the distinct count."""
+    if profile.get('error'):
+        return f"Error analyzing: {profile['error']}"
+    if profile['notes']:
+        return "; ".join(profile['notes'])
+    if profile.get('distinct_approximate') and profile.get('distinct_error'):
+        return (f"Distinct: ~{profile['distinct_count']} ({profile['distinct_pct']:.1f}%, "
+                f"±{profile['distinct_error'] * 100:.1f}%)")
+    if profile.get('distinct_approximate'):
+        return f"Distinct: ~{profile['distinct_count']} ({profile['distinct_pct']:.1f}%)"
+    return f"Distinct: {profile['distinct_count']} ({profile['distinct_pct']:.1f}%)"
+
+
+_QUALITY_METRICS = ('null_count', 'null_pct', 'empty_count', 'empty_pct', 'distinct_count', 'distinct_pct',
+                    'distinct_approximate', 'distinct_error', 'null_rate_ci', 'empty_rate_ci', 'source')
+_PROFILE_CONTEXT = ('row_count', 'mode', 'queries', 'cached', 'profiled_at', 'change_fingerprint',
+                    'scanned_columns', 'sample')
+
+
+def quality_report(profile: Dict) -> Dict:
+    """Data quality of a table profile as plain JSON: per-column metrics and warnings.
+
+    Each column carries its 'metrics', 'status' ('ok', 'warning' or
+    'error') and 'warnings'; the table lists every warning as {'column',
+    'message'}, the constraint violations under 'issues', and an overall
+    'status'. How the profile was obtained (mode, cache, sample) is kept.
+    """
+    columns = []
+    warnings = []
+    issues = []
+    for profile_column in profile['columns']:
+        column = {key: profile_column[key] for key in ('name', 'type', 'nullable')}
+        if profile_column.get('error'):
+            column.update({'status': 'error', 'error': profile_column['error'], 'warnings': []})
+        else:
+            column.update({
+                'metrics': {key: profile_column[key] for key in _QUALITY_METRICS if key in profile_column},
+                'status': profile_column['status'],
+                'warnings': list(profile_column['notes']),
+            })
+            warnings.extend({'column': column['name'], 'message': note} for note in column['warnings'])
+            if profile_column['issue']:
+                issues.append(profile_column['issue'])
+        columns.append(column)
+
+    statuses = {column['status'] for column in columns}
+    status = 'error' if 'error' in statuses else 'warning' if 'warning' in statuses else 'ok'
+    report = {'schema': profile['schema'], 'table': profile['table'], 'status': status}
+    report.update({key: profile[key] for key in _PROFILE_CONTEXT if key in profile})
+    report.update({'columns': columns, 'warnings': warnings, 'issues': issues})
+    return report
+
+
+class TableProfiler:
+    """Single-pass null/empty/distinct profiling for one table.
+
+    Every column's counts come from one aggregate SELECT (split into
+    batches of ``batch_size`` columns for very wide tables) instead of up to
+    three scans per column. If a batch fails, e.g. on a type that does not
+    support COUNT(DISTINCT), its columns are retried one query each so a
+    single bad column only costs itself.
+
+    In approximate mode distinct counts come from HyperLogLog: the engine's
+    own function where ``native_approx`` says it is available, otherwise
+    one streamed scan folded into a fixed-size client-side sketch per column.
+    Either way memory stays bounded and each column reports its
+    ``distinct_error`` (relative standard error).
+
+    With a ``sample`` (a sampling spec plus its ``source`` FROM item) every
+    query reads only the sampled rows; counts then describe the sample and,
+    for row-level samples, null/empty rates carry 95% confidence intervals.
+    Distinct counts are not scaled up, since no unbiased estimator exists
+    for them.
+    """
+
+    def __init__(self, analyzer, batch_size: int = DEFAULT_BATCH_SIZE, native_approx: bool = False):
+        self.analyzer = analyzer
+        self.batch_size = max(1, batch_size)
+        self.native_approx = native_approx
+
+    def profile(self, schema: Optional[str], table_name: str, columns: List[Dict], mode: str = "exact",
+                sample: Optional[Dict] = None) -> Dict:
+        """Profile columns of schema.table; returns row_count, per-column results and queries run."""
+        if mode not in ("exact", "approximate"):
+            raise ValueError("mode must be 'exact' or 'approximate'")
+        dialect = self.analyzer.dialect
+        source = sample['source'] if sample else None
+        if mode == "approximate" and columns and not (self.native_approx and dialect.approx_distinct):
+            result = self._sketch(schema, table_name, columns, source)
+        else:
+            distinct, error = _EXACT_DISTINCT, 0.0
+            if mode == "approximate":
+                distinct, error = dialect.approx_distinct, dialect.approx_distinct_error
+            result = self._aggregate(schema, table_name, columns, distinct, source)
+            for profile in result['columns']:
+                if 'error' not in profile:
+                    profile['distinct_approximate'] = mode == "approximate"
+                    profile['distinct_error'] = error
+
+        sample_rows = result['row_count'] or 0
+        for profile in result['columns']:
+            if 'error' not in profile:
+                if sample and row_level(sample):
+                    add_sample_intervals(profile, sample_rows)
+                assess_column(profile, sample_rows)
+        if sample:
+            result['sample'] = sample_summary(sample, sample_rows)
+        return {**result, 'mode': mode}
+
+    def _aggregate(self, schema, table_name, columns, distinct, source=None) -> Dict:
+        row_count = None
+        queries = 0
+        profiles = []
+        # An empty column list still runs one batch, for the row count
+        for start in range(0, max(1, len(columns)), self.batch_size):
+            batch = columns[start:start + self.batch_size]
+            queries += 1
+            try:
+                row = self._fetch(schema, table_name, batch, distinct, source)
+            except Exception as e:
+                self.analyzer._rollback_quietly()
+                # Column-by-column retries only help a column type the aggregate rejects, not a timeout
+                if self.analyzer.dialect.is_statement_timeout(e):
+                    raise
+                if len(batch) <= 1:
+                    if not batch:
+                        raise
+                    profiles.append(self._failed(batch[0], e))
+                    continue
+                for column in batch:
+                    queries += 1
+                    try:
+                        row = self._fetch(schema, table_name, [column], distinct, source)
+                    except Exception as col_error:
+                        self.analyzer._rollback_quietly()
+                        if self.analyzer.dialect.is_statement_timeout(col_error):
+                            raise
+                        profiles.append(self._failed(column, col_error))
+                        continue
+                    row_count = row[0]
+                    profiles.extend(self._unpack([column], row))
+                continue
+            row_count = row[0]
+            profiles.extend(self._unpack(batch, row))
+
+        return {'row_count': row_count, 'columns': profiles, 'queries': queries}
+
+    def _fetch(self, schema, table_name, columns, distinct, source=None):
+        cursor = self.analyzer.cursor
+        cursor.execute(build_profile_query(self.analyzer.dialect, schema, table_name, columns, distinct, source))
+        return cursor.fetchone()
+
+    def _sketch(self, schema, table_name, columns, source=None) -> Dict:
+        # One streamed scan; per column a counter pair and a fixed-size sketch
+        dialect = self.analyzer.dialect
+        select_list = ", ".join(dialect.quote_ident(column['name']) for column in columns)
+        non_null = [0] * len(columns)
+        empty = [0] * len(columns)
+        sketches = [HyperLogLog(SKETCH_PRECISION) for _ in columns]
+        strings = [is_string_type(column['type']) for column in columns]
+        row_count = 0
+
+        sql = f"SELECT {select_list} FROM {source or dialect.qualify(schema, table_name)}"
+        for rows in stream_batches(self.analyzer, sql):
+            row_count += len(rows)
+            for row in rows:
+                for i, value in enumerate(row):
+                    if value is None:
+                        continue
+                    non_null[i] += 1
+                    if strings[i] and value == '':
+                        empty[i] += 1
+                    sketches[i].add(value)
+
+        profiles = []
+        for i, column in enumerate(columns):
+            profiles.append({
+                'name': column['name'],
+                'type': column['type'],
+                'nullable': column['nullable'],
+                'null_count': row_count - non_null[i],
+                'empty_count': empty[i],
+                'distinct_count': min(sketches[i].count(), non_null[i]),
+                'distinct_approximate': True,
+                'distinct_error': sketches[i].relative_error,
+            })
+        return {'row_count': row_count, 'columns': profiles, 'queries': 1}
+
+    @staticmethod
+    def _unpack(columns: Sequence[Dict], row: Sequence) -> List[Dict]:
+        total = row[0] or 0
+        profiles = []
+        for i, column in enumerate(columns):
+            non_null, empty, distinct = row[1 + 3 * i:4 + 3 * i]
+            profiles.append({
+                'name': column['name'],
+                'type': column['type'],
+                'nullable': column['nullable'],
+                'null_count': total - (non_null or 0),
+                'empty_count': int(empty or 0),
+                'distinct_count': distinct or 0,
+            })
+        return profiles
+
+    @staticmethod
+    def _failed(column: Dict, error: Exception) -> Dict:
+        return {'name': column['name'], 'type': column['type'], 'nullable': column['nullable'], 'error': str(error)}
@@ -0,0 +1,76 @@
+import random
+from statistics import NormalDist
+from typing import Dict, Optional, Tuple
+
+# system: whole pages/blocks (fastest); bernoulli: independent rows
+SAMPLE_METHODS = ("system", "bernoulli")
+
+
+def sample_spec(percent: float, method: str = "system", seed: Optional[int] = None) -> Dict:
+    """Validated sampling request: {'percent', 'method', 'seed'}.
+
+    The seed makes the sample repeatable, so every query of one analysis
+    reads the same rows.
+    """
+    if method not in SAMPLE_METHODS:
+        raise ValueError(f"sample method must be one of {', '.join(SAMPLE_METHODS)}")
+    if not 0 < percent <= 100:
+        raise ValueError("sample percent must be in (0, 100]")
+    return {
+        'percent': float(percent),
+        'method': method,
+        'seed': random.randint(1, 2 ** 31 - 1) if seed is None else int(seed),
+    }
+
+
+def row_level(sample: Dict) -> bool:
+    """True if the sample drew rows independently (bernoulli), as wilson_interval() and
+    estimated_duplicate_pairs() assume.
+
+    Page samples (system, and always on SQL Server) and MySQL's key-range
+    block read clusters of neighbouring rows, which are correlated, so
+    those figures would be too narrow or simply wrong and are not reported.
+    """
+    return sample['method'] == 'bernoulli'
+
+
+def sample_summary(sample: Dict, rows: int) -> Dict:
+    """The 'sample' block of a sampled result: how it was drawn and how many rows it read."""
+    return {
+        'method': sample['method'],
+        'row_level': row_level(sample),
+        'percent': sample['percent'],
+        'seed': sample['seed'],
+        'rows': rows,
+        'estimated_total_rows': int(round(rows * 100.0 / sample['percent'])),
+    }
+
+
+def suggested_sample_percent(total_rows: Optional[int], target_rows: int = 100000) -> float:
+    """Percent that reads about target_rows rows, clamped to [0.01, 100]."""
+    if not total_rows:
+        return 100.0
+    return round(max(0.01, min(100.0, target_rows * 100.0 / total_rows)), 4)
+
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a proportion; stays inside [0, 1] even at 0 or n successes."""
+    if trials <= 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * ((p * (1 - p) / trials + z * z / (4 * trials * trials)) ** 0.5) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def estimated_duplicate_pairs(pairs: int, fraction: float) -> int:
+    """Unbiased estimate of duplicate row pairs in the table from the pairs found in a sample.
+
+    Under row-level (Bernoulli) sampling at rate ``fraction`` each pair of
+    identical rows survives with probability fraction**2, so in-sample pairs
+    are scaled up by its inverse. In-sample duplicate rates alone understate
+    the table's, because most copies of a row are not sampled together.
+    """
+    return int(round(pairs / (fraction * fraction))) if fraction > 0 else 0
@@ -1,10 +1,25 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import os
+import re
+import threading
+
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, JSONResponse
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 
 # Import backend class
-from database_analyser import DatabaseAnalyzer
+from async_analyser import AsyncDatabaseAnalyzer
+from column_index import SEARCH_MODES
+from database_analyser import MIN_POOL_SIZE, ROW_COUNT_MODES, DatabaseAnalyzer
+from graph_render import RENDER_FORMATS, GraphRenderer
+from lineage import node_id
+from profiler import DEFAULT_BATCH_SIZE, PROFILE_MODES
+from sampling import sample_spec
+from sessions import SessionNotFoundError, SessionRegistry
 
 app = FastAPI(title="Database Analyzer API", version="1.0.0")
 
@@ -27,15 +42,121 @@ class ConnectRequest(BaseModel):
     # For SQL Server convenience
     server: Optional[str] = None
     trusted_connection: Optional[bool] = None
+    # Upper bound on pooled connections for this analyzer; smaller pools are rejected with 422
+    pool_size: Optional[int] = Field(None, ge=MIN_POOL_SIZE)
+    # Seconds metadata is served from cache before the schema version is re-checked
+    metadata_ttl: Optional[float] = None
+    # Parallel per-table work (exact counts, profiling): connections used and per-table timeout
+    crawl_concurrency: Optional[int] = None
+    crawl_timeout: Optional[float] = None
 
 
 class TableRef(BaseModel):
     schema: str
     table: str
+    # Row count source: estimate | exact | auto (exact only for small tables)
+    row_count_mode: str = "auto"
+
+
+class ProfileRequest(BaseModel):
+    schema: str
+    table: str
+    # Columns per aggregate query; wider tables are split into several scans
+    batch_size: int = DEFAULT_BATCH_SIZE
+    # exact | approximate (HyperLogLog distinct counts) | auto (exact for small tables)
+    # | stats (optimizer statistics; scans only columns without any)
+    mode: str = "auto"
+    # Profile a TABLESAMPLE of this percent instead of the whole table
+    sample_percent: Optional[float] = None
+    # system (pages, fastest) | bernoulli (rows); seed makes the sample repeatable
+    sample_method: str = "system"
+    sample_seed: Optional[int] = None
+    # Scan even if the table is unchanged since its stored profile
+    refresh: bool = False
+
+
+class StatisticsRequest(BaseModel):
+    schema: str
+    table: str
+    # Equal-width histogram bins per numeric column
+    bins: int = 20
+    sample_percent: Optional[float] = None
+    sample_method: str = "system"
+    sample_seed: Optional[int] = None
+
+
+class FrequenciesRequest(BaseModel):
+    schema: str
+    table: str
+    # Every column when omitted
+    columns: Optional[List[str]] = None
+    top_k: int = 10
+    # Key-range partitions scanned in parallel (needs a single-column integer primary key)
+    partitions: int = 1
+    sample_percent: Optional[float] = None
+    sample_method: str = "system"
+    sample_seed: Optional[int] = None
+
+
+class QualityRequest(BaseModel):
+    schema: str
+    table: str
+    # Profile mode, as for /table/profile
+    mode: str = "auto"
+    sample_percent: Optional[float] = None
+    sample_method: str = "system"
+    sample_seed: Optional[int] = None
+    refresh: bool = False
+    # Seconds before the request gives up (default DBA_QUALITY_TIMEOUT)
+    timeout: Optional[float] = None
+
+
+class TableName(BaseModel):
+    schema: str
+    table: str
+
+
+class BulkQualityRequest(BaseModel):
+    # Every table when omitted
+    tables: Optional[List[TableName]] = None
+    mode: str = "auto"
+    # Sample each scanned table (each gets its own seed)
+    sample_percent: Optional[float] = None
+    sample_method: str = "system"
+    refresh: bool = False
+    # Seconds per table (default DBA_QUALITY_TIMEOUT) and for the whole request (default DBA_QUALITY_TOTAL_TIMEOUT)
+    timeout: Optional[float] = None
+    total_timeout: Optional[float] = None
+
+
+class DuplicatesRequest(TableRef):
+    # Group on these columns only (default all: exact duplicate rows)
+    columns: Optional[List[str]] = None
+    # Page of groups, largest first
+    limit: int = 50
+    offset: int = 0
+    # Check a TABLESAMPLE of this percent instead of the whole table
+    sample_percent: Optional[float] = None
+    sample_method: str = "system"
+    sample_seed: Optional[int] = None
+
+
+class DuplicateRowsRequest(BaseModel):
+    schema: str
+    table: str
+    # A group's row_hash from /table/duplicates, with the same columns
+    row_hash: str
+    columns: Optional[List[str]] = None
+    limit: int = 100
+    offset: int = 0
 
 
 class ColumnSearchRequest(BaseModel):
     column_name: str
+    # exact | prefix | substring | fuzzy | auto
+    mode: str = "exact"
+    limit: int = 50
+    offset: int = 0
 
 
 class ViewRef(BaseModel):
@@ -43,13 +164,38 @@ class ViewRef(BaseModel):
     view: str
 
 
-analyzer: Optional[DatabaseAnalyzer] = None
+class HierarchyRequest(BaseModel):
+    schema: str
+    view: str
+    max_depth: int = 10
+    # Optional background render: svg | png
+    render: Optional[str] = None
+
+
+# One analyzer (and connection pool) per /connect session
+sessions = SessionRegistry(
+    max_sessions=int(os.environ.get("DBA_MAX_SESSIONS", "32")),
+    idle_timeout=float(os.environ.get("DBA_SESSION_IDLE_TIMEOUT", "1800")),
+)
+_sweeper_stop = threading.Event()
+METADATA_TTL = float(os.environ.get("DBA_METADATA_TTL", "300"))
+CRAWL_CONCURRENCY = int(os.environ.get("DBA_CRAWL_CONCURRENCY", "4"))
+CRAWL_TIMEOUT = float(os.environ.get("DBA_CRAWL_TIMEOUT", "300"))
+# Upper bound on /table/quality requests and on each table of /quality
+QUALITY_TIMEOUT = float(os.environ.get("DBA_QUALITY_TIMEOUT", "60"))
+QUALITY_TOTAL_TIMEOUT = float(os.environ.get("DBA_QUALITY_TOTAL_TIMEOUT", "600"))
+# Hierarchy images render in worker processes, cached on disk by graph hash
+renderer = GraphRenderer(max_workers=int(os.environ.get("DBA_RENDER_WORKERS", "2")))
 
 
 @app.post("/connect")
-def connect(req: ConnectRequest) -> Dict[str, Any]:
-    global analyzer
-    analyzer = DatabaseAnalyzer()
+async def connect(req: ConnectRequest) -> Dict[str, Any]:
+    analyzer = DatabaseAnalyzer(
+        pool_size=req.pool_size or 10,
+        metadata_ttl=req.metadata_ttl if req.metadata_ttl is not None else METADATA_TTL,
+        crawl_concurrency=req.crawl_concurrency or CRAWL_CONCURRENCY,
+        crawl_timeout=req.crawl_timeout if req.crawl_timeout is not None else CRAWL_TIMEOUT,
+    )
     params: Dict[str, Any] = {}
 
     if req.db_type not in ["postgresql", "sqlserver", "mysql"]:
@@ -91,27 +237,54 @@ def connect(req: ConnectRequest) -> Dict[str, Any]:
                 "trusted_connection": False,
             }
 
-    ok = analyzer.connect_database(req.db_type, params)
+    ok = await run_in_threadpool(analyzer.connect_database, req.db_type, params)
     if not ok:
-        analyzer = None
         raise HTTPException(status_code=500, detail="Failed to connect to database")
-    return {"status": "connected", "db_type": req.db_type}
+    session_id = await run_in_threadpool(sessions.create, AsyncDatabaseAnalyzer(analyzer))
+    return {
+        "status": "connected",
+        "db_type": req.db_type,
+        "session_id": session_id,
+        # Set when metadata was restored from the on-disk cache (epoch seconds of that snapshot)
+        "metadata_restored_at": analyzer.metadata_restored_at,
+    }
+
+
+def get_analyzer(x_session_id: Optional[str] = Header(default=None)) -> AsyncDatabaseAnalyzer:
+    if not x_session_id:
+        raise HTTPException(status_code=400, detail="Missing X-Session-Id header. Call /connect first.")
+    try:
+        analyzer = sessions.get(x_session_id)
+    except SessionNotFoundError:
+        raise HTTPException(status_code=401, detail="Unknown or expired session. Call /connect again.")
+    if not analyzer.is_connected():
+        raise HTTPException(status_code=400, detail="Not connected. Call /connect first.")
+    return analyzer
 
 
-def ensure_connected():
-    if analyzer is None or analyzer.cursor is None:
-        raise HTTPException(status_code=400, detail="Not connected. Call /connect first.")
+@app.post("/disconnect")
+async def disconnect(x_session_id: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    if not x_session_id or not await run_in_threadpool(sessions.close, x_session_id):
+        raise HTTPException(status_code=404, detail="Unknown session")
+    return {"status": "disconnected"}
+
+
+@app.get("/sessions/stats")
+async def session_stats() -> Dict[str, Any]:
+    return sessions.stats()
 
 
 @app.get("/overview")
-def overview() -> Dict[str, Any]:
-    ensure_connected()
+async def overview(analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
     # Replicate what get_database_overview prints, but return JSON
     try:
-        tables = analyzer.get_tables()
-        views_count = analyzer._get_views_count()  # type: ignore[attr-defined]
-        schemas_count = analyzer._get_schemas_count()  # type: ignore[attr-defined]
-        db_size = analyzer._get_database_size()  # type: ignore[attr-defined]
+        # Independent catalog queries run concurrently on separate pooled connections
+        tables, views_count, schemas_count, db_size = await asyncio.gather(
+            analyzer.get_tables(),
+            analyzer._get_views_count(),
+            analyzer._get_schemas_count(),
+            analyzer._get_database_size(),
+        )
         return {
             "db_type": analyzer.db_type,
             "tables_count": len(tables),
@@ -124,185 +297,455 @@ def overview() -> Dict[str, Any]:
 
 
 @app.get("/tables")
-def list_tables() -> List[Dict[str, str]]:
-    ensure_connected()
+async def list_tables(analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> List[Dict[str, str]]:
     try:
-        tables = analyzer.get_tables()
+        tables = await analyzer.get_tables()
         return [{"schema": s, "table": t} for s, t in tables]
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
 @app.get("/views")
-def list_views() -> List[Dict[str, str]]:
-    ensure_connected()
+async def list_views(analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> List[Dict[str, str]]:
     try:
-        views = analyzer.get_views()
+        views = await analyzer.get_views()
         return [{"schema": s, "view": v} for s, v in views]
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
 @app.post("/table/details")
-def table_details(ref: TableRef) -> Dict[str, Any]:
-    ensure_connected()
+async def table_details(ref: TableRef, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
     try:
         # Gather same metrics as get_table_details_and_quality without printing
-        analyzer.cursor.execute(f"SELECT COUNT(*) FROM {ref.schema}.{ref.table}")
-        row_count = analyzer.cursor.fetchone()[0]
-        columns = analyzer._get_column_info(ref.schema, ref.table)  # type: ignore[attr-defined]
-        table_size = analyzer._get_table_size(ref.schema, ref.table)  # type: ignore[attr-defined]
+        if ref.row_count_mode not in ROW_COUNT_MODES:
+            raise HTTPException(status_code=400, detail=f"row_count_mode must be one of {', '.join(ROW_COUNT_MODES)}")
+        row_count, columns, table_size = await asyncio.gather(
+            analyzer.get_row_count(ref.schema, ref.table, ref.row_count_mode),
+            analyzer._get_column_info(ref.schema, ref.table),
+            analyzer.get_table_size_bytes(ref.schema, ref.table),
+        )
         return {
             "schema": ref.schema,
             "table": ref.table,
-            "row_count": row_count,
+            "row_count": row_count["rows"],
+            "row_count_estimated": row_count["estimated"],
             "columns": columns,
-            "estimated_size": table_size,
+            "estimated_size": DatabaseAnalyzer._format_bytes(table_size["total"]) if table_size else None,
+            # data / index / toast (TOAST or LOB, null where folded into data) / total bytes
+            "size_bytes": table_size,
         }
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+def _sample_request(req) -> Optional[Dict[str, Any]]:
+    if req.sample_percent is None:
+        return None
+    try:
+        return sample_spec(req.sample_percent, req.sample_method, req.sample_seed)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/table/profile")
+async def table_profile(req: ProfileRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    # Null/empty/distinct counts for every column from one aggregate scan
+    if req.batch_size < 1:
+        raise HTTPException(status_code=400, detail="batch_size must be >= 1")
+    if req.mode not in PROFILE_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(PROFILE_MODES)}")
+    sample = _sample_request(req)
+    try:
+        # Served from the stored profile while the table's change fingerprint holds
+        return await analyzer.get_table_profile(req.schema, req.table, batch_size=req.batch_size, mode=req.mode,
+                                                sample=sample, refresh=req.refresh)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@app.post("/table/statistics")
+async def table_statistics(req: StatisticsRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    # Min/max/mean/stddev, quantiles and histograms per column from one streamed scan
+    if not 1 <= req.bins <= 1000:
+        raise HTTPException(status_code=400, detail="bins must be between 1 and 1000")
+    sample = _sample_request(req)
+    try:
+        return await analyzer.column_statistics(req.schema, req.table, bins=req.bins, sample=sample)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@app.post("/table/frequencies")
+async def table_frequencies(req: FrequenciesRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    # Top-k values per column with error bounds, from fixed-size streaming sketches
+    if not 1 <= req.top_k <= 100:
+        raise HTTPException(status_code=400, detail="top_k must be between 1 and 100")
+    if not 1 <= req.partitions <= 64:
+        raise HTTPException(status_code=400, detail="partitions must be between 1 and 64")
+    sample = _sample_request(req)
+    try:
+        return await analyzer.column_frequencies(req.schema, req.table, columns=req.columns, top_k=req.top_k,
+                                                 sample=sample, partitions=req.partitions)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+def _quality_options(mode: str, timeout: Optional[float]) -> float:
+    if mode not in PROFILE_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(PROFILE_MODES)}")
+    if timeout is not None and timeout <= 0:
+        raise HTTPException(status_code=400, detail="timeout must be > 0")
+    return timeout or QUALITY_TIMEOUT
+
+
+@app.post("/table/quality")
+async def table_quality(req: QualityRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    # Per-column metrics and warnings; stored profile while the table is unchanged
+    timeout = _quality_options(req.mode, req.timeout)
+    sample = _sample_request(req)
+    try:
+        # Statements are cancelled server-side at the timeout; wait_for answers even if a driver ignores it
+        return await asyncio.wait_for(
+            analyzer.table_quality(req.schema, req.table, mode=req.mode, sample=sample, refresh=req.refresh,
+                                   timeout=timeout),
+            timeout + 5,
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Quality analysis exceeded {timeout:g}s")
+    except Exception as exc:
+        if analyzer.dialect.is_statement_timeout(exc):
+            raise HTTPException(status_code=504, detail=f"Quality analysis exceeded {timeout:g}s")
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@app.post("/quality")
+async def bulk_quality(req: BulkQualityRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> List[Dict[str, Any]]:
+    # One report per table; a table that fails or times out is reported, not fatal
+    timeout = _quality_options(req.mode, req.timeout)
+    if req.total_timeout is not None and req.total_timeout <= 0:
+        raise HTTPException(status_code=400, detail="total_timeout must be > 0")
+    total_timeout = req.total_timeout or QUALITY_TOTAL_TIMEOUT
+    if req.sample_percent is not None:
+        try:
+            sample_spec(req.sample_percent, req.sample_method)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+    tables = [(ref.schema, ref.table) for ref in req.tables] if req.tables is not None else None
+    try:
+        # Tables still running at total_timeout stop at their next statement or fetch; wait_for is the backstop
+        return await asyncio.wait_for(
+            analyzer.quality_reports(tables, mode=req.mode, sample_percent=req.sample_percent,
+                                     sample_method=req.sample_method, refresh=req.refresh,
+                                     timeout=timeout, total_timeout=total_timeout),
+            total_timeout + 5,
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Quality analysis exceeded {total_timeout:g}s")
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@app.get("/tables/row_counts")
+async def table_row_counts(mode: str = "estimate", analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> List[Dict[str, Any]]:
+    if mode not in ROW_COUNT_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(ROW_COUNT_MODES)}")
+    try:
+        counts = await analyzer.get_row_counts(mode=mode)
+        return [
+            {"schema": s, "table": t, "row_count": c["rows"], "row_count_estimated": c["estimated"]}
+            for (s, t), c in counts.items()
+        ]
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+def _index_json(index: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "schema": index["schema"],
+        "table": index["table"],
+        "index_name": index["name"],
+        "columns": index["columns"],
+        "include_columns": index["include_columns"],
+        "is_unique": index["unique"],
+        "is_primary": index["primary"],
+        "index_type": index["type"],
+        "size_bytes": index["size_bytes"],
+    }
+
+
 @app.post("/table/indexes")
-def table_indexes(ref: TableRef) -> Dict[str, Any]:
-    ensure_connected()
+async def table_indexes(ref: TableRef, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    try:
+        # Served from the database-wide index catalog, loaded once per session
+        indexes = await analyzer.get_table_indexes(ref.schema, ref.table)
+        return {"schema": ref.schema, "table": ref.table, "indexes": [_index_json(ix) for ix in indexes]}
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@app.get("/indexes")
+async def list_indexes(schema: Optional[str] = None, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
     try:
-        # Provide a structured version by re-querying based on db_type
-        indexes: List[Dict[str, Any]] = []
-        db_type = analyzer.db_type
-        if db_type == "postgresql":
-            analyzer.cursor.execute(
-                """
-                SELECT i.relname AS index_name,
-                       array_to_string(array_agg(a.attname), ', ') AS columns,
-                       ix.indisunique AS is_unique,
-                       ix.indisprimary AS is_primary,
-                       am.amname AS index_type
-                FROM pg_class t
-                JOIN pg_index ix ON t.oid = ix.indrelid
-                JOIN pg_class i ON i.oid = ix.indexrelid
-                JOIN pg_am am ON i.relam = am.oid
-                JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = ANY(ix.indkey)
-                WHERE t.relname = %s AND t.relnamespace = (SELECT oid FROM pg_namespace WHERE nspname = %s)
-                GROUP BY i.relname, ix.indisunique, ix.indisprimary, am.amname
-                ORDER BY i.relname
-                """,
-                (ref.table, ref.schema),
-            )
-            for row in analyzer.cursor.fetchall():
-                indexes.append(
-                    {
-                        "index_name": row[0],
-                        "columns": row[1],
-                        "is_unique": bool(row[2]),
-                        "is_primary": bool(row[3]),
-                        "index_type": row[4],
-                    }
-                )
-        elif db_type == "mysql":
-            analyzer.cursor.execute(f"SHOW INDEXES FROM {ref.schema}.{ref.table}")
-            for row in analyzer.cursor.fetchall():
-                indexes.append(
-                    {
-                        "index_name": row[2],
-                        "column": row[4],
-                        "is_unique": row[1] == 0,
-                        "index_type": row[10] if len(row) > 10 else "BTREE",
-                    }
-                )
-        elif db_type == "sqlserver":
-            analyzer.cursor.execute(
-                """
-                SELECT i.name AS index_name,
-                       STUFF((SELECT ', ' + c.name
-                              FROM sys.index_columns ic2
-                              JOIN sys.columns c ON ic2.object_id = c.object_id AND ic2.column_id = c.column_id
-                              WHERE ic2.object_id = ic.object_id AND ic2.index_id = ic.index_id
-                              ORDER BY ic2.key_ordinal
-                              FOR XML PATH(''), TYPE).value('.', 'NVARCHAR(MAX)'), 1, 2, '') AS columns,
-                       i.is_unique,
-                       i.is_primary_key,
-                       i.type_desc AS index_type
-                FROM sys.indexes i
-                JOIN sys.index_columns ic ON i.object_id = ic.object_id AND i.index_id = ic.index_id
-                JOIN sys.objects o ON i.object_id = o.object_id
-                WHERE o.schema_id = SCHEMA_ID(%s) AND o.name = %s AND i.is_hypothetical = 0
-                GROUP BY i.name, i.is_unique, i.is_primary_key, i.type_desc
-                ORDER BY i.name
-                """,
-                (ref.schema, ref.table),
-            )
-            for row in analyzer.cursor.fetchall():
-                indexes.append(
-                    {
-                        "index_name": row[0],
-                        "columns": row[1],
-                        "is_unique": bool(row[2]),
-                        "is_primary": bool(row[3]),
-                        "index_type": row[4],
-                    }
-                )
-        return {"schema": ref.schema, "table": ref.table, "indexes": indexes}
+        indexes = await analyzer.get_indexes(schema)
+        return {"schema": schema, "count": len(indexes), "indexes": [_index_json(ix) for ix in indexes]}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+def _table_duplicates(analyzer: DatabaseAnalyzer, ref: DuplicatesRequest, sample: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # Groups of identical row hashes, counts only; rows come from /table/duplicates/rows
+    if sample:
+        sample = analyzer.sample_source(ref.schema, ref.table, sample)
+    summary = analyzer.duplicate_groups(ref.schema, ref.table, ref.columns, sample, limit=ref.limit, offset=ref.offset)
+    rate = analyzer.duplicate_rate(ref.schema, ref.table, summary, sample) if ref.offset == 0 else {}
+    return {
+        "schema": ref.schema,
+        "table": ref.table,
+        "exact_duplicates_count": summary["total_groups"],
+        # columns, total_groups, duplicate_rows, duplicate_pairs, limit, offset, groups: [{row_hash, count}]
+        **summary,
+        # First page only: rows_scanned, duplicate_rate (+ 95% CI); sample and estimated pairs when sampled
+        **rate,
+    }
+
+
+def _paging(limit: int, offset: int) -> None:
+    if not 1 <= limit <= 1000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must be >= 0")
+
+
 @app.post("/table/duplicates")
-def table_duplicates(ref: TableRef) -> Dict[str, Any]:
-    ensure_connected()
+async def table_duplicates(ref: DuplicatesRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    _paging(ref.limit, ref.offset)
+    sample = _sample_request(ref)
     try:
-        # Use existing helper methods to compute duplicates; expose counts only to keep it light
-        # We will call the internal methods but not print/export
-        columns_info = analyzer._get_column_info(ref.schema, ref.table)  # type: ignore[attr-defined]
-        text_columns = [c["name"] for c in columns_info if "char" in c["type"].lower() or "text" in c["type"].lower()]
-        exact = analyzer._find_exact_duplicates(ref.schema, ref.table, columns_info)  # type: ignore[attr-defined]
-        fuzzy = analyzer._find_fuzzy_duplicates(ref.schema, ref.table, text_columns)  # type: ignore[attr-defined]
-        return {
-            "schema": ref.schema,
-            "table": ref.table,
-            "exact_duplicates_count": len(exact),
-            "fuzzy_duplicates_count": len(fuzzy),
-        }
+        return await analyzer.run(_table_duplicates, analyzer.sync, ref, sample)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@app.post("/table/duplicates/rows")
+async def table_duplicate_rows(req: DuplicateRowsRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    # One duplicate group's rows, on demand and paginated
+    _paging(req.limit, req.offset)
+    try:
+        groups = await analyzer.duplicate_group_rows(req.schema, req.table, [req.row_hash], req.columns,
+                                                     limit=req.limit, offset=req.offset)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
+    return {
+        "schema": req.schema,
+        "table": req.table,
+        "row_hash": req.row_hash,
+        "limit": req.limit,
+        "offset": req.offset,
+        # Binary values as 0x-prefixed hex
+        "rows": jsonable_encoder(groups.get(req.row_hash, []), custom_encoder={bytes: lambda value: "0x" + value.hex()}),
+    }
+
+
+def _column_search(analyzer: DatabaseAnalyzer, req: ColumnSearchRequest) -> Dict[str, Any]:
+    # Answered from the in-memory column index instead of one query per table
+    total, matches = analyzer.search_columns(req.column_name, mode=req.mode, limit=req.limit, offset=req.offset)
+    return {
+        "column": req.column_name,
+        "mode": req.mode,
+        "total": total,
+        "limit": req.limit,
+        "offset": req.offset,
+        "tables": [
+            {
+                "schema": m["schema"],
+                "table": m["table"],
+                "column": m["column"],
+                "data_type": m["data_type"],
+                "match": m["match"],
+                "distance": m["distance"],
+            }
+            for m in matches
+        ],
+    }
 
 
 @app.post("/column/search")
-def column_search(req: ColumnSearchRequest) -> Dict[str, Any]:
-    ensure_connected()
+async def column_search(req: ColumnSearchRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    if req.mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(SEARCH_MODES)}")
+    if req.limit < 1 or req.limit > 1000 or req.offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be 1-1000 and offset >= 0")
     try:
-        matches = analyzer.find_tables_by_column(req.column_name)
-        # method prints and exports; we re-run quickly to compute using _get_column_info across tables
-        tables = analyzer.get_tables()
-        result: List[Dict[str, str]] = []
-        for schema, table in tables:
-            try:
-                columns = analyzer._get_column_info(schema, table)  # type: ignore[attr-defined]
-                if any(req.column_name.lower() == c["name"].lower() for c in columns):
-                    result.append({"schema": schema, "table": table})
-            except Exception:
-                continue
-        return {"column": req.column_name, "tables": result}
+        return await analyzer.run(_column_search, analyzer.sync, req)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
 @app.post("/view/hierarchy")
-def view_hierarchy(view: ViewRef) -> Dict[str, Any]:
-    ensure_connected()
+async def view_hierarchy(req: HierarchyRequest, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    # Graph as data straight away; rendering, if asked for, happens in the render pool
+    if req.render is not None and req.render not in RENDER_FORMATS:
+        raise HTTPException(status_code=400, detail=f"render must be one of {', '.join(RENDER_FORMATS)}")
+    try:
+        graph = await analyzer.get_view_hierarchy(req.schema, req.view, req.max_depth)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    result = {"schema": req.schema, "view": req.view, **graph}
+    if req.render is not None:
+        _, status = renderer.submit(graph, req.render)
+        result["render"] = {"format": req.render, "status": status, "url": f"/view/hierarchy/render/{graph['hash']}.{req.render}"}
+    return result
+
+
+@app.get("/view/hierarchy/render/{digest}.{output_format}")
+async def view_hierarchy_render(digest: str, output_format: str):
+    # Keyed by content hash, so no session is needed to fetch a finished render
+    if output_format not in RENDER_FORMATS or not re.fullmatch(r"[0-9a-f]{64}", digest):
+        raise HTTPException(status_code=404, detail="Unknown render")
+    status = renderer.status(digest, output_format)
+    if status == "ready":
+        media_type = "image/svg+xml" if output_format == "svg" else "image/png"
+        return FileResponse(renderer.path(digest, output_format), media_type=media_type)
+    if status == "pending":
+        return JSONResponse({"status": status}, status_code=202)
+    if status == "failed":
+        raise HTTPException(status_code=500, detail=renderer.error(digest, output_format))
+    raise HTTPException(status_code=404, detail="Unknown render")
+
+
+def _lineage(analyzer: DatabaseAnalyzer, schema: Optional[str], view: Optional[str], max_depth: int) -> Dict[str, Any]:
+    graph = analyzer.get_lineage()
+    if view is None:
+        return {**graph.to_json(), "edge_count": graph.edge_count}
+    root = (schema, view)
+    if root not in graph:
+        raise HTTPException(status_code=404, detail=f"Unknown object {schema}.{view}")
+    nodes, edges = graph.hierarchy(root, max_depth)
+    return {"root": f"{schema}.{view}", **graph.to_json(nodes, edges)}
+
+
+@app.get("/lineage")
+async def lineage(schema: Optional[str] = None, view: Optional[str] = None, max_depth: int = 10,
+                  analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    if view is not None and schema is None:
+        raise HTTPException(status_code=400, detail="schema is required with view")
+    try:
+        return await analyzer.run(_lineage, analyzer.sync, schema, view, max_depth)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+def _node_json(node) -> Dict[str, str]:
+    return {"schema": node[0], "name": node[1], "id": node_id(node)}
+
+
+def _lineage_impact(analyzer: DatabaseAnalyzer, schema: str, name: str, max_depth: Optional[int]) -> Dict[str, Any]:
+    if (schema, name) not in analyzer.get_lineage():
+        raise HTTPException(status_code=404, detail=f"Unknown object {schema}.{name}")
+    impact = analyzer.analyze_impact(schema, name, max_depth)
+    graph = analyzer.get_lineage()
+    result = {"schema": schema, "name": name, "kind": impact["kind"]}
+    for direction in ("downstream", "upstream"):
+        result[direction] = {
+            "count": len(impact[direction]),
+            "layers": [
+                [{**_node_json(node), "kind": graph.kinds.get(node, "unknown")} for node in layer]
+                for layer in impact[f"{direction}_layers"]
+            ],
+        }
+    result["cycles"] = [[node_id(node) for node in cycle] for cycle in impact["cycles"]]
+    return result
+
+
+@app.get("/lineage/impact")
+async def lineage_impact(schema: str, name: str, max_depth: Optional[int] = None,
+                         analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    if max_depth is not None and max_depth < 1:
+        raise HTTPException(status_code=400, detail="max_depth must be >= 1")
+    try:
+        return await analyzer.run(_lineage_impact, analyzer.sync, schema, name, max_depth)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+def _lineage_cycles(analyzer: DatabaseAnalyzer) -> Dict[str, Any]:
+    cycles = analyzer.get_lineage().cycles()
+    return {"count": len(cycles), "cycles": [[node_id(node) for node in cycle] for cycle in cycles]}
+
+
+@app.get("/lineage/cycles")
+async def lineage_cycles(analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
     try:
-        output = analyzer.build_view_hierarchy(view.schema, view.view, output_path=f"{view.schema}_{view.view}", output_format="png")
-        return {"schema": view.schema, "view": view.view, "image_path": output}
+        return await analyzer.run(_lineage_cycles, analyzer.sync)
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+def _lineage_refresh(analyzer: DatabaseAnalyzer, view: ViewRef) -> Dict[str, Any]:
+    graph = analyzer.refresh_view_lineage(view.schema, view.view)
+    node = (view.schema, view.view)
+    return {
+        "schema": view.schema,
+        "view": view.view,
+        "exists": node in graph and graph.kinds.get(node) != "unknown",
+        "dependencies": [node_id(dep) for dep in sorted(graph.dependencies.get(node, ()))],
+        "edge_count": graph.edge_count,
+    }
+
+
+@app.post("/lineage/refresh")
+async def lineage_refresh(view: ViewRef, analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    # Patch one view's edges after CREATE/ALTER/DROP VIEW instead of rebuilding the graph
+    try:
+        return await analyzer.run(_lineage_refresh, analyzer.sync, view)
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+
+
+@app.get("/pool/stats")
+async def pool_stats(analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    return analyzer.pool_stats()
+
+
+@app.get("/metadata/cache")
+async def metadata_cache_stats(analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    return await analyzer.metadata_cache_stats()
+
+
+@app.post("/metadata/refresh")
+async def metadata_refresh(analyzer: AsyncDatabaseAnalyzer = Depends(get_analyzer)) -> Dict[str, Any]:
+    await analyzer.invalidate_metadata()
+    return {"status": "invalidated"}
+
+
+def _sweep_idle_sessions() -> None:
+    # Idle sessions are also swept on every lookup; this covers quiet periods
+    while not _sweeper_stop.wait(60):
+        sessions.evict_idle()
+
+
+@app.on_event("startup")
+def startup_event() -> None:
+    _sweeper_stop.clear()
+    threading.Thread(target=_sweep_idle_sessions, name="session-sweeper", daemon=True).start()
+
+
 @app.on_event("shutdown")
 def shutdown_event() -> None:
-    global analyzer
-    try:
-        if analyzer is not None:
-            analyzer.close_connection()
-    finally:
-        analyzer = None
+    _sweeper_stop.set()
+    sessions.close_all()
+    renderer.shutdown()
 
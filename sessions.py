@@ -0,0 +1,111 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+
+class SessionNotFoundError(KeyError):
+    """Raised when a session token is unknown, expired or evicted."""
+
+
+class SessionRegistry:
+    """Maps session tokens to connected analyzers.
+
+    Sessions are kept in least-recently-used order. Creating a session beyond
+    ``max_sessions`` evicts the least recently used one, and sessions idle for
+    longer than ``idle_timeout`` seconds are evicted on the next sweep. Every
+    evicted analyzer has close_connection() called so its pool is released.
+    """
+
+    def __init__(self, max_sessions: int = 32, idle_timeout: float = 1800.0):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # session_id -> (analyzer, last_used)
+        self._sessions: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._evicted_lru = 0
+        self._evicted_idle = 0
+
+    def create(self, analyzer: Any) -> str:
+        """Register a connected analyzer and return its new session token."""
+        session_id = secrets.token_urlsafe(24)
+        with self._lock:
+            evicted = self._sweep_idle_locked()
+            while len(self._sessions) >= self.max_sessions:
+                _, (lru, _) = self._sessions.popitem(last=False)
+                self._evicted_lru += 1
+                evicted.append(lru)
+            self._sessions[session_id] = (analyzer, time.monotonic())
+        self._close_all(evicted)
+        return session_id
+
+    def get(self, session_id: str) -> Any:
+        """Return the analyzer for a token and mark the session as recently used."""
+        with self._lock:
+            evicted = self._sweep_idle_locked()
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._sessions[session_id] = (entry[0], time.monotonic())
+                self._sessions.move_to_end(session_id)
+        self._close_all(evicted)
+        if entry is None:
+            raise SessionNotFoundError(session_id)
+        return entry[0]
+
+    def close(self, session_id: str) -> bool:
+        """Close and forget a session; returns False if it did not exist."""
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+        if entry is None:
+            return False
+        self._close_all([entry[0]])
+        return True
+
+    def evict_idle(self) -> int:
+        """Close sessions idle longer than idle_timeout; returns how many were closed."""
+        with self._lock:
+            evicted = self._sweep_idle_locked()
+        self._close_all(evicted)
+        return len(evicted)
+
+    def close_all(self):
+        """Close every open session (used on shutdown)."""
+        with self._lock:
+            analyzers = [analyzer for analyzer, _ in self._sessions.values()]
+            self._sessions.clear()
+        self._close_all(analyzers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Session counts and eviction counters."""
+        with self._lock:
+            return {
+                'open_sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'idle_timeout': self.idle_timeout,
+                'evicted_lru': self._evicted_lru,
+                'evicted_idle': self._evicted_idle,
+            }
+
+    def _sweep_idle_locked(self) -> List[Any]:
+        if self.idle_timeout is None:
+            return []
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = []
+        # OrderedDict is in LRU order, so stop at the first fresh session
+        while self._sessions:
+            session_id, (analyzer, last_used) = next(iter(self._sessions.items()))
+            if last_used > cutoff:
+                break
+            del self._sessions[session_id]
+            self._evicted_idle += 1
+            evicted.append(analyzer)
+        return evicted
+
+    @staticmethod
+    def _close_all(analyzers: List[Any]):
+        for analyzer in analyzers:
+            try:
+                analyzer.close_connection()
+            except Exception:
+                pass
@@ -0,0 +1,182 @@
+import hashlib
+import heapq
+import math
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+
+_MASK64 = (1 << 64) - 1
+
+
+def hash64(value: Any) -> int:
+    """Stable 64-bit hash of a column value (its text form, so it is consistent across drivers)."""
+    data = value if isinstance(value, (bytes, bytearray, memoryview)) else str(value).encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.blake2b(bytes(data), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch (Flajolet et al., with the small-range correction).
+
+    Memory is fixed at 2**precision one-byte registers (16 KiB at the default
+    precision 14) however many values are added; the standard error of
+    count() is about 1.04 / sqrt(2**precision), 0.8% at precision 14.
+    Sketches with the same precision merge by taking register maxima.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self._rest_bits = 64 - precision
+        self._rest_mask = (1 << self._rest_bits) - 1
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value: Any):
+        """Add one non-NULL value."""
+        self.add_hash(hash64(value))
+
+    def add_hash(self, hashed: int):
+        hashed &= _MASK64
+        index = hashed >> self._rest_bits
+        rank = self._rest_bits - (hashed & self._rest_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[Any]):
+        for value in values:
+            if value is not None:
+                self.add(value)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting is more accurate here
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+
+class MisraGries:
+    """Misra-Gries heavy-hitters summary in at most ``capacity`` counters.
+
+    A kept counter never overstates its value's count and understates it by
+    at most ``error``, which stays below total / (capacity + 1); every value
+    more frequent than that is guaranteed to be kept. Counts arrive in
+    batches: they are added and, once more than ``capacity`` values are
+    tracked, the (capacity + 1)-th largest count is subtracted from all.
+    Summaries with the same capacity merge the same way (Agarwal et al.,
+    "Mergeable summaries"), keeping the bound for the combined stream.
+    """
+
+    def __init__(self, capacity: int = 100):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self.counters: Dict[Any, int] = {}
+        self.total = 0
+        self.error = 0
+
+    def update(self, values: Iterable[Any]):
+        self.update_counts(Counter(value for value in values if value is not None))
+
+    def update_counts(self, counts: Mapping[Any, int]):
+        """Add {value: occurrences}, e.g. one batch counted with collections.Counter."""
+        counters = self.counters
+        for value, count in counts.items():
+            counters[value] = counters.get(value, 0) + count
+            self.total += count
+        self._reduce()
+
+    def _reduce(self):
+        if len(self.counters) <= self.capacity:
+            return
+        threshold = heapq.nlargest(self.capacity + 1, self.counters.values())[-1]
+        self.error += threshold
+        self.counters = {value: count - threshold for value, count in self.counters.items() if count > threshold}
+
+    def merge(self, other: "MisraGries"):
+        if other.capacity != self.capacity:
+            raise ValueError("cannot merge summaries with different capacity")
+        self.error += other.error
+        self.update_counts(other.counters)
+        # update_counts() counted the other summary's kept counts; use its true total instead
+        self.total += other.total - sum(other.counters.values())
+
+    def lower_bound(self, value: Any) -> int:
+        return self.counters.get(value, 0)
+
+    def top(self, k: int) -> List[Tuple[Any, int]]:
+        """Up to k (value, lower bound) pairs, most frequent first."""
+        return heapq.nlargest(k, self.counters.items(), key=lambda item: item[1])
+
+
+class CountMinSketch:
+    """Count-Min sketch (Cormode, Muthukrishnan) over ``depth`` rows of ``width`` counters.
+
+    estimate() never understates a value's count and, with probability
+    1 - exp(-depth), overstates it by at most e / width * total (0.13% of
+    the rows at the default width). Memory is fixed at width * depth 64-bit
+    counters (80 KiB by default). Sketches with the same shape merge by
+    adding their counters.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 5):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be >= 1")
+        self.width = width
+        self.depth = depth
+        self.rows = [array('q', bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+
+    @property
+    def error_bound(self) -> float:
+        """Largest overcount, in rows, at the sketch's confidence."""
+        return math.e / self.width * self.total
+
+    @property
+    def confidence(self) -> float:
+        return 1 - math.exp(-self.depth)
+
+    def _cells(self, value: Any) -> List[int]:
+        # Kirsch-Mitzenmacher: depth indexes from the two halves of one 64-bit hash
+        hashed = hash64(value)
+        low, high = hashed & 0xFFFFFFFF, (hashed >> 32) | 1
+        return [(low + i * high) % self.width for i in range(self.depth)]
+
+    def update(self, values: Iterable[Any]):
+        self.update_counts(Counter(value for value in values if value is not None))
+
+    def update_counts(self, counts: Mapping[Any, int]):
+        """Add {value: occurrences}, e.g. one batch counted with collections.Counter."""
+        rows = self.rows
+        for value, count in counts.items():
+            for row, cell in zip(rows, self._cells(value)):
+                row[cell] += count
+            self.total += count
+
+    def merge(self, other: "CountMinSketch"):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("cannot merge sketches of different shape")
+        for row, other_row in zip(self.rows, other.rows):
+            for cell, count in enumerate(other_row):
+                if count:
+                    row[cell] += count
+        self.total += other.total
+
+    def estimate(self, value: Any) -> int:
+        return min(row[cell] for row, cell in zip(self.rows, self._cells(value)))
@@ -0,0 +1,79 @@
+import pytest
+
+from catalog import Catalog
+from column_index import ColumnIndex, levenshtein
+
+COLUMNS = [
+    ("public", "users", "user_id", "integer", "NO", None),
+    ("public", "users", "Email", "text", "YES", None),
+    ("public", "orders", "user_id", "integer", "NO", None),
+    ("public", "orders", "order_total", "numeric", "YES", "0"),
+    ("sales", "customers", "customer_email", "text", "YES", None),
+    ("sales", "customers", "userid", "integer", "NO", None),
+    ("sales", "customers", "emial", "text", "YES", None),
+]
+
+
+def _index(columns=COLUMNS):
+    objects = {(schema, table, 'table') for schema, table, *_ in columns}
+    return ColumnIndex(Catalog(objects, columns))
+
+
+def _found(results):
+    return [(row['schema'], row['table'], row['column'], row['match'], row['distance']) for row in results]
+
+
+def test_exact_match_folds_case_and_whitespace():
+    total, results = _index().search("  EMAIL ", mode="exact")
+    assert total == 1
+    assert _found(results) == [("public", "users", "Email", "exact", 0)]
+
+
+def test_prefix_lists_every_table_with_the_column_shortest_name_first():
+    total, results = _index().search("user", mode="prefix")
+    assert total == 3
+    assert [(row['table'], row['column']) for row in results] == [
+        ("customers", "userid"), ("orders", "user_id"), ("users", "user_id")]
+    assert {row['match'] for row in results} == {"prefix"}
+
+
+def test_substring_uses_trigrams_and_short_queries():
+    assert [row['column'] for row in _index().search("mail", mode="substring")[1]] == ["Email", "customer_email"]
+    assert [row['column'] for row in _index().search("al", mode="substring")[1]] == ["emial", "order_total"]
+    assert _index().search("xyz", mode="substring") == (0, [])
+
+
+def test_fuzzy_finds_typos_within_distance():
+    total, results = _index().search("emial", mode="fuzzy")
+    assert _found(results) == [("sales", "customers", "emial", "exact", 0), ("public", "users", "Email", "fuzzy", 2)]
+    assert _index().search("emial", mode="fuzzy", max_distance=1)[0] == 1
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("kitten", "sitting", max_distance=2) is None
+
+
+def test_auto_ranks_exact_then_prefix_then_substring_then_fuzzy():
+    _, results = _index().search("email")
+    assert [(row['column'], row['match']) for row in results] == [
+        ("Email", "exact"), ("customer_email", "substring"), ("emial", "fuzzy")]
+
+
+def test_paging_spans_tables_of_one_name():
+    index = _index()
+    total, everything = index.search("user", mode="prefix", limit=None)
+    pages = [index.search("user", mode="prefix", limit=2, offset=offset)[1] for offset in (0, 2, 4)]
+    assert total == 3 and pages[0] + pages[1] == everything and pages[2] == []
+    assert index.search("user", mode="prefix", limit=1, offset=1)[1] == everything[1:2]
+
+
+def test_rebuild_from_new_catalog_drops_removed_tables():
+    remaining = [column for column in COLUMNS if column[1] != "users"]
+    total, results = _index(remaining).search("user_id", mode="exact")
+    assert total == 1 and results[0]['table'] == "orders"
+    assert _index(remaining).search("email", mode="exact") == (0, [])
+    assert len(_index(remaining)) == len(_index()) - 1
+
+
+def test_rejects_unknown_mode_and_blank_query():
+    with pytest.raises(ValueError):
+        _index().search("x", mode="regex")
+    assert _index().search("   ") == (0, [])
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from column_stats import ColumnStats, Moments, QuantileSketch, is_numeric_type
+
+
+def test_quantile_sketch_rank_error_is_small():
+    rng = np.random.default_rng(1)
+    data = rng.lognormal(size=200000)
+    sketch = QuantileSketch(k=200, seed=2)
+    for start in range(0, data.size, 10000):
+        sketch.update(data[start:start + 10000])
+    assert sketch.count == data.size
+    retained = sum(level.size for level in sketch._levels)
+    assert retained < 4 * sketch.k
+    ordered = np.sort(data)
+    fractions = [0.01, 0.25, 0.5, 0.75, 0.99]
+    for fraction, estimate in zip(fractions, sketch.quantiles(fractions)):
+        rank = np.searchsorted(ordered, estimate, side="right") / data.size
+        assert abs(rank - fraction) < 0.02
+
+
+def test_quantile_sketch_keeps_total_weight_and_ignores_nan():
+    sketch = QuantileSketch(k=50, seed=0)
+    sketch.update(np.array([np.nan, 1.0, np.nan]))
+    sketch.update(np.arange(1001, dtype=float))
+    _, weights = sketch._weighted()
+    assert sketch.count == 1002 == int(weights.sum())
+    assert sketch.cdf([-1.0, 1e9]).tolist() == [0.0, 1.0]
+    assert QuantileSketch().quantiles([0.5]) == [None]
+
+
+def test_moments_match_numpy_across_batches():
+    rng = np.random.default_rng(3)
+    data = rng.normal(100, 15, size=5003)
+    moments = Moments()
+    for start in range(0, data.size, 1000):
+        moments.update(data[start:start + 1000])
+    assert moments.mean == pytest.approx(data.mean())
+    assert moments.stddev == pytest.approx(data.std(ddof=1))
+    assert (moments.minimum, moments.maximum) == (data.min(), data.max())
+    assert Moments().to_dict() == {'min': None, 'max': None, 'mean': None, 'stddev': None}
+
+
+def test_numeric_column_histogram_counts_every_value():
+    stats = ColumnStats({'name': 'n', 'type': 'numeric(10,2)', 'nullable': 'YES'})
+    values = [None if i % 10 == 0 else float(i % 97) for i in range(20000)]
+    stats.update(values[:7000])
+    stats.update(values[7000:])
+    result = stats.to_dict()
+    assert result['kind'] == 'numeric'
+    assert result['null_count'] == 2000 and result['non_null_count'] == 18000
+    assert sum(result['histogram']['counts']) == 18000
+    assert len(result['histogram']['edges']) == len(result['histogram']['counts']) + 1
+    assert result['min'] == 0.0 and result['max'] == 96.0
+
+
+def test_string_column_tracks_lengths_with_overflow_bucket():
+    stats = ColumnStats({'name': 's', 'type': 'varchar', 'nullable': 'YES'})
+    stats.update(["", "ab", "ab", None, "x" * 300])
+    result = stats.to_dict()
+    assert result['length_counts'] == [[0, 1], [2, 2]]
+    assert result['longer_than_tracked'] == 1
+    assert result['null_count'] == 1
+
+
+def test_non_numeric_driver_values_fall_back_to_other():
+    stats = ColumnStats({'name': 'n', 'type': 'integer', 'nullable': 'YES'})
+    stats.update(["a", None])
+    assert stats.to_dict()['kind'] == 'other' and stats.nulls == 1
+    assert not is_numeric_type("interval") and is_numeric_type("double precision")
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from connection_pool import ConnectionPool, PoolExhaustedError
+from database_analyser import MIN_POOL_SIZE, DatabaseAnalyzer
+
+
+def test_analyzer_rejects_pools_too_small_to_share():
+    with pytest.raises(ValueError):
+        DatabaseAnalyzer(pool_size=MIN_POOL_SIZE - 1, persist_metadata=False)
+    analyzer = DatabaseAnalyzer(pool_size=MIN_POOL_SIZE, persist_metadata=False)
+    assert analyzer.request_workers == analyzer.crawl_connections == 1
+
+
+class FakeConnection:
+    created = 0
+
+    def __init__(self, healthy=True, rollback_fails=False):
+        FakeConnection.created += 1
+        self.number = FakeConnection.created
+        self.healthy = healthy
+        self.rollback_fails = rollback_fails
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        if self.rollback_fails:
+            raise RuntimeError("connection lost")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, sql):
+        if not self.connection.healthy:
+            raise RuntimeError("server closed the connection")
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+def test_release_rolls_back_and_reuses_the_warmest_connection():
+    pool = ConnectionPool(FakeConnection, max_size=3)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    assert first.raw.rollbacks == second.raw.rollbacks == 1
+    assert pool.acquire() is second
+    assert pool.acquire() is first
+    assert pool.stats()['created'] == 2
+
+
+def test_failed_rollback_discards_the_connection():
+    pool = ConnectionPool(lambda: FakeConnection(rollback_fails=True), max_size=2)
+    pooled = pool.acquire()
+    pool.release(pooled)
+    assert pooled.raw.closed
+    stats = pool.stats()
+    assert stats['size'] == 0 and stats['discarded'] == 1 and stats['in_use'] == 0
+
+
+def test_checkout_times_out_when_every_connection_is_busy():
+    pool = ConnectionPool(FakeConnection, max_size=1)
+    held = pool.acquire()
+    started = time.monotonic()
+    with pytest.raises(PoolExhaustedError):
+        pool.acquire(timeout=0.05)
+    assert time.monotonic() - started >= 0.05
+    assert pool.stats()['timeouts'] == 1
+    pool.release(held)
+    assert pool.acquire(timeout=0.05) is held
+
+
+def test_waiting_checkout_gets_a_released_connection():
+    pool = ConnectionPool(FakeConnection, max_size=1)
+    held = pool.acquire()
+    releaser = threading.Timer(0.05, pool.release, args=(held,))
+    releaser.start()
+    assert pool.acquire(timeout=2) is held
+    releaser.join()
+    assert pool.stats()['waits'] >= 1
+
+
+def test_unhealthy_idle_connection_is_replaced():
+    pool = ConnectionPool(FakeConnection, max_size=2, health_check_interval=0)
+    pooled = pool.acquire()
+    pool.release(pooled)
+    pooled.raw.healthy = False
+    replacement = pool.acquire()
+    assert replacement is not pooled and pooled.raw.closed
+    stats = pool.stats()
+    assert stats['failed_health_checks'] == 1 and stats['size'] == 1 and stats['created'] == 2
+
+
+def test_idle_connections_past_max_idle_are_evicted_down_to_min_size():
+    pool = ConnectionPool(FakeConnection, max_size=3, min_size=1, max_idle=0.01)
+    held = [pool.acquire() for _ in range(3)]
+    for pooled in held:
+        pool.release(pooled)
+    time.sleep(0.03)
+    assert pool.evict_idle() == 2
+    assert pool.stats()['idle'] == 1
+    assert sum(pooled.raw.closed for pooled in held) == 2
+
+
+def test_closed_pool_refuses_checkouts_and_closes_returns():
+    pool = ConnectionPool(FakeConnection, max_size=2)
+    idle, busy = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+    assert idle.raw.closed and not busy.raw.closed
+    pool.release(busy)
+    assert busy.raw.closed
+    with pytest.raises(RuntimeError):
+        pool.acquire()
@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+import time
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import crawler
+from connection_pool import ConnectionPool
+from crawler import TableCrawler, database_slots
+from database_analyser import DatabaseAnalyzer
+from dialects import Dialect
+
+
+def _analyzer(fingerprint="db", crawl_connections=5):
+    return SimpleNamespace(fingerprint=fingerprint, crawl_connections=crawl_connections,
+                           crawl_slots=threading.BoundedSemaphore(crawl_connections), connection=nullcontext,
+                           statement_timeout=lambda seconds: nullcontext())
+
+
+def test_larger_limit_raises_shared_cap_until_it_leaves():
+    with database_slots("db", 1) as small:
+        assert small.limit == 1
+        with database_slots("db", 4) as large:
+            assert large is small and small.limit == 4
+        assert small.limit == 1
+    assert "db" not in crawler._database_slots
+
+
+def test_waiting_task_starts_when_cap_is_raised():
+    started = threading.Event()
+    with database_slots("db", 1) as slots:
+        slots.__enter__()
+        waiter = threading.Thread(target=lambda: (slots.__enter__(), started.set(), slots.__exit__()))
+        waiter.start()
+        assert not started.wait(0.1)
+        with database_slots("db", 2):
+            assert started.wait(2)
+        waiter.join()
+        slots.__exit__()
+
+
+def test_crawl_respects_concurrency_and_prunes_registry():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work(key):
+        with lock:
+            running.append(key)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(key)
+        return key * 2
+
+    results = TableCrawler(_analyzer(), concurrency=3).run([(i, i) for i in range(12)], work)
+    assert {key: result.value for key, result in results.items()} == {i: i * 2 for i in range(12)}
+    assert max(peak) <= 3
+    assert "db" not in crawler._database_slots
+
+
+def test_crawl_reports_errors_per_task():
+    def work(key):
+        if key == 1:
+            raise RuntimeError("boom")
+        return key
+
+    results = TableCrawler(_analyzer(), concurrency=2).run([(0, None), (1, None)], work)
+    assert results[0].ok and not results[1].ok and str(results[1].error) == "boom"
+
+
+def test_overlapping_crawls_from_request_workers_fit_the_pool():
+    analyzer = DatabaseAnalyzer(pool_size=5, persist_metadata=False, crawl_concurrency=4)
+    analyzer.dialect = Dialect()
+    analyzer._pool = ConnectionPool(lambda: sqlite3.connect(":memory:", check_same_thread=False),
+                                    max_size=analyzer.pool_size, checkout_timeout=0.2)
+    analyzer._primary = analyzer._pool.acquire()
+    peak = []
+
+    def work(key):
+        peak.append(analyzer._pool.stats()['in_use'])
+        # Longer than the checkout timeout: a task waiting on the pool would fail
+        time.sleep(0.3)
+        return key
+
+    def request(results):
+        # What AsyncDatabaseAnalyzer.run() does: the request worker holds a connection of its own
+        with analyzer.connection():
+            results.update(analyzer.crawl([("s", str(i)) for i in range(6)], work))
+
+    outcomes = [{} for _ in range(analyzer.request_workers)]
+    threads = [threading.Thread(target=request, args=(results,)) for results in outcomes]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for results in outcomes:
+        assert len(results) == 6 and all(result.ok for result in results.values())
+    assert max(peak) <= analyzer.pool_size
+    assert analyzer.request_workers + analyzer.crawl_connections == analyzer.pool_size - 1
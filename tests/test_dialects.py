@@ -0,0 +1,40 @@
+import json
+
+from dialects import Dialect, MySQLDialect, PostgresDialect
+
+EMPTY = "base64:type254:"
+A = "base64:type254:YQ=="
+B = "base64:type254:Yg=="
+
+
+def test_mysql_singleton_histogram():
+    histogram = {'histogram-type': 'singleton', 'null-values': 0.1,
+                 'buckets': [[EMPTY, 0.3], [A, 0.6], [B, 0.9]]}
+    stats = MySQLDialect().read_column_stats([("c", json.dumps(histogram))], 1000)
+    assert stats["c"]['distinct'] == 3
+    assert stats["c"]['null_frac'] == 0.1
+    assert abs(stats["c"]['empty_frac'] - 0.3) < 1e-9
+
+
+def test_mysql_equi_height_histogram():
+    histogram = {'histogram-type': 'equi-height', 'null-values': 0.0,
+                 'buckets': [[EMPTY, EMPTY, 0.2, 1], [A, B, 0.7, 40], [B, "base64:type254:eg==", 1.0, 60]]}
+    stats = MySQLDialect().read_column_stats([("c", json.dumps(histogram).encode())], 1000)
+    assert stats["c"] == {'null_frac': 0.0, 'empty_frac': 0.2, 'distinct': 101}
+
+
+def test_mysql_numeric_histogram_has_no_empty_strings():
+    histogram = {'histogram-type': 'equi-height', 'null-values': 0.5, 'buckets': [[1, 10, 0.5, 10]]}
+    stats = MySQLDialect().read_column_stats([("n", histogram)], 10)
+    assert stats["n"] == {'null_frac': 0.5, 'empty_frac': 0.0, 'distinct': 10}
+
+
+def test_postgres_negative_n_distinct_scales_with_rows():
+    stats = PostgresDialect().read_column_stats([("a", 0.25, -0.5, None), ("b", 0.0, 42, 0.1)], 1000)
+    assert stats["a"] == {'null_frac': 0.25, 'empty_frac': 0.0, 'distinct': 500}
+    assert stats["b"]['distinct'] == 42
+
+
+def test_base_dialect_reads_counts_and_skips_empty_tables():
+    stats = Dialect().read_column_stats([("a", 200, 50, 10, 20), ("a", 1, 1, 1, 1), ("z", 0, 0, 0, 0)], 200)
+    assert stats == {"a": {'null_frac': 0.25, 'empty_frac': 0.1, 'distinct': 10}}
@@ -0,0 +1,50 @@
+import sqlite3
+
+from database_analyser import DatabaseAnalyzer
+from dialects import Dialect
+
+COLUMNS = [{'name': 'id', 'type': 'integer', 'nullable': 'NO'},
+           {'name': 'grp', 'type': 'text', 'nullable': 'YES'},
+           {'name': 'payload', 'type': 'text', 'nullable': 'YES'}]
+
+
+class SqliteDialect(Dialect):
+    placeholder = "?"
+
+    def qualify(self, schema, table_name):
+        return self.quote_ident(table_name)
+
+    def row_hash(self, columns):
+        return " || '|' || ".join(f"quote({self.quote_ident(column['name'])})" for column in columns)
+
+
+def _analyzer(primary_key):
+    analyzer = DatabaseAnalyzer(persist_metadata=False)
+    analyzer.dialect = SqliteDialect()
+    analyzer.conn = sqlite3.connect(":memory:")
+    analyzer.cursor = analyzer.conn.cursor()
+    analyzer.cursor.execute("CREATE TABLE t (id INTEGER, grp TEXT, payload TEXT)")
+    analyzer.cursor.executemany("INSERT INTO t VALUES (?, ?, ?)",
+                                [(i, 'a' if i % 2 else 'b', f"p{(i * 7) % 10}") for i in range(10, 0, -1)])
+    analyzer._get_column_info = lambda schema, table_name: COLUMNS
+    analyzer._primary_key = lambda schema, table_name: primary_key
+    return analyzer
+
+
+def _pages(analyzer, row_hash, size=2):
+    rows = []
+    for offset in range(0, 10, size):
+        rows.extend(analyzer.duplicate_group_rows(None, "t", [row_hash], ['grp'], limit=size, offset=offset)[row_hash])
+    return rows
+
+
+def test_group_rows_page_by_primary_key():
+    rows = _pages(_analyzer(['id']), "'a'")
+    assert [row['id'] for row in rows] == [1, 3, 5, 7, 9]
+
+
+def test_group_rows_without_key_page_every_row_once():
+    analyzer = _analyzer(None)
+    rows = _pages(analyzer, "'b'")
+    assert sorted(row['id'] for row in rows) == [2, 4, 6, 8, 10]
+    assert rows == _pages(analyzer, "'b'", size=5)
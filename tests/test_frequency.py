@@ -0,0 +1,94 @@
+import random
+from collections import Counter
+
+import pytest
+
+from frequency import ColumnFrequencies
+from sketches import CountMinSketch, MisraGries
+
+COLUMN = {'name': 'c', 'type': 'jsonb', 'nullable': 'YES'}
+
+
+def _skewed(n, seed=1):
+    rng = random.Random(seed)
+    return [int(rng.paretovariate(1.2)) for _ in range(n)]
+
+
+def test_misra_gries_bounds_hold():
+    data = _skewed(50000)
+    summary = MisraGries(50)
+    for start in range(0, len(data), 5000):
+        summary.update(data[start:start + 5000])
+    true = Counter(data)
+    assert summary.total == len(data)
+    assert len(summary.counters) <= summary.capacity
+    assert summary.error <= len(data) / (summary.capacity + 1)
+    for value, count in true.items():
+        lower = summary.lower_bound(value)
+        assert lower <= count <= lower + summary.error
+        if count > summary.error:
+            assert value in summary.counters
+
+
+def test_misra_gries_merge_keeps_bounds():
+    data = _skewed(40000, seed=2)
+    left, right, whole = MisraGries(30), MisraGries(30), MisraGries(30)
+    left.update(data[:20000])
+    right.update(data[20000:])
+    whole.update(data)
+    left.merge(right)
+    assert left.total == whole.total == len(data)
+    assert left.error <= len(data) / (left.capacity + 1)
+    for value, count in Counter(data).items():
+        assert left.lower_bound(value) <= count <= left.lower_bound(value) + left.error
+
+
+def test_misra_gries_rejects_other_capacity():
+    with pytest.raises(ValueError):
+        MisraGries(10).merge(MisraGries(20))
+
+
+def test_count_min_never_undercounts_and_merges_exactly():
+    data = _skewed(30000, seed=3)
+    left, right, whole = CountMinSketch(256, 4), CountMinSketch(256, 4), CountMinSketch(256, 4)
+    left.update(data[:10000])
+    right.update(data[10000:])
+    whole.update(data)
+    left.merge(right)
+    assert left.rows == whole.rows
+    true = Counter(data)
+    over = [whole.estimate(value) - count for value, count in true.items()]
+    assert min(over) >= 0
+    # Overcount within e/width * n for all but a small share of values
+    assert sum(1 for excess in over if excess > whole.error_bound) <= 0.05 * len(over)
+
+
+def test_count_min_rejects_other_shape():
+    with pytest.raises(ValueError):
+        CountMinSketch(100, 4).merge(CountMinSketch(200, 4))
+
+
+def test_unhashable_json_and_array_values_are_counted():
+    # psycopg2 returns json/jsonb as dicts and lists, arrays as lists
+    frequencies = ColumnFrequencies(COLUMN, top_k=3)
+    frequencies.update([{'b': 1, 'a': 2}, {'a': 2, 'b': 1}, [1, 2], [1, 2], [1, 2], None, memoryview(b'x')])
+    result = frequencies.to_dict()
+    assert result['null_count'] == 1
+    assert result['non_null_count'] == 6
+    top = {entry['value']: entry for entry in result['top_values']}
+    assert top['[1, 2]']['lower_bound'] == top['[1, 2]']['upper_bound'] == 3
+    assert top['{"a": 2, "b": 1}']['upper_bound'] == 2
+    assert top['0x78']['upper_bound'] == 1
+
+
+def test_column_frequencies_merge_matches_single_pass():
+    data = _skewed(20000, seed=4)
+    column = {'name': 'n', 'type': 'integer', 'nullable': 'YES'}
+    merged, other = ColumnFrequencies(column, 5), ColumnFrequencies(column, 5)
+    merged.update(data[:7000])
+    other.update(data[7000:])
+    merged.merge(other)
+    true = Counter(data)
+    for entry in merged.to_dict()['top_values']:
+        assert entry['lower_bound'] <= true[entry['value']] <= entry['upper_bound']
+    assert [e['value'] for e in merged.to_dict()['top_values']] == [v for v, _ in true.most_common(5)]
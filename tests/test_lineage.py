@@ -0,0 +1,72 @@
+from lineage import LineageGraph
+
+
+def _node(name):
+    return ("s", name)
+
+
+def _graph(edges):
+    graph = LineageGraph()
+    for view, referenced in edges:
+        graph.add_edge(_node(view), _node(referenced), referenced_kind='table' if referenced.startswith('t') else None)
+    return graph
+
+
+def _names(nodes):
+    return sorted(name for _, name in nodes)
+
+
+def test_cycles_finds_multi_view_components_only():
+    graph = _graph([("a", "b"), ("b", "c"), ("c", "a"), ("c", "t1"), ("d", "e"), ("e", "d"), ("f", "a")])
+    assert [_names(component) for component in graph.cycles()] == [["a", "b", "c"], ["d", "e"]]
+    assert _graph([("a", "b"), ("b", "t1")]).cycles() == []
+
+
+def test_cycles_handles_deep_chains_without_recursion():
+    graph = _graph([(f"v{i}", f"v{i + 1}") for i in range(5000)] + [("v5000", "v0")])
+    assert len(graph.cycles()) == 1 and len(graph.cycles()[0]) == 5001
+
+
+def test_closure_depths_and_max_depth_cut_off():
+    graph = _graph([("a", "b"), ("b", "c"), ("c", "t1"), ("a", "t1")])
+    assert graph.upstream(_node("a")) == {_node("b"): 1, _node("t1"): 1, _node("c"): 2}
+    assert graph.upstream(_node("a"), max_depth=1) == {_node("b"): 1, _node("t1"): 1}
+    assert graph.downstream(_node("t1")) == {_node("a"): 1, _node("c"): 1, _node("b"): 2}
+    assert graph.downstream(_node("t1"), max_depth=0) == {}
+
+
+def test_layers_put_diamond_join_at_shortest_distance():
+    # top reads left and right, both read base; base reads t1
+    graph = _graph([("top", "left"), ("top", "right"), ("left", "base"), ("right", "base"), ("base", "t1")])
+    assert LineageGraph.layers(graph.upstream(_node("top"))) == [
+        [_node("left"), _node("right")], [_node("base")], [_node("t1")]]
+    assert LineageGraph.layers(graph.downstream(_node("t1"))) == [
+        [_node("base")], [_node("left"), _node("right")], [_node("top")]]
+
+
+def test_update_view_drops_stale_reverse_edges():
+    graph = _graph([("v", "t1"), ("v", "t2"), ("w", "t1")])
+    graph.update_view(_node("v"), [(_node("t3"), 'table')], source='parsed')
+    assert graph.dependencies[_node("v")] == {_node("t3")}
+    assert _node("t2") not in graph.dependents
+    assert graph.dependents[_node("t1")] == {_node("w")}
+    assert graph.downstream(_node("t1")) == {_node("w"): 1}
+    assert graph.sources[_node("v")] == 'parsed'
+
+
+def test_remove_node_keeps_dangling_targets_as_unknown():
+    graph = _graph([("v", "t1"), ("w", "v")])
+    graph.remove_node(_node("v"))
+    assert _node("t1") not in graph.dependents
+    assert graph.kinds[_node("v")] == 'unknown'
+    assert graph.upstream(_node("w")) == {_node("v"): 1}
+    graph.remove_node(_node("w"))
+    graph.remove_node(_node("v"))
+    assert _node("v") not in graph and graph.edge_count == 0
+
+
+def test_round_trips_through_dict():
+    graph = _graph([("a", "b"), ("b", "a"), ("b", "t1")])
+    restored = LineageGraph.from_dict(graph.to_dict())
+    assert restored.to_json() == graph.to_json()
+    assert restored.cycles() == graph.cycles()
@@ -0,0 +1,106 @@
+import threading
+import time
+
+from catalog import MetadataCache
+
+
+class Probe:
+    def __init__(self, version="v1"):
+        self.version = version
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if isinstance(self.version, Exception):
+            raise self.version
+        return self.version
+
+
+def _loader(values):
+    def load():
+        values.append(len(values))
+        return values[-1]
+    return load
+
+
+def test_entries_are_served_without_probing_inside_ttl():
+    probe = Probe()
+    cache = MetadataCache(ttl=60, version_probe=probe)
+    loads = []
+    assert cache.get("catalog", _loader(loads)) == 0
+    assert cache.get("catalog", _loader(loads)) == 0
+    assert probe.calls == 1 and loads == [0]
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_unchanged_version_renews_entries_after_ttl():
+    probe = Probe()
+    cache = MetadataCache(ttl=0.05, version_probe=probe)
+    loads = []
+    cache.get("catalog", _loader(loads))
+    time.sleep(0.08)
+    assert cache.get("catalog", _loader(loads)) == 0
+    assert probe.calls == 2 and loads == [0]
+
+
+def test_changed_version_or_failed_probe_clears_entries():
+    probe = Probe()
+    cache = MetadataCache(ttl=0.05, version_probe=probe)
+    loads = []
+    cache.get("catalog", _loader(loads))
+    probe.version = "v2"
+    time.sleep(0.08)
+    assert cache.get("catalog", _loader(loads)) == 1
+    probe.version = RuntimeError("permission denied")
+    time.sleep(0.08)
+    assert cache.get("catalog", _loader(loads)) == 2
+    assert cache.stats()['invalidations'] == 2
+
+
+def test_max_age_expires_one_entry_regardless_of_version():
+    cache = MetadataCache(ttl=None, version_probe=Probe())
+    loads = []
+    cache.get("row_estimates", _loader(loads), max_age=0.05)
+    cache.get("catalog", _loader(loads))
+    time.sleep(0.08)
+    assert cache.get("row_estimates", _loader(loads), max_age=0.05) == 2
+    assert cache.get("catalog", _loader(loads)) == 1
+
+
+def test_seeded_entries_keep_their_age_and_force_revalidation():
+    probe = Probe("v2")
+    cache = MetadataCache(ttl=60, version_probe=probe)
+    cache.seed({"catalog": "old", "row_estimates": "stale"}, "v1",
+               saved_at={"row_estimates": time.time() - 120})
+    assert cache.get("catalog", lambda: "new") == "old" and probe.calls == 0
+    assert cache.get("row_estimates", lambda: "fresh", max_age=60) == "fresh"
+    assert not cache.revalidate(force=True)
+    assert cache.get("catalog", lambda: "new") == "new" and cache.version == "v2"
+
+
+def test_invalidate_one_key_or_everything():
+    cache = MetadataCache(ttl=60, version_probe=Probe())
+    cache.put("catalog", 1)
+    cache.put("lineage", 2)
+    cache.invalidate("lineage")
+    assert cache.peek("catalog") == 1 and cache.peek("lineage") is None
+    cache.invalidate()
+    assert cache.peek("catalog") is None
+
+
+def test_concurrent_misses_run_the_loader_once():
+    cache = MetadataCache(ttl=60, version_probe=Probe())
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "catalog"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("catalog", slow))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["catalog"] * 5 and len(calls) == 1
@@ -0,0 +1,74 @@
+import sqlite3
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from dialects import Dialect, StatementTimeoutError
+from profiler import add_sample_intervals, assess_column, build_profile_query, quality_report, stream_batches
+
+
+def _analyzer(rows, deadline):
+    raw = sqlite3.connect(":memory:")
+    raw.execute("CREATE TABLE t (a INTEGER)")
+    raw.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(rows)])
+    pooled = SimpleNamespace(raw=raw, state={})
+    return SimpleNamespace(dialect=Dialect(), deadline=lambda: deadline, _current_pooled=lambda: pooled)
+
+
+def test_stream_batches_reads_every_row_without_deadline():
+    batches = list(stream_batches(_analyzer(25, None), "SELECT a FROM t", batch_rows=10))
+    assert [len(rows) for rows in batches] == [10, 10, 5]
+
+
+def test_stream_batches_stops_once_deadline_passed():
+    scan = stream_batches(_analyzer(25, time.monotonic() - 1), "SELECT a FROM t", batch_rows=10)
+    with pytest.raises(StatementTimeoutError):
+        next(scan)
+    assert Dialect().is_statement_timeout(StatementTimeoutError())
+
+
+def _column(name, type_="text", nullable="YES", **counts):
+    return {'name': name, 'type': type_, 'nullable': nullable, 'null_count': 0, 'empty_count': 0,
+            'distinct_count': 10, **counts}
+
+
+def test_build_profile_query_counts_every_column_in_one_select():
+    columns = [_column("a"), _column("n", "integer")]
+    sql = build_profile_query(Dialect(), None, "t", columns)
+    assert sql.startswith("SELECT COUNT(*), COUNT(")
+    assert sql.count("COUNT(DISTINCT") == 2
+    assert sql.count("= ''") == 1
+    assert build_profile_query(Dialect(), None, "t", columns, source="s").endswith("FROM s")
+
+
+def test_assess_column_flags_constraint_violations_and_rates():
+    profile = assess_column(_column("a", nullable="NO", null_count=60, empty_count=25), 100)
+    assert profile['status'] == 'warning'
+    assert profile['null_pct'] == 60 and profile['empty_pct'] == 25
+    assert "NULL constraint violation" in profile['issue']
+    assert len(profile['notes']) == 3
+    assert assess_column(_column("b"), 100)['status'] == 'ok'
+    assert assess_column(_column("c"), 0)['null_pct'] == 0
+
+
+def test_assess_column_quotes_sample_intervals():
+    profile = add_sample_intervals(_column("a", null_count=60), 100)
+    low, high = profile['null_rate_ci']
+    assert low < 60 < high
+    assert f"{low:.1f}" in assess_column(profile, 100)['notes'][0]
+
+
+def test_quality_report_rolls_up_column_status():
+    failed = {'name': 'x', 'type': 'xml', 'nullable': 'YES', 'error': 'unsupported'}
+    profile = {'schema': 's', 'table': 't', 'row_count': 100, 'mode': 'exact', 'columns': [
+        assess_column(_column("a", nullable="NO", null_count=1), 100),
+        assess_column(_column("b"), 100),
+    ]}
+    report = quality_report(profile)
+    assert report['status'] == 'warning' and report['row_count'] == 100
+    assert report['warnings'] == [{'column': 'a', 'message': '1 NULLs in non-nullable column'}]
+    assert report['issues'] == ["Column 'a': NULL constraint violation"]
+    assert report['columns'][1]['metrics']['distinct_count'] == 10
+    profile['columns'].append(failed)
+    assert quality_report(profile)['status'] == 'error'
@@ -0,0 +1,40 @@
+import pytest
+
+from sampling import estimated_duplicate_pairs, row_level, sample_spec, sample_summary, wilson_interval
+
+
+def test_wilson_interval_at_zero_and_all_successes():
+    low, high = wilson_interval(0, 100)
+    assert low == 0.0 and 0 < high < 0.05
+    low, high = wilson_interval(100, 100)
+    assert 0.95 < low < 1.0 and high == 1.0
+
+
+def test_wilson_interval_contains_estimate_and_narrows():
+    low, high = wilson_interval(30, 100)
+    assert low < 0.3 < high
+    wide = high - low
+    low, high = wilson_interval(3000, 10000)
+    assert low < 0.3 < high and high - low < wide / 5
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+
+
+def test_only_row_level_samples_are_marked_for_intervals():
+    bernoulli = sample_spec(1, "bernoulli", seed=7)
+    system = sample_spec(1, "system", seed=7)
+    assert row_level(bernoulli) and not row_level(system)
+    assert sample_summary(bernoulli, 500)['row_level'] is True
+    assert sample_summary(system, 500) == {'method': 'system', 'row_level': False, 'percent': 1.0, 'seed': 7,
+                                           'rows': 500, 'estimated_total_rows': 50000}
+
+
+def test_sample_spec_validates():
+    with pytest.raises(ValueError):
+        sample_spec(0)
+    with pytest.raises(ValueError):
+        sample_spec(10, "cluster")
+
+
+def test_estimated_duplicate_pairs_scales_by_fraction_squared():
+    assert estimated_duplicate_pairs(4, 0.1) == 400
+    assert estimated_duplicate_pairs(4, 0) == 0
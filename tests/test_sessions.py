@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from sessions import SessionNotFoundError, SessionRegistry
+
+
+class FakeAnalyzer:
+    def __init__(self, fail_on_close=False):
+        self.closed = False
+        self.fail_on_close = fail_on_close
+
+    def close_connection(self):
+        self.closed = True
+        if self.fail_on_close:
+            raise RuntimeError("already gone")
+
+
+def test_get_returns_analyzer_and_unknown_token_raises():
+    registry = SessionRegistry()
+    analyzer = FakeAnalyzer()
+    session_id = registry.create(analyzer)
+    assert registry.get(session_id) is analyzer
+    with pytest.raises(SessionNotFoundError):
+        registry.get("missing")
+
+
+def test_lru_session_is_evicted_and_closed_at_capacity():
+    registry = SessionRegistry(max_sessions=2, idle_timeout=None)
+    first, second, third = FakeAnalyzer(), FakeAnalyzer(), FakeAnalyzer()
+    first_id = registry.create(first)
+    second_id = registry.create(second)
+    # Using the first session makes the second the least recently used
+    registry.get(first_id)
+    registry.create(third)
+    assert second.closed and not first.closed
+    with pytest.raises(SessionNotFoundError):
+        registry.get(second_id)
+    assert registry.stats()['evicted_lru'] == 1 and registry.stats()['open_sessions'] == 2
+
+
+def test_idle_sessions_are_swept_and_closed():
+    registry = SessionRegistry(idle_timeout=0.05)
+    stale, fresh = FakeAnalyzer(), FakeAnalyzer(fail_on_close=True)
+    stale_id = registry.create(stale)
+    time.sleep(0.08)
+    fresh_id = registry.create(fresh)
+    assert stale.closed
+    with pytest.raises(SessionNotFoundError):
+        registry.get(stale_id)
+    time.sleep(0.08)
+    # A close_connection() failure does not stop the sweep
+    assert registry.evict_idle() == 1 and fresh.closed
+    assert registry.stats()['evicted_idle'] == 2
+    with pytest.raises(SessionNotFoundError):
+        registry.get(fresh_id)
+
+
+def test_close_and_close_all_release_analyzers():
+    registry = SessionRegistry()
+    one, two = FakeAnalyzer(), FakeAnalyzer()
+    one_id = registry.create(one)
+    registry.create(two)
+    assert registry.close(one_id) and one.closed
+    assert not registry.close(one_id)
+    registry.close_all()
+    assert two.closed and registry.stats()['open_sessions'] == 0
@@ -0,0 +1,39 @@
+import pytest
+
+from sketches import HyperLogLog, hash64
+
+
+def test_hyperloglog_error_within_bound():
+    for distinct in (100, 5000, 200000):
+        sketch = HyperLogLog(12)
+        sketch.update(f"v{i % distinct}" for i in range(distinct * 2))
+        assert abs(sketch.count() - distinct) <= 3 * sketch.relative_error * distinct
+
+
+def test_hyperloglog_merge_equals_union():
+    left, right, union = HyperLogLog(10), HyperLogLog(10), HyperLogLog(10)
+    left.update(range(0, 30000))
+    right.update(range(20000, 50000))
+    union.update(range(0, 50000))
+    left.merge(right)
+    assert left.registers == union.registers
+    assert left.count() == union.count()
+
+
+def test_hyperloglog_ignores_nulls_and_duplicates():
+    sketch = HyperLogLog()
+    sketch.update([None, "a", "a", None, "b"])
+    assert sketch.count() == 2
+
+
+def test_hyperloglog_rejects_other_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+    with pytest.raises(ValueError):
+        HyperLogLog(3)
+
+
+def test_hash64_is_stable_across_value_types():
+    assert hash64(42) == hash64("42")
+    assert hash64(b"ab") == hash64(bytearray(b"ab")) == hash64(memoryview(b"ab"))
+    assert 0 <= hash64("x") < 2 ** 64
@@ -0,0 +1,72 @@
+import sqlite3
+
+import pytest
+
+from connection_pool import ConnectionPool
+from database_analyser import DatabaseAnalyzer
+from dialects import Dialect
+
+
+class TransactionalConnection:
+    """sqlite3 connection whose statement timeout, like PostgreSQL's SET, is undone by a rollback."""
+
+    def __init__(self):
+        self.raw = sqlite3.connect(":memory:", check_same_thread=False)
+        self.timeout = None
+        self.applied = []
+
+    def cursor(self):
+        return self.raw.cursor()
+
+    def rollback(self):
+        self.raw.rollback()
+        self.timeout = None
+
+    def close(self):
+        self.raw.close()
+
+
+class RecordingDialect(Dialect):
+    def set_statement_timeout(self, pooled, cursor, seconds):
+        pooled.raw.timeout = seconds or None
+        pooled.raw.applied.append(seconds)
+
+
+def _analyzer():
+    analyzer = DatabaseAnalyzer(persist_metadata=False)
+    analyzer.dialect = RecordingDialect()
+    analyzer._pool = ConnectionPool(TransactionalConnection, max_size=3)
+    analyzer._primary = analyzer._pool.acquire()
+    analyzer.conn = analyzer._primary.raw
+    analyzer.cursor = analyzer.conn.cursor()
+    return analyzer
+
+
+def test_retry_after_failed_statement_keeps_the_timeout():
+    analyzer = _analyzer()
+    with analyzer.connection() as pooled, analyzer.statement_timeout(30):
+        assert pooled.raw.timeout == 30
+        with pytest.raises(sqlite3.OperationalError):
+            analyzer.cursor.execute("SELECT COUNT(DISTINCT missing) FROM sqlite_master")
+        analyzer._rollback_quietly()
+        assert pooled.raw.timeout is not None and 0 < pooled.raw.timeout <= 30
+        analyzer.cursor.execute("SELECT 1")
+    assert pooled.raw.timeout is None
+
+
+def test_rollback_outside_statement_timeout_sets_nothing():
+    analyzer = _analyzer()
+    with analyzer.connection() as pooled:
+        analyzer._rollback_quietly()
+        assert pooled.raw.applied == []
+
+
+def test_nested_block_restores_the_outer_limit():
+    analyzer = _analyzer()
+    with analyzer.connection() as pooled, analyzer.statement_timeout(60):
+        with analyzer.statement_timeout(5):
+            assert pooled.raw.timeout == 5
+        assert 0 < pooled.raw.timeout <= 60 and pooled.raw.timeout > 5
+        # A looser inner block leaves the tighter outer limit alone
+        with analyzer.statement_timeout(600):
+            assert pooled.raw.timeout > 5 and pooled.raw.timeout <= 60